@@ -1,63 +1,246 @@
+import asyncio
+import importlib
 import logging
+import time
 from datetime import timedelta
 
-from bleak import BleakCharacteristicNotFoundError
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN
-from .mira.helpers.connection import Connection
-from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
-from .mira.helpers.notifications import Notifications
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    CONF_CALLBACK_BUDGET,
+    CONF_COALESCE_UPDATES,
+    CONF_COALESCE_WINDOW,
+    CONF_PROFILING,
+    CONF_RELEASE_IDLE,
+    CONF_WARMUP_TRIGGERS,
+    DEFAULT_CALLBACK_BUDGET,
+    DEFAULT_COALESCE_WINDOW,
+)
+from .services import async_setup_services
 
 
 logger = logging.getLogger(__name__)
 
+# Interval at which the device state is polled
+POLL_INTERVAL = timedelta(seconds=20)
+
+# Seconds to wait for the device settings during setup
+DEVICE_SETTINGS_TIMEOUT = 5
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Modules only needed once a device is set up: the protocol stack with
+# bleak, the NumPy telemetry store and the entry's helpers. The package is
+# imported without them for the config flow, and they are imported in the
+# import executor rather than on the event loop when an entry is set up.
+SETUP_MODULES = (
+    ".mira.helpers.connection",
+    ".mira.helpers.notifications",
+    ".mira.helpers.telemetry_store",
+    ".client_inventory",
+    ".device_trigger",
+    ".handoff",
+    ".link_watchdog",
+    ".prewarm",
+    ".sessions",
+    ".statistics_export",
+    ".telemetry_history",
+    ".warmup",
+)
+
+
+def _import_setup_modules() -> None:
+    """Import the modules needed to set up a device."""
+    for name in SETUP_MODULES:
+        importlib.import_module(name, __name__)
+
+
+async def async_setup(hass, config):
+    logger.debug("Registering services")
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass, config_entry):
     logger.debug("Setting up entry for device")
     device_address = config_entry.data["device_address"]
     client_id = config_entry.data["client_id"]
     client_slot = config_entry.data["client_slot"]
     logger.debug(f"Device address: {device_address}, client_id: {client_id}, client_slot: {client_slot}")
+    setup_started_at = time.monotonic()
 
-    connection = Connection(hass, device_address, client_id, client_slot)
-    logger.debug("Connecting to device")
-    await connection.connect()
+    # The protocol stack is only needed once a device is set up, so it is not
+    # loaded when the package is imported for the config flow or services
+    await hass.async_add_import_executor_job(_import_setup_modules)
+    from bleak import BleakCharacteristicNotFoundError
+    from .mira.helpers.coalescer import StateCoalescer
+    from .mira.helpers.connection import Connection
+    from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
+    from .device_trigger import async_fire_panel_events
+    from .handoff import async_take_paired_device
+    from .mira.helpers.notifications import Notifications
+    from .mira.helpers.panel_events import PanelEventDetector
+    from .link_watchdog import LinkWatchdog
+    from .mira.helpers.profiling import StageProfiler
+    from .prewarm import SoakStationPrewarm
+    from .sessions import SoakStationSessions
+    from .statistics_export import SoakStationStatisticsExport
+    from .telemetry_history import SoakStationTelemetryHistory
+    from .warmup import SoakStationWarmup
 
-    # Build the metadata wrapper and initialise it
-    metadata = SoakStationMetadata()
-    logger.debug("Getting device info")
-    info = await connection.get_device_info()
-    info['device_address'] = device_address
-    metadata.update_device_identity(**info)
-    logger.debug(f"Updated device metadata with info: {info}")
+    # Every state report is kept in a long-term store on disk
+    telemetry = SoakStationTelemetryHistory(hass, device_address)
+    await telemetry.async_open()
+    # Unload callbacks also run when a later step of the setup fails, so the
+    # store and the link are released before Home Assistant retries
+    config_entry.async_on_unload(telemetry.async_close)
 
-    # Build the data wrapper
-    data_model = SoakStationData()
-    logger.debug("Created data model")
+    # Right after pairing, the config flow hands over its link and the metadata it read
+    handoff = async_take_paired_device(hass, device_address, client_id, client_slot)
+    if handoff is not None:
+        connection = handoff.connection
+        metadata = handoff.metadata
+    else:
+        connection = Connection(hass, device_address, client_id, client_slot)
+    config_entry.async_on_unload(connection.close)
+    try:
+        if handoff is None:
+            logger.debug("Connecting to device")
+            await connection.connect()
 
-    # Subscribe
-    notifications = Notifications(model=data_model, metadata=metadata)
-    connection.subscribe(notifications)
-    logger.debug("Subscribed notifications handler")
+            # Build the metadata wrapper and initialise it
+            metadata = SoakStationMetadata()
+            logger.debug("Getting device info")
+            info = await connection.get_device_info()
+            info['device_address'] = device_address
+            metadata.update_device_identity(**info)
+            logger.debug(f"Updated device metadata with info: {info}")
+
+        # Build the data wrapper
+        data_model = SoakStationData()
+        logger.debug("Created data model")
+
+        # Optionally merge bursts of state reports, e.g. while the dial is turned
+        coalescer = None
+        if config_entry.options.get(CONF_COALESCE_UPDATES):
+            window = config_entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+            coalescer = StateCoalescer(data_model, window / 1000, connection.metrics)
+            config_entry.async_on_unload(coalescer.cancel)
+            logger.debug(f"Coalescing state reports with a {window}ms window")
+
+        # Changes made at the device's controls, fired as events straight from the frame;
+        # the reports echoing this integration's own commands are told apart
+        panel_events = PanelEventDetector()
+        connection.on_control_command = panel_events.expect_echo
+
+        # Subscribe
+        notifications = Notifications(model=data_model, metadata=metadata, metrics=connection.metrics,
+                                      coalescer=coalescer, panel_events=panel_events,
+                                      telemetry=telemetry.append)
+        await connection.subscribe(notifications)
+        logger.debug("Subscribed notifications handler")
+
+        # Optionally time each stage of the notification path
+        profiler = None
+        if config_entry.options.get(CONF_PROFILING):
+            budget = config_entry.options.get(CONF_CALLBACK_BUDGET, DEFAULT_CALLBACK_BUDGET)
+            profiler = StageProfiler(budget / 1000)
+            connection.profiler = notifications.profiler = data_model.profiler = profiler
+            logger.debug(f"Profiling notification callbacks with a {budget}ms budget")
+
+        # Start requesting info, skipping what was already read after pairing
+        if metadata.valve_sw_version is None:
+            logger.debug("Requesting technical info")
+            await connection.request_technical_info()
+            await metadata.wait_for_technical_info()
+            logger.debug("Technical info received")
+
+        # The enabled outlets and the outlet settings decide which outlet entities are created
+        if metadata.outlet_enabled is None:
+            logger.debug("Requesting device settings")
+            await connection.request_device_settings()
+            try:
+                await asyncio.wait_for(metadata.wait_for_device_settings(), DEVICE_SETTINGS_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("No device settings received, assuming both outlets are enabled")
+        if metadata.max_temperature is None:
+            logger.debug("Requesting outlet settings")
+            await connection.request_outlet_settings()
+            try:
+                await asyncio.wait_for(metadata.wait_for_outlet_settings(), DEVICE_SETTINGS_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("No outlet settings received, keeping the outlets of the device settings")
 
-    # Start requesting info
-    logger.debug("Requesting technical info")
-    await connection.request_technical_info()
-    await metadata.wait_for_technical_info()
-    logger.debug("Technical info received")
+        logger.debug("Requesting initial device state")
+        await connection.request_device_state()
+    except Exception as e:
+        # Release the link and any notification task before HA retries setup
+        await connection.close()
+        await telemetry.async_close()
+        raise ConfigEntryNotReady(f"Unable to set up device at {device_address}: {e}") from e
 
-    logger.debug("Requesting initial device state")
-    await connection.request_device_state()
+    # Detect shower sessions from model updates and keep their history
+    sessions = SoakStationSessions(hass, data_model, metadata)
+    await sessions.async_load()
+    config_entry.async_on_unload(sessions.async_start())
+
+    # Learn the heat-up time from sessions and run scheduled pre-warms
+    prewarm = SoakStationPrewarm(hass, connection, data_model, metadata, sessions)
+    await prewarm.async_load()
+    config_entry.async_on_unload(prewarm.async_start())
+
+    # Learn when the device is used and hold the link only around that time
+    warmup = SoakStationWarmup(hass, config_entry, connection, data_model, metadata,
+                               release_idle=config_entry.options.get(CONF_RELEASE_IDLE, False),
+                               triggers=config_entry.options.get(CONF_WARMUP_TRIGGERS, []))
+    await warmup.async_load()
+    config_entry.async_on_unload(warmup.async_start())
+
+    # Import hourly aggregates as long-term statistics
+    statistics = SoakStationStatisticsExport(hass, data_model, metadata, config_entry.data["device_name"])
+    await statistics.async_load()
+    config_entry.async_on_unload(statistics.async_start())
+
+    config_entry.async_on_unload(async_fire_panel_events(hass, panel_events, device_address))
+    config_entry.async_on_unload(telemetry.async_start())
+
+    # Mark entities unavailable and reconnect when the link goes quiet or drops
+    watchdog = LinkWatchdog(hass, connection, data_model, POLL_INTERVAL)
+    config_entry.async_on_unload(watchdog.async_start())
 
     hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = {
         "connection": connection,
         "data": data_model,
         "metadata": metadata,
+        "sessions": sessions,
+        "prewarm": prewarm,
+        "warmup": warmup,
+        "watchdog": watchdog,
+        "write_filters": {},
+        "profiler": profiler,
+        "coalescer": coalescer,
+        "panel_events": panel_events,
+        "telemetry": telemetry,
+        "statistics": statistics,
+        "clients": None,
+        "setup_timing": None,
     }
     logger.debug("Stored device data in hass.data")
 
-    # Set up periodic polling every 10 seconds
+    # Set up periodic polling
     async def poll_device_state(now):
+        if connection.is_closed:
+            logger.debug("Connection closed, skipping poll")
+            return
+        if connection.is_released:
+            logger.debug("Link released while idle, skipping poll")
+            return
+        if not data_model.available:
+            logger.debug("Watchdog is recovering the link, skipping poll")
+            return
         logger.debug("Polling device state")
         try:
             await connection.request_device_state()
@@ -72,24 +255,77 @@ async def async_setup_entry(hass, config_entry):
         except Exception as e:
             logger.warning(f"Failed to poll device state: {e}")
 
-    logger.debug("Setting up periodic polling every 20 seconds")
-    async_track_time_interval(hass, poll_device_state, timedelta(seconds=20))
+    logger.debug(f"Setting up periodic polling every {POLL_INTERVAL}")
+    config_entry.async_on_unload(
+        async_track_time_interval(hass, poll_device_state, POLL_INTERVAL)
+    )
+
+    # Reload to apply changed options such as the write filter thresholds
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
 
     logger.debug("Setting up platform entries")
-    await hass.config_entries.async_forward_entry_setups(config_entry, ["binary_sensor", "sensor", "switch"])
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+    # Entities are live now; after pairing, time it from the pairing form's submit
+    now = time.monotonic()
+    timing = {
+        "handoff": handoff is not None,
+        "setup_seconds": round(now - setup_started_at, 3),
+        "since_pairing_seconds": round(now - handoff.started_at, 3) if handoff is not None else None,
+    }
+    hass.data[DOMAIN][config_entry.entry_id]["setup_timing"] = timing
+    if handoff is not None:
+        logger.info(f"Entities of {device_address} live {timing['since_pairing_seconds']:.2f}s after pairing "
+                    f"started, setup took {timing['setup_seconds']:.2f}s on the handed over link")
+    else:
+        logger.debug(f"Setup took {timing['setup_seconds']:.2f}s")
+
+    # Look for stale clients filling the device's slots once setup is done
+    from .client_inventory import async_check_clients
+    config_entry.async_create_background_task(
+        hass, async_check_clients(hass, config_entry.entry_id, hass.data[DOMAIN][config_entry.entry_id]),
+        f"{DOMAIN} client inventory"
+    )
     return True
 
+async def async_migrate_entry(hass, config_entry):
+    if config_entry.version == 1:
+        # Entries created before discovery have no unique ID, so the device
+        # would be offered again and pairing it would take a second slot
+        logger.debug(f"Migrating entry to version 2 with unique ID {config_entry.data['device_address']}")
+        hass.config_entries.async_update_entry(
+            config_entry, unique_id=config_entry.data["device_address"], version=2
+        )
+    return True
+
+async def async_reload_entry(hass, config_entry):
+    logger.debug("Options updated, reloading entry")
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
 async def async_unload_entry(hass, config_entry):
     logger.debug("Unloading entry")
-    unload_bin = await hass.config_entries.async_forward_entry_unload(config_entry, "binary_sensor")
-    unload_sens = await hass.config_entries.async_forward_entry_unload(config_entry, "sensor")
-    unload_sq = await hass.config_entries.async_forward_entry_unload(config_entry, "switch")
-    logger.debug(f"Unloaded platforms - binary_sensor: {unload_bin}, sensor: {unload_sens}, switch: {unload_sq}")
-
-    connection = hass.data[DOMAIN][config_entry.entry_id]["connection"]
-    logger.debug("Disconnecting from device")
-    await connection.disconnect()
+    unload_ok = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    logger.debug(f"Unloaded platforms {PLATFORMS}: {unload_ok}")
+    if not unload_ok:
+        return False
 
-    hass.data[DOMAIN].pop(config_entry.entry_id)
+    entry_data = hass.data[DOMAIN].pop(config_entry.entry_id)
     logger.debug("Removed device data from hass.data")
-    return unload_bin and unload_sens
+
+    # Closing marks the connection unusable first, so a poll that is already
+    # in flight cannot trigger a reconnect while the entry is torn down.
+    logger.debug("Closing connection to device")
+    await entry_data["connection"].close()
+    if entry_data["coalescer"] is not None:
+        entry_data["coalescer"].cancel()
+    await entry_data["telemetry"].async_close()
+    await entry_data["prewarm"].async_close()
+    return True
+
+async def async_remove_entry(hass, config_entry):
+    # Free the client slot, so adding the device again finds one free
+    await hass.async_add_import_executor_job(_import_setup_modules)
+    from .client_inventory import async_unpair_removed_entry
+
+    logger.debug("Removing entry, unpairing its client")
+    await async_unpair_removed_entry(hass, config_entry)
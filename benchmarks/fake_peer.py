@@ -0,0 +1,296 @@
+"""Local stand-in for a Mira device's GATT server.
+
+The fake peer speaks enough of the Mira protocol to take the integration
+through setup and normal operation: it answers the device information reads,
+technical info and device state requests, acknowledges commands and reports
+outlet changes as controls-operated notifications. It can also push
+notifications at a fixed rate to load the notification path.
+
+FakeBleakClient implements the subset of BleakClient used by Connection and
+routes everything to a FakePeer on the same event loop, so no radio or
+hardware is involved.
+"""
+
+import asyncio
+import struct
+from typing import Any, Callable, Dict, Optional
+
+from bleak.backends.device import BLEDevice
+
+# The peer keeps its own copy of the protocol constants rather than importing
+# the integration, so that importing it does not warm the integration's
+# modules before a cold setup is timed, and so that it does not share any
+# encoding mistakes with the client
+
+UUID_DEVICE_NAME = "00002a00-0000-1000-8000-00805f9b34fb"
+UUID_MODEL_NUMBER = "00002a24-0000-1000-8000-00805f9b34fb"
+UUID_MANUFACTURER = "00002a29-0000-1000-8000-00805f9b34fb"
+UUID_READ = "bccb0003-ca66-11e5-88a4-0002a5d5c51b"
+UUID_WRITE = "bccb0002-ca66-11e5-88a4-0002a5d5c51b"
+
+SUCCESS = 1
+TIMER_RUNNING = 1
+TIMER_PAUSED = 3
+OUTLET_RUNNING = 0x64
+OUTLET_STOPPED = 0
+
+# Opcodes the peer answers with something other than a plain acknowledgement
+OPCODE_DEVICE_STATE = 0x07
+OPCODE_TECHNICAL_INFO = 0x32
+OPCODE_CONTROL_OUTLETS = 0x87
+OPCODE_DEVICE_SETTINGS = 0x3e
+OPCODE_OUTLET_SETTINGS = 0x10
+OPCODE_CLIENTS = 0x6b
+OPCODE_UNPAIR = 0xeb
+FAILURE = 0x80
+
+# Client slot the benchmark entries are paired in
+CLIENT_SLOT = 1
+
+# Header (slot, opcode, length) and CRC around every command payload
+COMMAND_HEADER = 3
+COMMAND_CRC = 2
+
+
+class FakePeer:
+    """Simulated Mira device state and protocol responder.
+
+    Attributes:
+        address: Bluetooth address the peer advertises
+        target_temp: Target temperature in Celsius
+        actual_temp: Actual temperature in Celsius
+        outlets: Running state of outlet 1 and 2
+        remaining_seconds: Remaining timer seconds
+        clients: Paired client names by slot
+        latency: Simulated link latency in seconds before each response
+        frames_pushed: Number of notifications sent
+        commands: Number of commands received
+    """
+
+    def __init__(self, address: str, latency: float = 0.0) -> None:
+        """Initialize the peer.
+
+        Args:
+            address: Bluetooth address the peer advertises
+            latency: Simulated link latency in seconds before each response
+        """
+        self.address: str = address
+        self.target_temp: float = 38.0
+        self.actual_temp: float = 20.0
+        self.outlets = [False, False]
+        self.remaining_seconds: int = 0
+        self.clients: Dict[int, str] = {0: "Mira app", CLIENT_SLOT: "homeassistant"}
+        self.latency: float = latency
+        self.frames_pushed: int = 0
+        self.commands: int = 0
+        self._notify: Optional[Callable[[Any, bytearray], Any]] = None
+        self._buffer = bytearray()
+        self._pusher: Optional[asyncio.Task] = None
+
+    @property
+    def ble_device(self) -> BLEDevice:
+        """BLE device handed to the connection in place of a discovered one."""
+        return BLEDevice(self.address, "Mira Benchmark", None, rssi=-50)
+
+    def read(self, characteristic: str) -> bytes:
+        """Answer a characteristic read.
+
+        Args:
+            characteristic: UUID of the characteristic
+
+        Returns:
+            bytes: Characteristic value
+        """
+        values: Dict[str, bytes] = {
+            UUID_DEVICE_NAME: b"Mira Benchmark",
+            UUID_MANUFACTURER: b"Kohler Mira Ltd",
+            UUID_MODEL_NUMBER: b"Benchmark",
+        }
+        return values[characteristic]
+
+    def start_notify(self, callback: Callable[[Any, bytearray], Any]) -> None:
+        """Register the client's notification callback."""
+        self._notify = callback
+
+    def stop_notify(self) -> None:
+        """Drop the client's notification callback."""
+        self._notify = None
+
+    def write(self, data: bytes) -> None:
+        """Accept a written chunk and respond once a full command has arrived.
+
+        Args:
+            data: Chunk written to the write characteristic
+        """
+        self._buffer.extend(data)
+        while len(self._buffer) >= COMMAND_HEADER:
+            size = COMMAND_HEADER + self._buffer[2] + COMMAND_CRC
+            if len(self._buffer) < size:
+                return
+            command = self._buffer[:size]
+            del self._buffer[:size]
+            self.commands += 1
+            self._respond(command[1], command[COMMAND_HEADER:size - COMMAND_CRC])
+
+    def _respond(self, opcode: int, data: bytearray) -> None:
+        """Send the response to a command.
+
+        Args:
+            opcode: Opcode of the command
+            data: Command data without header and CRC
+        """
+        if opcode == OPCODE_TECHNICAL_INFO:
+            self._send(opcode, struct.pack(">8H", 0, 1, 2, 3, 0, 0, 4, 5))
+        elif opcode == OPCODE_DEVICE_STATE:
+            self._send(opcode, self._device_state())
+        elif opcode == OPCODE_DEVICE_SETTINGS:
+            # Both outlets enabled, no default preset
+            self._send(opcode, bytes([0, 0b11, 0, 0]))
+        elif opcode == OPCODE_OUTLET_SETTINGS:
+            # Minimum duration, then the maximum and minimum temperature
+            self._send(opcode, bytes([0, 0, 0, 0, 30]) + _temperature(48.0) + _temperature(20.0) + bytes(2))
+        elif opcode == OPCODE_CLIENTS and data[0] == 0:
+            self._send(opcode, struct.pack(">H", sum(1 << slot for slot in self.clients)))
+        elif opcode == OPCODE_CLIENTS:
+            name = self.clients.get(data[0] - 0x10)
+            if name is None:
+                self._send(opcode, bytes([FAILURE]))
+            else:
+                self._send(opcode, name.encode("UTF-8").ljust(20, b"\0"))
+        elif opcode == OPCODE_UNPAIR:
+            self.clients.pop(data[0], None)
+            self._send(opcode, bytes([SUCCESS]))
+        elif opcode == OPCODE_CONTROL_OUTLETS:
+            self.target_temp = struct.unpack(">H", data[1:3])[0] / 10.0
+            self.outlets = [data[3] == OUTLET_RUNNING, data[4] == OUTLET_RUNNING]
+            self._send(opcode, bytes([SUCCESS]))
+            self._send(opcode, self._controls_operated())
+        else:
+            self._send(opcode, bytes([SUCCESS]))
+
+    def _timer_state(self) -> int:
+        """Timer state implied by the outlets."""
+        return TIMER_RUNNING if any(self.outlets) else TIMER_PAUSED
+
+    def _outlet_bytes(self) -> bytes:
+        """Outlet states as sent by the device."""
+        return bytes(OUTLET_RUNNING if on else OUTLET_STOPPED for on in self.outlets)
+
+    def _device_state(self) -> bytes:
+        """Build a device state payload, which carries no timer state."""
+        return (
+            bytes([0])
+            + _temperature(self.target_temp)
+            + _temperature(self.actual_temp)
+            + self._outlet_bytes()
+            + struct.pack(">H", self.remaining_seconds)
+            + bytes([0])
+        )
+
+    def _controls_operated(self) -> bytes:
+        """Build a controls-operated payload with the current state."""
+        return (
+            bytes([1, self._timer_state()])
+            + _temperature(self.target_temp)
+            + _temperature(self.actual_temp)
+            + self._outlet_bytes()
+            + struct.pack(">H", self.remaining_seconds)
+            + bytes([0])
+        )
+
+    def _send(self, opcode: int, payload: bytes) -> None:
+        """Deliver a notification to the client after the simulated latency.
+
+        Args:
+            opcode: Opcode echoed in the header
+            payload: Notification payload
+        """
+        frame = bytearray([0x40 + CLIENT_SLOT, opcode, len(payload)]) + payload
+        loop = asyncio.get_running_loop()
+        if self.latency:
+            loop.call_later(self.latency, self._deliver, frame)
+        else:
+            loop.call_soon(self._deliver, frame)
+
+    def _deliver(self, frame: bytearray) -> None:
+        """Invoke the notification callback the way the Bluetooth stack does."""
+        callback = self._notify
+        if callback is None:
+            return
+        self.frames_pushed += 1
+        result = callback(UUID_READ, frame)
+        if asyncio.iscoroutine(result):
+            asyncio.get_running_loop().create_task(result)
+
+    def start_pushing(self, rate: float) -> None:
+        """Push controls-operated notifications at a fixed rate.
+
+        Each notification nudges the actual temperature so that the
+        integration sees a real change.
+
+        Args:
+            rate: Notifications per second
+        """
+        self.stop_pushing()
+        self._pusher = asyncio.get_running_loop().create_task(self._push(rate))
+
+    def stop_pushing(self) -> None:
+        """Stop pushing notifications."""
+        if self._pusher is not None:
+            self._pusher.cancel()
+            self._pusher = None
+
+    async def _push(self, rate: float) -> None:
+        """Push notifications on a fixed schedule until cancelled."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / rate
+        next_push = loop.time()
+        step = 0
+        while True:
+            step += 1
+            self.actual_temp = 20.0 + (step % 200) / 10.0
+            self._deliver(bytearray([0x40 + CLIENT_SLOT, OPCODE_CONTROL_OUTLETS, 11]) + self._controls_operated())
+            next_push += interval
+            delay = next_push - loop.time()
+            # Catch up without sleeping when the loop has fallen behind
+            await asyncio.sleep(delay if delay > 0 else 0)
+
+
+def _temperature(celsius: float) -> bytes:
+    """Encode a temperature in tenths of a degree, as the device does."""
+    return struct.pack(">H", round(celsius * 10))
+
+
+class FakeBleakClient:
+    """Subset of BleakClient used by Connection, backed by a FakePeer."""
+
+    def __init__(self, peer: FakePeer) -> None:
+        """Initialize the client.
+
+        Args:
+            peer: Peer the client talks to
+        """
+        self._peer = peer
+        self.is_connected: bool = False
+
+    async def connect(self) -> bool:
+        self.is_connected = True
+        return True
+
+    async def disconnect(self) -> bool:
+        self._peer.stop_notify()
+        self.is_connected = False
+        return True
+
+    async def read_gatt_char(self, characteristic: str) -> bytearray:
+        return bytearray(self._peer.read(characteristic))
+
+    async def write_gatt_char(self, characteristic: str, data: bytes, response: bool = False) -> None:
+        if characteristic == UUID_WRITE:
+            self._peer.write(data)
+
+    async def start_notify(self, characteristic: str, callback: Callable[[Any, bytearray], Any]) -> None:
+        self._peer.start_notify(callback)
+
+    async def stop_notify(self, characteristic: str) -> None:
+        self._peer.stop_notify()
@@ -0,0 +1,163 @@
+"""Import-time benchmark for the integration and its platforms.
+
+Each target is imported in a fresh interpreter with ``-X importtime`` after
+priming the modules a running Home Assistant has already loaded by then, so
+the reported time is what the target itself adds. The package and config
+flow are also checked for loading the protocol stack, which should only be
+imported once a device is set up.
+
+Usage:
+    python benchmarks/import_time.py [--output results.json] [--runs 5]
+
+Requires homeassistant.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from run import DOMAIN, _install_integration, check_thresholds
+
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / "import_thresholds.json"
+
+PACKAGE = f"custom_components.{DOMAIN}"
+
+# Modules Home Assistant has loaded before it imports the integration
+HOME_ASSISTANT = (
+    "homeassistant.core",
+    "homeassistant.exceptions",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.bluetooth",
+)
+
+# Modules loaded only once an entry is set up
+PROTOCOL = (
+    f"{PACKAGE}.mira.helpers.connection",
+    f"{PACKAGE}.mira.helpers.notifications",
+    f"{PACKAGE}.mira.helpers.telemetry_store",
+    f"{PACKAGE}.sessions",
+    f"{PACKAGE}.telemetry_history",
+    f"{PACKAGE}.statistics_export",
+    f"{PACKAGE}.handoff",
+)
+
+# Name, modules loaded beforehand and module timed
+TARGETS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ("package", HOME_ASSISTANT, PACKAGE),
+    ("config_flow", HOME_ASSISTANT, f"{PACKAGE}.config_flow"),
+    ("protocol", HOME_ASSISTANT + (PACKAGE,), ",".join(PROTOCOL)),
+    ("sensor", HOME_ASSISTANT + ("homeassistant.components.sensor", PACKAGE) + PROTOCOL, f"{PACKAGE}.sensor"),
+    ("binary_sensor", HOME_ASSISTANT + ("homeassistant.components.binary_sensor", PACKAGE) + PROTOCOL,
+     f"{PACKAGE}.binary_sensor"),
+    ("switch", HOME_ASSISTANT + ("homeassistant.components.switch", PACKAGE) + PROTOCOL, f"{PACKAGE}.switch"),
+)
+
+# Targets that must not pull in the protocol stack
+LAZY_TARGETS = ("package", "config_flow")
+
+MARKER = "import time: --- benchmark start ---"
+
+
+def measure(config_dir: str, prime: Tuple[str, ...], target: str) -> Tuple[float, List[str]]:
+    """Import a target in a fresh interpreter.
+
+    Args:
+        config_dir: Directory containing custom_components
+        prime: Modules imported before timing starts
+        target: Module or comma-separated modules to time
+
+    Returns:
+        tuple: Milliseconds spent importing the target and everything it
+        pulled in, and the names of the modules it imported
+    """
+    code = (
+        f"import sys; sys.path.insert(0, {config_dir!r}); "
+        + "".join(f"import {module}; " for module in prime)
+        + f"sys.stderr.write({MARKER + chr(10)!r}); "
+        + f"import {target}"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    lines = result.stderr.splitlines()
+    total_us = 0
+    modules = []
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        total_us += int(self_us)
+        modules.append(name.strip())
+    return total_us / 1000, modules
+
+
+def run(runs: int) -> Dict[str, Any]:
+    """Time every target, keeping the best of several runs.
+
+    Returns:
+        dict: Flat metrics checked against thresholds, and the modules each
+        target imported
+    """
+    metrics: Dict[str, Any] = {}
+    imported: Dict[str, List[str]] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        _install_integration(config_dir)
+        for name, prime, target in TARGETS:
+            best = None
+            for _ in range(runs):
+                elapsed, modules = measure(config_dir, prime, target)
+                best = elapsed if best is None else min(best, elapsed)
+            metrics[f"import_{name}_ms"] = best
+            imported[name] = modules
+
+    for name in LAZY_TARGETS:
+        metrics[f"import_{name}_protocol_modules"] = sum(module in PROTOCOL for module in imported[name])
+    return {"metrics": metrics, "imported": imported}
+
+
+def main() -> int:
+    """Run the import benchmark and report the results.
+
+    Returns:
+        int: Exit status, 1 if any metric exceeded its budget
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Import time budgets")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per target, the fastest is kept")
+    args = parser.parse_args()
+
+    thresholds = json.loads(Path(args.thresholds).read_text())
+    results = run(args.runs)
+    regressions = check_thresholds(results["metrics"], thresholds)
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "parameters": vars(args),
+        **results,
+        "thresholds": thresholds,
+        "regressions": regressions,
+        "passed": not regressions,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""CPU benchmark of the sans-I/O protocol engine.
+
+Feeds recorded-style frames through MiraProtocol as fast as possible, with
+no event loop, transport or Home Assistant involved, and reports frames per
+second for single-chunk and split packets, and command frames built per
+second.
+
+Usage:
+    python benchmarks/protocol.py [--frames 200000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mira.helpers.protocol import MiraProtocol  # noqa: E402
+
+# Controls-operated report: running, 38.0 target, 37.5 actual, outlet 1 on, 300s left
+CONTROLS_OPERATED = bytes([0x41, 0x87, 11, 1, 1, 0x01, 0x7c, 0x01, 0x77, 0x64, 0, 0x01, 0x2c, 0])
+
+# Preset report, which arrives split over two chunks
+PRESET = bytes([0x41, 0x30, 24, 1, 0x01, 0x7c, 0, 30, 1, 0, 0]) + b"Morning".ljust(16, b"\0")
+
+
+def _rate(frames: int, run: Callable[[], None]) -> float:
+    """Run a callable once per frame and return calls per second."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        run()
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> int:
+    """Run the protocol benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=200000, help="Frames per measurement")
+    args = parser.parse_args()
+
+    protocol = MiraProtocol(client_id=12345, client_slot=1)
+    first, second = PRESET[:20], PRESET[20:]
+
+    def split_packet() -> None:
+        protocol.receive_data(first)
+        protocol.receive_data(second)
+
+    results: Dict[str, float] = {
+        "decode_single_chunk_per_s": _rate(args.frames, lambda: protocol.receive_data(CONTROLS_OPERATED)),
+        "decode_split_packet_per_s": _rate(args.frames, split_packet),
+        "build_command_per_s": _rate(args.frames, lambda: protocol.control_outlets_request(True, False, 38.0)),
+    }
+    print(json.dumps({"parameters": vars(args), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+"""End-to-end latency and throughput benchmarks for the integration.
+
+The runner sets up the real integration, its platforms, Connection and
+Notifications inside a test Home Assistant instance, with the bleak client
+replaced by a local stand-in GATT peer (see fake_peer.py). It measures:
+
+- cold and warm setup time of a config entry
+- time from the start of setup to the first valid entity state
+- switch command to confirmation latency
+- notification throughput at increasing push rates
+- event loop CPU per device at a realistic push rate
+
+Results are written as JSON together with the regression thresholds they
+were checked against, and the exit status is non-zero on a regression.
+
+Usage:
+    python benchmarks/run.py [--output results.json] [--thresholds thresholds.json]
+
+Requires homeassistant and pytest-homeassistant-custom-component.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+from fake_peer import FakeBleakClient, FakePeer
+
+logger = logging.getLogger(__name__)
+
+DOMAIN = "soakstation"
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / "thresholds.json"
+
+# Arbitrary client credentials the fake peer accepts
+CLIENT_ID = 0x12345678
+CLIENT_SLOT = 1
+
+# Interval of the probe measuring how late the event loop runs callbacks
+LAG_PROBE_INTERVAL = 0.01
+
+# Seconds to wait for a response before a measurement counts as failed
+CONFIRM_TIMEOUT = 5.0
+
+
+def _address(index: int) -> str:
+    """Bluetooth address of the fake peer with the given index."""
+    return f"AA:BB:CC:DD:EE:{index:02X}"
+
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes a periodic sleeper."""
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.max_lag: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start probing."""
+        self.max_lag = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> float:
+        """Stop probing and return the worst lag in seconds."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        return self.max_lag
+
+    async def _run(self) -> None:
+        """Sleep in a loop and record the worst overshoot."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.max_lag = max(self.max_lag, loop.time() - expected)
+
+
+class Bench:
+    """Drives config entries against fake peers in a test Home Assistant."""
+
+    def __init__(self, hass: Any, latency: float) -> None:
+        """Initialize the bench.
+
+        Args:
+            hass: Test Home Assistant instance
+            latency: Simulated link latency of every peer in seconds
+        """
+        self.hass = hass
+        self.latency = latency
+        self.peers: Dict[str, FakePeer] = {}
+
+    def peer(self, address: str) -> FakePeer:
+        """Get the fake peer at an address, creating it on first use."""
+        if address not in self.peers:
+            self.peers[address] = FakePeer(address, latency=self.latency)
+        return self.peers[address]
+
+    def entry_data(self, entry: Any) -> Dict[str, Any]:
+        """Get the integration's runtime data for an entry."""
+        return self.hass.data[DOMAIN][entry.entry_id]
+
+    async def setup_entry(self, entry: Any) -> Tuple[float, float]:
+        """Set up an entry and wait for its first valid entity state.
+
+        Returns:
+            tuple: Seconds until setup completed and until the first entity
+            of the entry reported a value from the device
+        """
+        from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN
+        from homeassistant.helpers import entity_registry as er
+
+        hass = self.hass
+        registry = er.async_get(hass)
+        first_state: asyncio.Future = hass.loop.create_future()
+
+        def handle_state_changed(event: Any) -> None:
+            new_state = event.data.get("new_state")
+            if first_state.done() or new_state is None:
+                return
+            if new_state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+                return
+            registry_entry = registry.async_get(event.data["entity_id"])
+            if registry_entry is not None and registry_entry.config_entry_id == entry.entry_id:
+                first_state.set_result(time.perf_counter())
+
+        remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, handle_state_changed)
+        try:
+            start = time.perf_counter()
+            if not await hass.config_entries.async_setup(entry.entry_id):
+                raise RuntimeError(f"Setup of {entry.title} failed")
+            setup_done = time.perf_counter()
+            first_state_at = await asyncio.wait_for(first_state, CONFIRM_TIMEOUT)
+        finally:
+            remove_listener()
+        return setup_done - start, first_state_at - start
+
+    def add_entry(self, index: int) -> Any:
+        """Add a config entry paired with a new fake peer."""
+        from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+        address = _address(index)
+        self.peer(address)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Benchmark {index}",
+            unique_id=address,
+            data={"device_address": address, "device_name": f"Benchmark {index}",
+                  "client_id": CLIENT_ID, "client_slot": CLIENT_SLOT},
+            version=2,
+        )
+        entry.add_to_hass(self.hass)
+        return entry
+
+    async def bench_setup(self, entry: Any, warm_runs: int) -> Dict[str, float]:
+        """Time the first setup in the process and repeated setups after unloading."""
+        cold_setup, cold_first_state = await self.setup_entry(entry)
+        warm_setups: List[float] = []
+        warm_first_states: List[float] = []
+        for _ in range(warm_runs):
+            await self.hass.config_entries.async_unload(entry.entry_id)
+            await self.hass.async_block_till_done()
+            setup, first_state = await self.setup_entry(entry)
+            warm_setups.append(setup)
+            warm_first_states.append(first_state)
+        return {
+            "cold_setup_ms": cold_setup * 1000,
+            "cold_first_state_ms": cold_first_state * 1000,
+            "warm_setup_ms": statistics.median(warm_setups) * 1000,
+            "warm_first_state_ms": statistics.median(warm_first_states) * 1000,
+        }
+
+    async def bench_switch(self, entry: Any, iterations: int) -> Dict[str, float]:
+        """Time outlet switch service calls until the device confirms the new state."""
+        from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+        from homeassistant.helpers import entity_registry as er
+
+        hass = self.hass
+        unique_id = f"{entry.unique_id.replace(':', '')}_outlet_1"
+        entity_id = er.async_get(hass).async_get_entity_id("switch", DOMAIN, unique_id)
+        latencies: List[float] = []
+
+        for iteration in range(iterations):
+            target = STATE_ON if iteration % 2 == 0 else STATE_OFF
+            confirmed: asyncio.Future = hass.loop.create_future()
+
+            def handle_state_changed(event: Any, target: str = target, confirmed: asyncio.Future = confirmed) -> None:
+                new_state = event.data.get("new_state")
+                if (event.data["entity_id"] == entity_id and new_state is not None
+                        and new_state.state == target and not confirmed.done()):
+                    confirmed.set_result(time.perf_counter())
+
+            remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, handle_state_changed)
+            try:
+                start = time.perf_counter()
+                await hass.services.async_call("switch", f"turn_{target}", {"entity_id": entity_id}, blocking=False)
+                latencies.append(await asyncio.wait_for(confirmed, CONFIRM_TIMEOUT) - start)
+            finally:
+                remove_listener()
+
+        latencies.sort()
+        return {
+            "switch_confirm_p50_ms": statistics.median(latencies) * 1000,
+            "switch_confirm_p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+            "switch_confirm_max_ms": latencies[-1] * 1000,
+        }
+
+    async def bench_throughput(self, entry: Any, rates: List[int], duration: float) -> Dict[str, Any]:
+        """Push notifications at increasing rates and count how many are handled."""
+        metrics = importlib.import_module(f"custom_components.{DOMAIN}.mira.helpers.metrics")
+        counters = self.entry_data(entry)["connection"].metrics.counters
+        peer = self.peers[entry.unique_id]
+        probe = LoopLagProbe()
+        results = {}
+
+        for rate in rates:
+            received_before = counters[metrics.FRAMES_RECEIVED]
+            pushed_before = peer.frames_pushed
+            probe.start()
+            cpu_before = time.process_time()
+            start = time.perf_counter()
+            peer.start_pushing(rate)
+            await asyncio.sleep(duration)
+            peer.stop_pushing()
+            # Let notification tasks already scheduled finish
+            await self.hass.async_block_till_done()
+            elapsed = time.perf_counter() - start
+            cpu = time.process_time() - cpu_before
+            max_lag = probe.stop()
+
+            pushed = peer.frames_pushed - pushed_before
+            handled = counters[metrics.FRAMES_RECEIVED] - received_before
+            results[f"{rate}hz"] = {
+                "pushed_per_s": pushed / elapsed,
+                "handled_per_s": handled / elapsed,
+                "handled_ratio": handled / (rate * duration),
+                "cpu_percent": cpu / elapsed * 100,
+                "max_loop_lag_ms": max_lag * 1000,
+            }
+        return results
+
+    async def bench_cpu_per_device(self, entries: List[Any], rate: float, duration: float) -> Dict[str, float]:
+        """Measure process CPU per device pushing at a realistic rate, net of idle."""
+        cpu_before = time.process_time()
+        await asyncio.sleep(duration)
+        idle = time.process_time() - cpu_before
+
+        for entry in entries:
+            self.peers[entry.unique_id].start_pushing(rate)
+        cpu_before = time.process_time()
+        await asyncio.sleep(duration)
+        busy = time.process_time() - cpu_before
+        for entry in entries:
+            self.peers[entry.unique_id].stop_pushing()
+        await self.hass.async_block_till_done()
+
+        return {
+            "devices": len(entries),
+            "push_rate_hz": rate,
+            "idle_cpu_percent": idle / duration * 100,
+            "cpu_per_device_percent": max(0.0, busy - idle) / duration / len(entries) * 100,
+        }
+
+
+def _install_integration(config_dir: str) -> None:
+    """Expose this checkout as a custom component of the test instance."""
+    custom_components = Path(config_dir, "custom_components")
+    custom_components.mkdir()
+    (custom_components / "__init__.py").touch()
+    os.symlink(INTEGRATION_DIR, custom_components / DOMAIN, target_is_directory=True)
+    sys.path.insert(0, config_dir)
+
+
+@contextlib.asynccontextmanager
+async def bench_home_assistant(latency: float) -> AsyncIterator[Bench]:
+    """Start a test Home Assistant with the integration installed and devices faked.
+
+    Args:
+        latency: Simulated link latency of every peer in seconds
+
+    Yields:
+        Bench: Bench driving config entries in the instance
+    """
+    from homeassistant import loader
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    bench: Optional[Bench] = None
+
+    # Resolve devices to fake peers at the bleak and Bluetooth integration boundary
+    def make_client(device: Any, *client_args: Any, **client_kwargs: Any) -> FakeBleakClient:
+        return FakeBleakClient(bench.peer(device.address))
+
+    def ble_device_from_address(hass: Any, address: str, connectable: bool = True) -> Any:
+        return bench.peer(address).ble_device
+
+    with tempfile.TemporaryDirectory() as config_dir, \
+            patch("bleak.BleakClient", make_client), \
+            patch("homeassistant.components.bluetooth.async_scanner_devices_by_address", return_value=[]), \
+            patch("homeassistant.components.bluetooth.async_ble_device_from_address", ble_device_from_address):
+        _install_integration(config_dir)
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Let the test instance load custom components, with the
+            # Bluetooth stack the integration depends on treated as set up
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            hass.config.components.update({"bluetooth", "bluetooth_adapters"})
+            bench = Bench(hass, latency)
+            yield bench
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run all benchmarks.
+
+    Returns:
+        dict: Flat metrics checked against thresholds and per-rate throughput details
+    """
+    async with bench_home_assistant(args.link_latency) as bench:
+        hass = bench.hass
+        entry = bench.add_entry(0)
+        metrics: Dict[str, Any] = {}
+        metrics.update(await bench.bench_setup(entry, args.warm_runs))
+        metrics.update(await bench.bench_switch(entry, args.switch_iterations))
+        throughput = await bench.bench_throughput(entry, args.rates, args.duration)
+        for rate, result in throughput.items():
+            metrics[f"throughput_{rate}_handled_ratio"] = result["handled_ratio"]
+            metrics[f"throughput_{rate}_max_loop_lag_ms"] = result["max_loop_lag_ms"]
+
+        entries = [entry] + [bench.add_entry(index) for index in range(1, args.devices)]
+        for extra in entries[1:]:
+            await bench.setup_entry(extra)
+        cpu = await bench.bench_cpu_per_device(entries, args.device_rate, args.duration)
+        metrics["cpu_per_device_percent"] = cpu["cpu_per_device_percent"]
+
+        for extra in entries:
+            await hass.config_entries.async_unload(extra.entry_id)
+        await hass.async_block_till_done()
+
+    return {"metrics": metrics, "throughput": throughput, "cpu": cpu}
+
+
+def check_thresholds(metrics: Dict[str, Any], thresholds: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Compare metrics with their thresholds.
+
+    Args:
+        metrics: Measured values by name
+        thresholds: Bounds by metric name, each with a "max" and/or "min"
+
+    Returns:
+        list: One entry per metric outside its bounds or missing
+    """
+    regressions = []
+    for name, bounds in thresholds.items():
+        value = metrics.get(name)
+        if value is None:
+            regressions.append({"metric": name, "value": None, "reason": "missing"})
+        elif "max" in bounds and value > bounds["max"]:
+            regressions.append({"metric": name, "value": value, "max": bounds["max"]})
+        elif "min" in bounds and value < bounds["min"]:
+            regressions.append({"metric": name, "value": value, "min": bounds["min"]})
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and report the results.
+
+    Returns:
+        int: Exit status, 1 if any metric regressed
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Regression thresholds")
+    parser.add_argument("--rates", type=int, nargs="+", default=[10, 50, 200, 1000],
+                        help="Notification push rates per second")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per throughput and CPU stage")
+    parser.add_argument("--warm-runs", type=int, default=5, help="Warm setups after the cold one")
+    parser.add_argument("--switch-iterations", type=int, default=50, help="Switch commands to time")
+    parser.add_argument("--devices", type=int, default=4, help="Devices in the CPU per device stage")
+    parser.add_argument("--device-rate", type=float, default=2.0,
+                        help="Notifications per second per device in the CPU stage")
+    parser.add_argument("--link-latency", type=float, default=0.0,
+                        help="Simulated link latency in seconds before each response")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    thresholds = json.loads(Path(args.thresholds).read_text())
+    results = asyncio.run(run(args))
+    regressions = check_thresholds(results["metrics"], thresholds)
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "parameters": vars(args),
+        **results,
+        "thresholds": thresholds,
+        "regressions": regressions,
+        "passed": not regressions,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,54 @@
 """Binary sensor platform for Mira Soak Station devices.
 
 This module handles the setup of binary sensors that monitor the state
-of individual outlets on the Mira Soak Station device.
+of individual outlets on the Mira Soak Station device, and whether the
+water has reached its target temperature.
 """
 
 from __future__ import annotations
 import logging
+from dataclasses import dataclass
 
+from homeassistant.components.binary_sensor import BinarySensorEntityDescription
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
 from .mira.sensors.outlet_binary_sensor import SoakStationOutletBinarySensor
+from .mira.sensors.ready_binary_sensor import SoakStationReadyBinarySensor
 from .const import DOMAIN
+from .mira.helpers.descriptions import SoakStationEntityDescription, build_entities
+from .mira.helpers.write_filter import StateWriteFilter
+
+
+@dataclass(frozen=True, kw_only=True)
+class SoakStationBinarySensorEntityDescription(BinarySensorEntityDescription, SoakStationEntityDescription):
+    """Description of a Mira Soak Station binary sensor."""
+
+
+def _create_outlet_sensor(hass, config_entry, entry_data, description):
+    """Create the running state sensor of an outlet."""
+    # Outlet transitions are always written immediately
+    write_filter = entry_data["write_filters"].setdefault(f"{description.key}_binary_sensor", StateWriteFilter())
+    return SoakStationOutletBinarySensor(
+        hass, entry_data["data"], entry_data["metadata"], config_entry.data["device_name"],
+        config_entry.data["device_address"], outlet_num=description.outlet, write_filter=write_filter
+    )
+
+
+def _create_ready_sensor(hass, config_entry, entry_data, description):
+    """Create the sensor telling whether the water is at its target temperature."""
+    return SoakStationReadyBinarySensor(
+        hass, entry_data["data"], entry_data["metadata"], config_entry.data["device_name"],
+        config_entry.data["device_address"]
+    )
+
+
+BINARY_SENSORS = (
+    SoakStationBinarySensorEntityDescription(key="outlet_1", outlet=1, create_fn=_create_outlet_sensor),
+    SoakStationBinarySensorEntityDescription(key="outlet_2", outlet=2, create_fn=_create_outlet_sensor),
+    SoakStationBinarySensorEntityDescription(key="ready", create_fn=_create_ready_sensor),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -20,29 +57,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up binary sensors for the Mira Soak Station device.
     
+    Only the outlets the device supports get a sensor.
+    
     Args:
         hass: Home Assistant instance
         config_entry: Configuration entry containing device details
         async_add_entities: Callback to add entities to Home Assistant
     """
-    # Extract device configuration
-    data = config_entry.data
-    address = data["device_address"]
-    device_name = data["device_name"]
-
-    # Get device data and metadata from hass storage
-    config_data = hass.data[DOMAIN][config_entry.entry_id]["data"]
-    meta = hass.data[DOMAIN][config_entry.entry_id]["metadata"]
-
-    # Create binary sensors for each outlet
-    sensors = [
-        SoakStationOutletBinarySensor(
-            hass, config_data, meta, device_name, address, outlet_num=1
-        ),
-        SoakStationOutletBinarySensor(
-            hass, config_data, meta, device_name, address, outlet_num=2
-        )
-    ]
-
-    # Register sensors with Home Assistant
-    async_add_entities(sensors)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(build_entities(BINARY_SENSORS, hass, config_entry, entry_data))
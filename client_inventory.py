@@ -0,0 +1,149 @@
+"""Client slot housekeeping for Mira Soak Station devices.
+
+This module takes the client slot inventory of a device once it is set up
+and raises a fixable repair issue when other Home Assistant clients occupy
+slots, typically left behind by entries that were removed before slots
+were freed on removal. Fixing the issue, or the unpair_client service,
+unpairs them. Removing an entry frees its own slot, so adding the device
+again finds a free slot on the first attempt.
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
+
+from .const import DOMAIN
+from .mira.helpers.client_slots import DEFAULT_CLIENT_NAME, ClientSlot, build_inventory
+from .mira.helpers.connection import RESPONSE_TIMEOUT, Connection
+from .mira.helpers.notifications import Notifications
+
+logger = logging.getLogger(__name__)
+
+ISSUE_STALE_CLIENTS = "stale_clients"
+
+
+def stale_clients_issue_id(address: str) -> str:
+    """Get the repair issue ID for stale clients of a device."""
+    return f"{ISSUE_STALE_CLIENTS}_{address.replace(':', '').lower()}"
+
+
+async def async_refresh_inventory(hass: HomeAssistant, entry_id: str,
+                                  entry_data: Dict[str, Any]) -> List[ClientSlot]:
+    """Take the client slot inventory and raise or clear the repair issue.
+
+    Args:
+        hass: Home Assistant instance
+        entry_id: Config entry of the device
+        entry_data: Entry data stored in hass.data
+
+    Returns:
+        list: Paired clients by slot number
+    """
+    connection: Connection = entry_data["connection"]
+    metadata = entry_data["metadata"]
+    names = await connection.fetch_client_inventory()
+    inventory = build_inventory(names, connection.client_slot)
+    entry_data["clients"] = inventory
+    logger.debug(f"Client inventory: {inventory}")
+
+    issue_id = stale_clients_issue_id(metadata.device_address)
+    stale = [client.slot for client in inventory if client.stale]
+    if stale:
+        ir.async_create_issue(
+            hass, DOMAIN, issue_id,
+            is_fixable=True,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=ISSUE_STALE_CLIENTS,
+            translation_placeholders={
+                "name": metadata.name or metadata.device_address,
+                "slots": ", ".join(str(slot) for slot in stale),
+                "used": str(len(inventory)),
+            },
+            data={"entry_id": entry_id},
+        )
+    else:
+        ir.async_delete_issue(hass, DOMAIN, issue_id)
+    return inventory
+
+
+async def async_unpair_clients(hass: HomeAssistant, entry_id: str, entry_data: Dict[str, Any],
+                               slots: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Unpair clients from a device and take a fresh inventory.
+
+    Args:
+        hass: Home Assistant instance
+        entry_id: Config entry of the device
+        entry_data: Entry data stored in hass.data
+        slots: Slots to unpair, the stale Home Assistant clients by default
+
+    Returns:
+        dict: Unpaired slots, stale slots skipped because their name could
+        not be confirmed, and the clients left
+
+    Raises:
+        HomeAssistantError: If asked to unpair the entry's own slot
+    """
+    connection: Connection = entry_data["connection"]
+    skipped: List[int] = []
+    if slots is None:
+        inventory = await async_refresh_inventory(hass, entry_id, entry_data)
+        slots = []
+        for client in inventory:
+            if not client.stale:
+                continue
+            # Names of the pipelined inventory are assigned by arrival order,
+            # so confirm each one on its own before unpairing the slot
+            name = await connection.fetch_client_name(client.slot)
+            if name == DEFAULT_CLIENT_NAME:
+                slots.append(client.slot)
+            else:
+                logger.debug(f"Client in slot {client.slot} reported as {name!r} on its own, not unpairing it")
+                skipped.append(client.slot)
+    if connection.client_slot in slots:
+        raise HomeAssistantError(f"Slot {connection.client_slot} is this integration's own client")
+
+    for slot in slots:
+        logger.info(f"Unpairing client in slot {slot}")
+        await connection.unpair_client(slot)
+    inventory = await async_refresh_inventory(hass, entry_id, entry_data)
+    return {"unpaired": slots, "skipped": skipped, "clients": [asdict(client) for client in inventory]}
+
+
+async def async_check_clients(hass: HomeAssistant, entry_id: str, entry_data: Dict[str, Any]) -> None:
+    """Take the inventory after setup, logging rather than raising failures."""
+    try:
+        await async_refresh_inventory(hass, entry_id, entry_data)
+    except Exception as e:
+        logger.debug(f"Failed to take client inventory: {e}")
+
+
+async def async_unpair_removed_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Free the client slot of a removed entry on the device.
+
+    Args:
+        hass: Home Assistant instance
+        config_entry: Removed config entry
+    """
+    ir.async_delete_issue(hass, DOMAIN, stale_clients_issue_id(config_entry.data["device_address"]))
+    client_slot = config_entry.data["client_slot"]
+    connection = Connection(hass, config_entry.data["device_address"], config_entry.data["client_id"],
+                            client_slot)
+    try:
+        await connection.connect(retries=2)
+        notifications = Notifications(metrics=connection.metrics)
+        await connection.subscribe(notifications)
+        notifications.reset()
+        await connection.unpair_client(client_slot)
+        await asyncio.wait_for(notifications.wait(), RESPONSE_TIMEOUT)
+        logger.info(f"Unpaired client slot {client_slot} of removed entry")
+    except Exception as e:
+        logger.warning(f"Could not free client slot {client_slot} on the device, "
+                       f"unpair it with the unpair_client service or the Mira app: {e}")
+    finally:
+        await connection.close()
@@ -4,15 +4,36 @@ This module handles the device discovery and pairing process during
 initial setup of the Mira Soak Station integration.
 """
 
+import importlib
 import logging
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import config_validation as cv
-from homeassistant.components.bluetooth import async_get_scanner
+from homeassistant.helpers import config_validation as cv, selector
+from homeassistant.components.bluetooth import (
+    BluetoothServiceInfoBleak,
+    async_discovered_service_info,
+    async_get_scanner,
+)
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_CALLBACK_BUDGET,
+    CONF_COALESCE_UPDATES,
+    CONF_COALESCE_WINDOW,
+    CONF_PROFILING,
+    CONF_RELEASE_IDLE,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TIMER_MIN_INTERVAL,
+    CONF_WARMUP_TRIGGERS,
+    DEFAULT_CALLBACK_BUDGET,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TIMER_MIN_INTERVAL,
+)
+from .mira.helpers.const import UUID_SERVICE
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +46,70 @@ CONF_CLIENT_SLOT = "client_slot"
 class SoakStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle the configuration flow for Mira Soak Station devices."""
 
-    VERSION = 1
+    # Version 2 entries carry the device address as unique ID
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return SoakStationOptionsFlow(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize the configuration flow."""
+        self._device_options = {}
+        self._discovery_info = None
+        self._client_id = None
+        self._client_slot = None
+
+    async def async_step_bluetooth(self, discovery_info: BluetoothServiceInfoBleak) -> FlowResult:
+        """Handle a Mira device discovered by the Bluetooth integration.
+        
+        Args:
+            discovery_info: Advertisement data of the discovered device
+            
+        Returns:
+            FlowResult: The confirmation step for the discovered device
+        """
+        logger.debug(f"Discovered Mira device via Bluetooth: {discovery_info.name} at {discovery_info.address}")
+        await self.async_set_unique_id(discovery_info.address)
+        self._abort_if_unique_id_configured()
+
+        self._discovery_info = discovery_info
+        self.context["title_placeholders"] = {"name": discovery_info.name or discovery_info.address}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(self, user_input=None) -> FlowResult:
+        """Confirm pairing with a device discovered via Bluetooth.
+        
+        Args:
+            user_input: User input from the confirmation form
+            
+        Returns:
+            FlowResult: The confirmation form, or the created entry
+        """
+        device_address = self._discovery_info.address
+        device_name = self._discovery_info.name or device_address
+        errors = {}
+
+        if user_input is not None:
+            errors = await self._async_pair(device_address)
+            if not errors:
+                return self._create_entry(device_name, device_address)
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            description_placeholders={"name": device_name},
+            errors=errors,
+        )
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step of the configuration flow.
         
-        This step discovers available Mira devices and handles the pairing process.
+        This step offers the Mira devices already seen by Home Assistant's
+        Bluetooth integration, falling back to an active scan only when none
+        are known, and handles the pairing process.
         
         Args:
             user_input: User input from the configuration form
@@ -38,24 +117,13 @@ class SoakStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         Returns:
             FlowResult: The next step in the configuration flow
         """
-        from .mira.config_helper import config_flow_pairing
-
         errors = {}
-        mira_devices = {}
 
         # First step: discover and show available Mira devices
         if user_input is None:
-            logger.debug("Starting device discovery")
-            scanner = async_get_scanner(self.hass)
-            devices = await scanner.discover(timeout=5.0)
-            logger.debug(f"Discovered {len(devices)} devices")
-
-            # Filter for Mira devices
-            for device in devices:
-                name = device.name or "Unknown"
-                if "Mira" in name:
-                    mira_devices[device.address] = name
-                    logger.debug(f"Found Mira device: {name} at {device.address}")
+            mira_devices = self._discovered_devices()
+            if not mira_devices:
+                mira_devices = await self._scan_devices()
 
             if not mira_devices:
                 logger.debug("No Mira devices found")
@@ -70,25 +138,102 @@ class SoakStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         device_name = self._device_options[device_address]
         logger.debug(f"Selected device: {device_name} at {device_address}")
 
+        await self.async_set_unique_id(device_address, raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+
+        errors = await self._async_pair(device_address)
+        if errors:
+            return await self.show_selection_form(errors, self._device_options)
+        return self._create_entry(device_name, device_address)
+
+    def _discovered_devices(self):
+        """Get Mira devices from Home Assistant's advertisement cache.
+        
+        Returns:
+            dict: Names of unconfigured Mira devices keyed by address
+        """
+        configured = self._async_current_ids()
+        mira_devices = {}
+        for service_info in async_discovered_service_info(self.hass, connectable=True):
+            if service_info.address in configured or not _is_mira_device(service_info.name, service_info.service_uuids):
+                continue
+            mira_devices[service_info.address] = service_info.name or service_info.address
+            logger.debug(f"Found cached Mira device: {service_info.name} at {service_info.address}")
+        return mira_devices
+
+    async def _scan_devices(self):
+        """Actively scan for Mira devices.
+        
+        Only used when the advertisement cache has no Mira devices, as the
+        scan is slow and competes with Home Assistant's own scanner.
+        
+        Returns:
+            dict: Names of unconfigured Mira devices keyed by address
+        """
+        logger.debug("No cached Mira devices, starting active discovery")
+        configured = self._async_current_ids()
+        scanner = async_get_scanner(self.hass)
+        devices = await scanner.discover(timeout=5.0)
+        logger.debug(f"Discovered {len(devices)} devices")
+
+        # Filter for Mira devices
+        mira_devices = {}
+        for device in devices:
+            name = device.name or "Unknown"
+            if device.address not in configured and _is_mira_device(name, []):
+                mira_devices[device.address] = name
+                logger.debug(f"Found Mira device: {name} at {device.address}")
+        return mira_devices
+
+    async def _async_pair(self, device_address):
+        """Pair with a device and remember the assigned client details.
+        
+        Args:
+            device_address: Bluetooth MAC address of the device
+            
+        Returns:
+            dict: Errors to display, empty if pairing succeeded
+        """
+        # Pairing needs the protocol stack, imported off the event loop
+        await self.hass.async_add_import_executor_job(importlib.import_module, ".handoff", __package__)
+        from .handoff import async_park_paired_device
+        from .mira.config_helper import config_flow_pairing_connected
+        from .mira.helpers.client_slots import PairingRejectedError
+
         try:
             # Attempt to pair with the selected device
             logger.debug("Starting pairing process")
-            client_id, client_slot = await config_flow_pairing(self.hass, device_address)
-            logger.debug(f"Successfully paired with device. Client ID: {client_id}, Slot: {client_slot}")
+            paired = await config_flow_pairing_connected(self.hass, device_address)
+            self._client_id, self._client_slot = paired.client_id, paired.client_slot
+            logger.debug(f"Successfully paired with device. Client ID: {self._client_id}, Slot: {self._client_slot}")
+            # The entry created next takes over the link instead of connecting again
+            async_park_paired_device(self.hass, device_address, paired)
+        except PairingRejectedError:
+            logger.warning(f"Device at {device_address} rejected pairing, its client slots may be full")
+            return {"base": "slots_full"}
         except Exception as e:
             logger.exception("Failed to pair with Mira device")
-            errors["base"] = "pairing_failed"
-            return await self.show_selection_form(errors, mira_devices)
+            return {"base": "pairing_failed"}
+        return {}
 
-        # Create configuration entry on successful pairing
+    def _create_entry(self, device_name, device_address) -> FlowResult:
+        """Create the configuration entry after successful pairing.
+        
+        Args:
+            device_name: Name of the paired device
+            device_address: Bluetooth MAC address of the paired device
+            
+        Returns:
+            FlowResult: The created entry
+        """
         logger.debug("Creating configuration entry")
         return self.async_create_entry(
             title=device_name,
             data={
                 "device_name": device_name,
                 "device_address": device_address,
-                "client_id": client_id,
-                "client_slot": client_slot,
+                "client_id": self._client_id,
+                "client_slot": self._client_slot,
             }
         )
 
@@ -110,3 +255,80 @@ class SoakStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }),
             errors=errors
         )
+
+
+def _is_mira_device(name, service_uuids) -> bool:
+    """Check whether advertisement data belongs to a Mira device.
+    
+    Args:
+        name: Advertised local name
+        service_uuids: Advertised service UUIDs
+        
+    Returns:
+        bool: True if the name or services identify a Mira device
+    """
+    return "Mira" in (name or "") or UUID_SERVICE in service_uuids
+
+
+class SoakStationOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for a configured Mira Soak Station device."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow.
+        
+        Args:
+            config_entry: The configuration entry being edited
+        """
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the state write filter, profiling and link warm-up options.
+        
+        Args:
+            user_input: User input from the options form
+            
+        Returns:
+            FlowResult: The options form, or the created options entry
+        """
+        if user_input is not None:
+            logger.debug(f"Updating options: {user_input}")
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_TIMER_MIN_INTERVAL,
+                    default=options.get(CONF_TIMER_MIN_INTERVAL, DEFAULT_TIMER_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                vol.Optional(
+                    CONF_PROFILING,
+                    default=options.get(CONF_PROFILING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_CALLBACK_BUDGET,
+                    default=options.get(CONF_CALLBACK_BUDGET, DEFAULT_CALLBACK_BUDGET),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1000)),
+                vol.Optional(
+                    CONF_COALESCE_UPDATES,
+                    default=options.get(CONF_COALESCE_UPDATES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_COALESCE_WINDOW,
+                    default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_RELEASE_IDLE,
+                    default=options.get(CONF_RELEASE_IDLE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_WARMUP_TRIGGERS,
+                    default=options.get(CONF_WARMUP_TRIGGERS, []),
+                ): selector.EntitySelector(selector.EntitySelectorConfig(multiple=True)),
+            }),
+        )
@@ -1 +1,29 @@
 DOMAIN = "soakstation"
+
+PLATFORMS = ["binary_sensor", "event", "sensor", "switch"]
+
+# Options
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_TIMER_MIN_INTERVAL = "timer_min_interval"
+CONF_PROFILING = "profiling"
+CONF_CALLBACK_BUDGET = "callback_budget"
+CONF_COALESCE_UPDATES = "coalesce_updates"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_RELEASE_IDLE = "release_idle"
+CONF_WARMUP_TRIGGERS = "warmup_triggers"
+
+DEFAULT_TEMPERATURE_DEADBAND = 0.5
+DEFAULT_TIMER_MIN_INTERVAL = 1
+DEFAULT_CALLBACK_BUDGET = 5
+DEFAULT_COALESCE_WINDOW = 0
+
+# Events
+EVENT_SESSION_ENDED = f"{DOMAIN}_session_ended"
+EVENT_PANEL = f"{DOMAIN}_panel_event"
+
+# Services
+SERVICE_PROFILE = "profile"
+SERVICE_READY_AT = "ready_at"
+SERVICE_CANCEL_READY_AT = "cancel_ready_at"
+SERVICE_QUERY_TELEMETRY = "query_telemetry"
+SERVICE_UNPAIR_CLIENT = "unpair_client"
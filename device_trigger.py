@@ -0,0 +1,114 @@
+"""Device triggers for Mira Soak Station devices.
+
+Changes made at the device's own controls are fired on the event bus as
+soon as the device pushes them, and exposed as device triggers such as
+"outlet started at panel", so automations need no template polling.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DOMAIN, EVENT_PANEL
+from .mira.helpers.panel_events import PANEL_EVENT_TYPES, PanelEventDetector
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend({
+    vol.Required(CONF_TYPE): vol.In(PANEL_EVENT_TYPES),
+})
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> List[Dict[str, Any]]:
+    """List the panel triggers of a device.
+
+    Args:
+        hass: Home Assistant instance
+        device_id: Device registry ID
+
+    Returns:
+        list: One trigger per panel event type
+    """
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in PANEL_EVENT_TYPES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a panel trigger to the panel events fired for its device.
+
+    Args:
+        hass: Home Assistant instance
+        config: Trigger configuration
+        action: Action to run when the trigger fires
+        trigger_info: Information about the automation
+
+    Returns:
+        Callable that detaches the trigger
+    """
+    event_config = event_trigger.TRIGGER_SCHEMA({
+        event_trigger.CONF_PLATFORM: "event",
+        event_trigger.CONF_EVENT_TYPE: EVENT_PANEL,
+        event_trigger.CONF_EVENT_DATA: {
+            CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+            CONF_TYPE: config[CONF_TYPE],
+        },
+    })
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
+
+
+@callback
+def async_fire_panel_events(hass: HomeAssistant, detector: PanelEventDetector,
+                            device_address: str) -> Callable[[], None]:
+    """Fire panel events of a device on the event bus.
+
+    Args:
+        hass: Home Assistant instance
+        detector: Detector of changes made at the device's controls
+        device_address: Device MAC address, its registry identifier
+
+    Returns:
+        Callable that stops firing the events
+    """
+    device_id: Optional[str] = None
+
+    @callback
+    def fire(event_type: str, attributes: Dict[str, Any]) -> None:
+        nonlocal device_id
+        if device_id is None:
+            # The device is registered once its entities are added
+            device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, device_address)})
+            if device is None:
+                logger.debug(f"Device {device_address} not registered yet, dropping {event_type}")
+                return
+            device_id = device.id
+        hass.bus.async_fire(EVENT_PANEL, {
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: event_type,
+            "device_address": device_address,
+            **attributes,
+        })
+
+    return detector.subscribe(fire)
@@ -0,0 +1,111 @@
+"""Diagnostics support for Mira Soak Station devices.
+
+This module provides the data included in the diagnostics download of a
+configuration entry: the entry itself with client credentials redacted, the
+device metadata and state, the connection state with its counters, and the
+flight recorder of recent raw frames.
+"""
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# Config entry fields that identify this client to the device
+TO_REDACT = {"client_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        config_entry: Configuration entry to describe
+
+    Returns:
+        dict: Entry, metadata and state snapshots, connection state including
+        the scanner the device was last seen through, command latency histograms and
+        protocol counters, state write counters, callback timings if profiling
+        is enabled, the heat-up model and pre-warm schedule, link
+        warm-up predictions and outcomes, link watchdog measurements and recent
+        raw frames
+    """
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    connection = entry_data["connection"]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(config_entry.data), TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "metadata": _metadata_snapshot(entry_data["metadata"]),
+        "data": _data_snapshot(entry_data["data"]),
+        "connection": connection.diagnostics(),
+        "write_filters": {
+            key: write_filter.as_dict() for key, write_filter in entry_data["write_filters"].items()
+        },
+        "profiler": entry_data["profiler"].as_dict() if entry_data["profiler"] else None,
+        "prewarm": entry_data["prewarm"].as_dict(),
+        "warmup": entry_data["warmup"].as_dict(),
+        "watchdog": entry_data["watchdog"].as_dict(),
+        "telemetry": entry_data["telemetry"].as_dict(),
+        "statistics": entry_data["statistics"].as_dict(),
+        "clients": [vars(client) for client in entry_data["clients"]] if entry_data["clients"] else None,
+        "setup_timing": entry_data["setup_timing"],
+        "frames": connection.recorder.snapshot(),
+    }
+
+
+def _metadata_snapshot(metadata) -> Dict[str, Any]:
+    """Describe the device metadata.
+
+    Args:
+        metadata: Device metadata
+
+    Returns:
+        dict: Public metadata fields with presets expanded
+    """
+    snapshot = {key: value for key, value in vars(metadata).items() if not key.startswith("_")}
+    snapshot["presets"] = {slot: vars(preset) for slot, preset in metadata.presets.items()}
+    return snapshot
+
+
+def _data_snapshot(data) -> Dict[str, Any]:
+    """Describe the device state and the values derived from it.
+
+    Args:
+        data: Device data model
+
+    Returns:
+        dict: Current state, telemetry and countdown
+    """
+    telemetry = data.telemetry
+    countdown = data.countdown
+    return {
+        "slots": data.slots,
+        "client_slot": data.client_slot,
+        "outlet_1_on": data.outlet_1_on,
+        "outlet_2_on": data.outlet_2_on,
+        "target_temp": data.target_temp,
+        "actual_temp": data.actual_temp,
+        "timer_state": data.timer_state.value if data.timer_state else None,
+        "remaining_seconds": data.remaining_seconds,
+        "subscribers": len(data.subscribers),
+        "telemetry": {
+            "samples": len(telemetry),
+            "heat_up_rate": telemetry.heat_up_rate,
+            "seconds_to_target": telemetry.seconds_to_target,
+            "ready": telemetry.is_ready,
+        },
+        "countdown": {
+            "running": countdown.running,
+            "last_drift": countdown.last_drift,
+            "average_drift": countdown.average_drift,
+            "max_drift": countdown.max_drift,
+        },
+    }
@@ -0,0 +1,34 @@
+"""Event platform for Mira Soak Station devices.
+
+This module sets up the event entity reporting changes made at the
+device's own controls.
+"""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+
+from .const import DOMAIN
+from .mira.event.panel_event import SoakStationPanelEvent
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities,
+) -> None:
+    """Set up the panel event entity for the Mira Soak Station device.
+    
+    Args:
+        hass: Home Assistant instance
+        config_entry: Configuration entry containing device details
+        async_add_entities: Callback to add entities to Home Assistant
+    """
+    data = config_entry.data
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities([
+        SoakStationPanelEvent(
+            hass, entry_data["data"], entry_data["panel_events"], entry_data["metadata"],
+            data["device_address"], data["device_name"]
+        ),
+    ])
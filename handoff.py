@@ -0,0 +1,79 @@
+"""Handoff of freshly paired devices from the config flow to entry setup.
+
+Pairing leaves the link up with the new client and the device metadata
+already read. The config flow parks it here, keyed by device address, and
+setting up the entry created right after takes it over instead of
+connecting and reading the metadata again. A handoff that is not taken
+within HANDOFF_TTL, for example because the flow was abandoned, is closed.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+from .mira.config_helper import PairedDevice
+
+logger = logging.getLogger(__name__)
+
+# Key of the parked devices in hass.data, kept apart from the entry data
+HANDOFF_KEY = f"{DOMAIN}_handoff"
+
+# Seconds a paired device waits for its entry to be set up
+HANDOFF_TTL = 60
+
+
+@callback
+def async_park_paired_device(hass: HomeAssistant, address: str, paired: PairedDevice) -> None:
+    """Keep a paired device for the entry setup, closing it if not taken in time.
+
+    Args:
+        hass: Home Assistant instance
+        address: Bluetooth MAC address of the device
+        paired: Paired device with its open connection
+    """
+    parked = hass.data.setdefault(HANDOFF_KEY, {})
+    previous = parked.pop(address, None)
+    if previous is not None:
+        previous[1]()
+        hass.async_create_task(previous[0].connection.close())
+
+    async def async_expire(now) -> None:
+        if parked.get(address, (None,))[0] is paired:
+            del parked[address]
+            logger.debug(f"Paired device {address} was not set up in time, closing its connection")
+            await paired.connection.close()
+
+    parked[address] = (paired, async_call_later(hass, HANDOFF_TTL, async_expire))
+
+
+@callback
+def async_take_paired_device(hass: HomeAssistant, address: str, client_id: int,
+                             client_slot: int) -> Optional[PairedDevice]:
+    """Take over a parked device if it is paired with the given client and still connected.
+
+    A parked device that cannot be used is closed.
+
+    Args:
+        hass: Home Assistant instance
+        address: Bluetooth MAC address of the device
+        client_id: Client ID of the entry being set up
+        client_slot: Client slot of the entry being set up
+
+    Returns:
+        PairedDevice: The paired device, or None to connect as usual
+    """
+    entry = hass.data.get(HANDOFF_KEY, {}).pop(address, None)
+    if entry is None:
+        return None
+    paired, cancel_expiry = entry
+    cancel_expiry()
+    if (paired.client_id, paired.client_slot) != (client_id, client_slot) or not paired.connection.is_connected:
+        logger.debug(f"Parked connection to {address} cannot be reused, connecting again")
+        hass.async_create_task(paired.connection.close())
+        return None
+    logger.debug(f"Taking over connection to {address} paired {time.monotonic() - paired.started_at:.2f}s ago")
+    return paired
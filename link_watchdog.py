@@ -0,0 +1,193 @@
+"""Link watchdog for Mira Soak Station devices.
+
+The device answers every poll with a state report, so a link that delivers
+nothing for two poll intervals is dead even if no error was raised. The
+watchdog compares the time of the last received frame against that cadence
+and listens for the client reporting a lost link. Either way the device's
+entities are marked unavailable, so stale temperatures are not shown as
+live, and the link is re-established in the background. Entities become
+available again with the first state report after reconnecting.
+
+Detection latency, how long the state was stale and outage durations are
+measured.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .mira.helpers.connection import RESPONSE_TIMEOUT, Connection
+from .mira.helpers.data_model import SoakStationData
+
+logger = logging.getLogger(__name__)
+
+# Interval at which the last-frame time is checked
+CHECK_INTERVAL = timedelta(seconds=5)
+
+# Seconds between reconnect attempts, the last one repeating
+RECONNECT_BACKOFF = (5, 10, 30, 60)
+
+# Detection causes
+CAUSE_DISCONNECT = "disconnect"
+CAUSE_STALE = "stale"
+
+
+class LinkWatchdog:
+    """Stale-link detection and recovery for a single device.
+
+    Attributes:
+        hass: Home Assistant instance
+        stale_after: Seconds without a frame after which the link counts as dead
+        stats: Detection, outage and reconnect measurements
+    """
+
+    def __init__(self, hass: HomeAssistant, connection: Connection, data: SoakStationData,
+                 poll_interval: timedelta) -> None:
+        """Initialize the watchdog.
+
+        Args:
+            hass: Home Assistant instance
+            connection: Connection to watch and reconnect
+            data: Device data model whose availability is maintained
+            poll_interval: Interval at which the device state is polled
+        """
+        self.hass = hass
+        self._connection = connection
+        self._data = data
+        self._poll_seconds: float = poll_interval.total_seconds()
+        self.stale_after: float = 2 * self._poll_seconds + RESPONSE_TIMEOUT
+        self._started_at: float = time.monotonic()
+        self._down_since: Optional[float] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, Any] = {
+            CAUSE_DISCONNECT: 0,
+            CAUSE_STALE: 0,
+            "last_detection_latency": None,
+            "max_detection_latency": 0.0,
+            "last_stale_seconds": None,
+            "max_stale_seconds": 0.0,
+            "last_outage_seconds": None,
+            "reconnect_attempts": 0,
+            "reconnect_failures": 0,
+        }
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start watching the link.
+
+        Returns:
+            Callable that stops watching and cancels any reconnect in progress
+        """
+        self._started_at = time.monotonic()
+        self._connection.on_disconnect = self._handle_disconnect
+        unsubscribe_data = self._data.subscribe(self._handle_update)
+        cancel_check = async_track_time_interval(self.hass, self._async_check, CHECK_INTERVAL)
+
+        def stop() -> None:
+            self._connection.on_disconnect = None
+            unsubscribe_data()
+            cancel_check()
+            if self._reconnect_task is not None:
+                self._reconnect_task.cancel()
+                self._reconnect_task = None
+
+        return stop
+
+    @property
+    def _last_alive(self) -> float:
+        """Monotonic time the link was last known to work."""
+        return max(self._connection.last_frame_at or 0.0, self._connection.connected_at or 0.0,
+                   self._started_at)
+
+    @callback
+    def _handle_update(self) -> None:
+        """Mark the state live again once a report arrives."""
+        if self._down_since is None:
+            return
+        outage = time.monotonic() - self._down_since
+        self._down_since = None
+        self.stats["last_outage_seconds"] = outage
+        logger.info(f"Link restored after {outage:.1f}s")
+        self._data.set_available(True)
+
+    @callback
+    def _handle_disconnect(self) -> None:
+        """Handle the client reporting a lost link."""
+        now = time.monotonic()
+        self._detect(CAUSE_DISCONNECT, now, now)
+
+    async def _async_check(self, now: datetime) -> None:
+        """Detect a link that has stopped delivering frames."""
+        connection = self._connection
+        if connection.is_closed or connection.is_released or self._reconnect_task is not None:
+            return
+        monotonic = time.monotonic()
+        if monotonic - self._last_alive < self.stale_after:
+            return
+        if self._down_since is None:
+            # The link failed when the first expected report did not arrive
+            self._detect(CAUSE_STALE, self._last_alive + self._poll_seconds + RESPONSE_TIMEOUT, monotonic)
+        else:
+            # Reconnected, but still no report
+            self._start_reconnect()
+
+    def _detect(self, cause: str, failed_at: float, now: float) -> None:
+        """Mark the state stale and start reconnecting.
+
+        Args:
+            cause: What detected the failure, CAUSE_DISCONNECT or CAUSE_STALE
+            failed_at: Monotonic time the link is known to have failed
+            now: Current monotonic time
+        """
+        if self._down_since is None:
+            latency = max(0.0, now - failed_at)
+            stale = now - (self._connection.last_frame_at or self._started_at)
+            self.stats[cause] += 1
+            self.stats["last_detection_latency"] = latency
+            self.stats["max_detection_latency"] = max(self.stats["max_detection_latency"], latency)
+            self.stats["last_stale_seconds"] = stale
+            self.stats["max_stale_seconds"] = max(self.stats["max_stale_seconds"], stale)
+            logger.warning(f"Link lost ({cause}), detected after {latency:.1f}s with state {stale:.1f}s old")
+            self._down_since = now
+            self._data.set_available(False)
+        self._start_reconnect()
+
+    def _start_reconnect(self) -> None:
+        """Start reconnecting in the background unless already reconnecting."""
+        if self._reconnect_task is None and not self._connection.is_closed:
+            self._reconnect_task = self.hass.async_create_task(self._async_reconnect())
+
+    async def _async_reconnect(self) -> None:
+        """Re-establish the link and request a fresh state report."""
+        attempt = 0
+        try:
+            while not (self._connection.is_closed or self._connection.is_released):
+                self.stats["reconnect_attempts"] += 1
+                try:
+                    await self._connection.reconnect()
+                    await self._connection.request_device_state()
+                    return
+                except Exception as e:
+                    self.stats["reconnect_failures"] += 1
+                    delay = RECONNECT_BACKOFF[min(attempt, len(RECONNECT_BACKOFF) - 1)]
+                    attempt += 1
+                    logger.debug(f"Reconnect attempt {attempt} failed, retrying in {delay}s: {e}")
+                    await asyncio.sleep(delay)
+        finally:
+            self._reconnect_task = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the link health and watchdog measurements."""
+        last_frame_at = self._connection.last_frame_at
+        return {
+            "available": self._data.available,
+            "stale_after": self.stale_after,
+            "seconds_since_frame": time.monotonic() - last_frame_at if last_frame_at else None,
+            "reconnecting": self._reconnect_task is not None,
+            **self.stats,
+        }
@@ -0,0 +1,333 @@
+"""Command-line client for Mira devices.
+
+Drives a device with the same protocol code as the Home Assistant
+integration, using bleak directly, so a shower can be paired, queried,
+controlled and profiled from a script. Home Assistant is never imported.
+Run it from the integration directory:
+
+    python -m mira scan
+    python -m mira pair AA:BB:CC:DD:EE:FF --name laptop
+    python -m mira state AA:BB:CC:DD:EE:FF --client-id 12345 --client-slot 2
+    python -m mira outlet AA:BB:CC:DD:EE:FF 1 on --client-id 12345 --client-slot 2
+    python -m mira preset AA:BB:CC:DD:EE:FF 1 --client-id 12345 --client-slot 2
+    python -m mira tail AA:BB:CC:DD:EE:FF --client-id 12345 --client-slot 2
+    python -m mira frames AA:BB:CC:DD:EE:FF --client-id 12345 --client-slot 2
+    python -m mira bench AA:BB:CC:DD:EE:FF --client-id 12345 --client-slot 2 --count 50
+
+Every command prints JSON to stdout; tail and frames print one JSON object
+per line.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import logging
+import statistics
+import sys
+import time
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the device to answer a request
+REQUEST_TIMEOUT = 5.0
+
+
+def _print(value: Dict[str, Any]) -> None:
+    """Write a JSON object to stdout."""
+    print(json.dumps(value), flush=True)
+
+
+def _state(data) -> Dict[str, Any]:
+    """Describe the device state.
+
+    Args:
+        data: Device data model or state snapshot
+
+    Returns:
+        dict: Outlets, temperatures and timer
+    """
+    return {
+        "outlet_1_on": data.outlet_1_on,
+        "outlet_2_on": data.outlet_2_on,
+        "target_temp": data.target_temp,
+        "actual_temp": data.actual_temp,
+        "timer_state": data.timer_state.value if data.timer_state else None,
+        "remaining_seconds": data.remaining_seconds,
+    }
+
+
+def _frame(event) -> Dict[str, Any]:
+    """Describe a decoded report event.
+
+    Args:
+        event: Report event from the protocol engine
+
+    Returns:
+        dict: Event type and fields
+    """
+    fields = {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in dataclasses.asdict(event).items()
+    }
+    return {"type": type(event).__name__, **fields}
+
+
+@contextlib.asynccontextmanager
+async def _open(args: argparse.Namespace) -> AsyncIterator[Tuple[Any, Any, Any]]:
+    """Connect to a paired device and subscribe to its notifications.
+
+    Args:
+        args: Parsed arguments with address and client credentials
+
+    Yields:
+        tuple: Connection, data model and metadata
+    """
+    from .helpers.connection import Connection
+    from .helpers.data_model import SoakStationData, SoakStationMetadata
+    from .helpers.notifications import Notifications
+
+    connection = Connection(None, args.address, args.client_id, args.client_slot)
+    try:
+        await connection.connect()
+        metadata = SoakStationMetadata()
+        info = await connection.get_device_info()
+        metadata.update_device_identity(device_address=args.address, **info)
+
+        data = SoakStationData()
+        await connection.subscribe(Notifications(model=data, metadata=metadata, metrics=connection.metrics))
+        await connection.request_technical_info()
+        await asyncio.wait_for(metadata.wait_for_technical_info(), REQUEST_TIMEOUT)
+        yield connection, data, metadata
+    finally:
+        await connection.close()
+
+
+async def _next_update(data, request) -> float:
+    """Send a request and wait for the state update it causes.
+
+    Args:
+        data: Device data model or state snapshot
+        request: Coroutine sending the request
+
+    Returns:
+        float: Seconds from sending the request to the update
+    """
+    updated = asyncio.get_running_loop().create_future()
+
+    def handle_update() -> None:
+        if not updated.done():
+            updated.set_result(time.perf_counter())
+
+    unsubscribe = data.subscribe(handle_update)
+    try:
+        start = time.perf_counter()
+        await request
+        return await asyncio.wait_for(updated, REQUEST_TIMEOUT) - start
+    finally:
+        unsubscribe()
+
+
+async def _scan(args: argparse.Namespace) -> None:
+    """List nearby Mira devices."""
+    from bleak import BleakScanner
+
+    from .helpers.const import UUID_SERVICE
+
+    discovered = await BleakScanner.discover(timeout=args.timeout, return_adv=True)
+    _print({
+        "devices": [
+            {"address": device.address, "name": device.name, "rssi": advertisement.rssi}
+            for device, advertisement in discovered.values()
+            if (device.name or "").startswith("Mira") or UUID_SERVICE in advertisement.service_uuids
+        ]
+    })
+
+
+async def _pair(args: argparse.Namespace) -> None:
+    """Pair a new client; the device must be in pairing mode."""
+    from .config_helper import config_flow_pairing
+
+    client_id, client_slot = await config_flow_pairing(None, args.address, client_name=args.name)
+    _print({"address": args.address, "client_id": client_id, "client_slot": client_slot})
+
+
+async def _show_state(args: argparse.Namespace) -> None:
+    """Print device identity, firmware and state."""
+    async with _open(args) as (connection, data, metadata):
+        await _next_update(data, connection.request_device_state())
+        _print({
+            "name": metadata.name,
+            "model": metadata.model,
+            "firmware": {
+                "valve": metadata.valve_sw_version,
+                "bluetooth": metadata.bt_sw_version,
+                "ui": metadata.ui_sw_version,
+            },
+            "state": _state(data),
+        })
+
+
+async def _outlet(args: argparse.Namespace) -> None:
+    """Turn one outlet on or off, keeping the other as it is."""
+    async with _open(args) as (connection, data, metadata):
+        await _next_update(data, connection.request_device_state())
+        outlets = [data.outlet_1_on, data.outlet_2_on]
+        outlets[args.outlet - 1] = args.action == "on"
+        temperature = args.temperature or data.target_temp or 38
+        await connection.control_outlets(outlets[0], outlets[1], temperature=temperature)
+        await _next_update(data, connection.request_device_state())
+        _print(_state(data))
+
+
+async def _preset(args: argparse.Namespace) -> None:
+    """Start a preset."""
+    async with _open(args) as (connection, data, metadata):
+        await connection.start_preset(args.slot)
+        await _next_update(data, connection.request_device_state())
+        _print(_state(data))
+
+
+async def _poll(connection, args: argparse.Namespace, consume: Callable[[], Awaitable[None]]) -> None:
+    """Request the device state periodically while a stream is consumed.
+
+    Args:
+        connection: Connection to the device
+        args: Parsed arguments with the poll interval and optional duration
+        consume: Coroutine function printing the stream until it ends
+    """
+    consumer = asyncio.create_task(consume())
+    try:
+        deadline = time.monotonic() + args.duration if args.duration else None
+        while (deadline is None or time.monotonic() < deadline) and not consumer.done():
+            await connection.request_device_state()
+            remaining = deadline - time.monotonic() if deadline is not None else args.poll
+            await asyncio.sleep(max(0.0, min(args.poll, remaining)))
+    finally:
+        consumer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await consumer
+
+
+async def _tail(args: argparse.Namespace) -> None:
+    """Print every decoded state update until interrupted or the duration ends."""
+    async with _open(args) as (connection, data, metadata):
+        async def consume() -> None:
+            async with connection.stream_states(maxsize=args.buffer) as snapshots:
+                async for snapshot in snapshots:
+                    _print({"time": snapshot.time, **_state(snapshot)})
+
+        await _poll(connection, args, consume)
+
+
+async def _frames(args: argparse.Namespace) -> None:
+    """Print every decoded report event until interrupted or the duration ends."""
+    async with _open(args) as (connection, data, metadata):
+        async def consume() -> None:
+            async with connection.stream_frames(maxsize=args.buffer) as frames:
+                async for event in frames:
+                    _print({"time": time.time(), **_frame(event)})
+
+        await _poll(connection, args, consume)
+
+
+async def _bench(args: argparse.Namespace) -> None:
+    """Time state requests from write to decoded update."""
+    start = time.perf_counter()
+    async with _open(args) as (connection, data, metadata):
+        setup = time.perf_counter() - start
+        latencies: List[float] = []
+        timeouts = 0
+        for _ in range(args.count):
+            try:
+                latencies.append(await _next_update(data, connection.request_device_state()))
+            except asyncio.TimeoutError:
+                timeouts += 1
+            await asyncio.sleep(args.interval)
+
+        latencies.sort()
+        _print({
+            "setup_ms": setup * 1000,
+            "count": len(latencies),
+            "timeouts": timeouts,
+            "latency_ms": {
+                "min": latencies[0] * 1000,
+                "p50": statistics.median(latencies) * 1000,
+                "p95": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+                "max": latencies[-1] * 1000,
+            } if latencies else None,
+            "metrics": connection.metrics.as_dict(),
+        })
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog="python -m mira", description="Command-line client for Mira devices")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log protocol traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="List nearby Mira devices")
+    scan.add_argument("--timeout", type=float, default=5.0, help="Seconds to scan for")
+    scan.set_defaults(run=_scan)
+
+    pair = commands.add_parser("pair", help="Pair a new client")
+    pair.add_argument("address")
+    pair.add_argument("--name", default="mira-cli", help="Client name shown on the device")
+    pair.set_defaults(run=_pair)
+
+    def paired(name: str, help: str, run) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help)
+        command.add_argument("address")
+        command.add_argument("--client-id", type=int, required=True)
+        command.add_argument("--client-slot", type=int, required=True)
+        command.set_defaults(run=run)
+        return command
+
+    paired("state", "Print device information and state", _show_state)
+
+    outlet = paired("outlet", "Turn an outlet on or off", _outlet)
+    outlet.add_argument("outlet", type=int, choices=(1, 2))
+    outlet.add_argument("action", choices=("on", "off"))
+    outlet.add_argument("--temperature", type=float, help="Target temperature, defaults to the current one")
+
+    preset = paired("preset", "Start a preset", _preset)
+    preset.add_argument("slot", type=int)
+
+    for name, help, run, buffer in (("tail", "Print decoded state updates", _tail, 16),
+                                    ("frames", "Print decoded report events", _frames, 64)):
+        stream = paired(name, help, run)
+        stream.add_argument("--poll", type=float, default=20.0, help="Seconds between state requests")
+        stream.add_argument("--duration", type=float, help="Stop after this many seconds")
+        stream.add_argument("--buffer", type=int, default=buffer,
+                            help="Updates buffered before the oldest is dropped")
+
+    bench = paired("bench", "Benchmark command latency", _bench)
+    bench.add_argument("--count", type=int, default=20, help="State requests to time")
+    bench.add_argument("--interval", type=float, default=0.2, help="Seconds between requests")
+    return parser
+
+
+def main() -> int:
+    """Run the command-line client.
+
+    Returns:
+        int: Exit status
+    """
+    args = _parser().parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr)
+    try:
+        asyncio.run(args.run(args))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.debug("Command failed", exc_info=True)
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,15 +5,40 @@ and generating client IDs. It handles the configuration flow process
 used during device setup.
 """
 
+import asyncio
 import logging
 import random
-from typing import Tuple
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from .helpers.connection import Connection 
+from .helpers.data_model import SoakStationMetadata
 from .helpers.notifications import Notifications
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the metadata requested after pairing
+METADATA_TIMEOUT = 3.0
+
+
+@dataclass
+class PairedDevice:
+    """A freshly paired device with its link still up.
+
+    Attributes:
+        client_id: Client ID registered with the device
+        client_slot: Slot assigned by the device
+        connection: Connected and subscribed connection using the new client
+        metadata: Identity, technical info and settings read after pairing
+        started_at: Monotonic time pairing started at
+    """
+    client_id: int
+    client_slot: int
+    connection: Connection
+    metadata: SoakStationMetadata
+    started_at: float
+
 async def config_flow_pairing(
     hass,
     address: str,
@@ -27,7 +52,7 @@ async def config_flow_pairing(
     used for future communication.
 
     Args:
-        hass: Home Assistant instance used for device discovery
+        hass: Home Assistant instance used for device discovery, or None to scan with bleak
         address: Bluetooth MAC address of the target device
         client_id: Optional client ID to use, will generate random ID if not provided
         client_name: Name to register the client under, defaults to "homeassistant"
@@ -51,7 +76,7 @@ async def config_flow_pairing(
 
     async with Connection(hass, address) as conn:
         logger.debug(f"Connection established, initiating pairing with name: {client_name}")
-        notifications = Notifications(is_pairing=True)
+        notifications = Notifications(is_pairing=True, metrics=conn.metrics)
         client_id_out, client_slot = await conn.pair_client(
             client_id or generate_client_id(),
             client_name,
@@ -66,6 +91,68 @@ async def config_flow_pairing(
     
     return client_id_out, client_slot
 
+async def config_flow_pairing_connected(
+    hass,
+    address: str,
+    client_id: Optional[int] = None,
+    client_name: str = "homeassistant"
+) -> PairedDevice:
+    """Pair a new client and keep the link up for setting up the device.
+
+    Unlike config_flow_pairing, the connection is not closed after pairing.
+    It is switched to the new client, subscribed, and used to read the
+    device identity, technical info and settings, so setting up the device
+    right after pairing neither reconnects nor repeats these requests.
+
+    Args:
+        hass: Home Assistant instance used for device discovery, or None to scan with bleak
+        address: Bluetooth MAC address of the target device
+        client_id: Optional client ID to use, will generate random ID if not provided
+        client_name: Name to register the client under, defaults to "homeassistant"
+
+    Returns:
+        PairedDevice: The paired client with its open connection; the caller
+        owns the connection and must close it
+
+    Raises:
+        Exception: If connecting or pairing fails
+    """
+    started_at = time.monotonic()
+    conn = Connection(hass, address)
+    try:
+        await conn.connect()
+        client_id, client_slot = await conn.pair_client(
+            client_id or generate_client_id(),
+            client_name,
+            Notifications(is_pairing=True, metrics=conn.metrics)
+        )
+        conn.set_client_data(client_id, client_slot)
+
+        metadata = SoakStationMetadata()
+        info = await conn.get_device_info()
+        info["device_address"] = address
+        metadata.update_device_identity(**info)
+
+        # Requested back to back; setup requests whatever is still missing
+        await conn.subscribe(Notifications(metadata=metadata, metrics=conn.metrics))
+        await conn.request_technical_info()
+        await conn.request_device_settings()
+        await conn.request_outlet_settings()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(metadata.wait_for_technical_info(), metadata.wait_for_device_settings()),
+                METADATA_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.debug("Not all metadata received after pairing")
+    except Exception:
+        await conn.close()
+        raise
+
+    logger.debug(f"Paired client {client_id} in slot {client_slot}, keeping the link up "
+                 f"after {time.monotonic() - started_at:.2f}s")
+    return PairedDevice(client_id, client_slot, conn, metadata, started_at)
+
 def generate_client_id() -> int:
     """Generate a random client ID.
     
@@ -0,0 +1,69 @@
+from homeassistant.components.event import EventEntity
+
+from ..helpers.availability import DeviceAvailability
+from ..helpers.panel_events import PANEL_EVENT_TYPES
+
+
+class SoakStationPanelEvent(DeviceAvailability, EventEntity):
+    """Event entity for changes made at a soak station's own controls.
+    
+    Events are fired straight from the state report the device pushes when
+    its controls are operated, so automations react without waiting for a
+    poll.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _data: Device data model
+        _panel_events: Detector of changes made at the controls
+        _meta: Device metadata
+        _address: Device MAC address
+        _device_name: User-friendly device name
+    """
+
+    _attr_event_types = list(PANEL_EVENT_TYPES)
+    _attr_translation_key = "panel"
+
+    def __init__(self, hass, data, panel_events, meta, address, device_name):
+        """Initialize the panel event entity.
+        
+        Args:
+            hass: Home Assistant instance
+            data: Device data model
+            panel_events: Detector of changes made at the controls
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._data = data
+        self._panel_events = panel_events
+        self._meta = meta
+        self._address = address
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        self._attr_name = f"Panel ({device_name})"
+        self._attr_unique_id = f"soakstation_panel_{address.replace(':', '')}"
+        self._attr_icon = "mdi:gesture-tap-button"
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to panel events and availability once the entity is added.
+
+        The subscriptions are released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._panel_events.subscribe(self._handle_panel_event))
+        self._track_availability(self._data)
+
+    def _handle_panel_event(self, event_type, attributes):
+        """Record a panel event and write it to Home Assistant.
+        
+        Args:
+            event_type: Panel event type, one of PANEL_EVENT_TYPES
+            attributes: Details of the change
+        """
+        self._trigger_event(event_type, attributes)
+        self.async_write_ha_state()
@@ -0,0 +1,44 @@
+"""Entity availability following the link to a Mira device."""
+
+from typing import Optional
+
+from .data_model import SoakStationData
+
+
+class DeviceAvailability:
+    """Mixin making an entity unavailable while the device's state is stale.
+
+    Entities call _track_availability from async_added_to_hass; their state
+    is written again whenever the link watchdog marks the device's data
+    model as live or stale, and when the link is released while idle or
+    established again. While it is released, entities are unavailable
+    unless they control the device, as commands establish the link again;
+    those keep their last state, flagged as assumed.
+    """
+
+    _availability_data: Optional[SoakStationData] = None
+
+    # Whether the entity stays available while the link is released
+    _available_while_released: bool = False
+
+    def _track_availability(self, data: SoakStationData) -> None:
+        """Follow the availability of a device's data model.
+
+        Args:
+            data: Device data model
+        """
+        self._availability_data = data
+        self.async_on_remove(data.subscribe_availability(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        """Whether the device's state is live."""
+        data = self._availability_data
+        if data is None:
+            return True
+        return data.available and (self._available_while_released or not data.released)
+
+    @property
+    def assumed_state(self) -> bool:
+        """Whether the state may be stale because the link is released."""
+        return self._availability_data is not None and self._availability_data.released
@@ -0,0 +1,113 @@
+"""Client slot inventory of Mira devices.
+
+A device keeps up to 16 paired clients, each in a numbered slot under the
+name it paired with. Pairing fails once every slot is taken, which happens
+when clients are repeatedly paired without being unpaired, for example
+when a Home Assistant entry is removed and the device added again.
+
+This module collects the slot bitmap and the names of the clients in it,
+and identifies stale Home Assistant clients: slots registered under the
+Home Assistant client name other than the slot of the entry asking.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of client slots on a device
+MAX_CLIENT_SLOTS = 16
+
+# Name Home Assistant pairs under
+DEFAULT_CLIENT_NAME = "homeassistant"
+
+
+class PairingRejectedError(Exception):
+    """The device answered a pairing request with a failure, usually because no slot is free."""
+
+
+@dataclass(frozen=True)
+class ClientSlot:
+    """A paired client.
+
+    Attributes:
+        slot: Slot number on the device
+        name: Name the client paired under, None if the device did not report it
+        own: Whether this is the slot of the entry that took the inventory
+        stale: Whether this is another Home Assistant client
+    """
+    slot: int
+    name: Optional[str]
+    own: bool
+    stale: bool
+
+
+class ClientInventoryCollector:
+    """Collects the responses of a pipelined slot inventory.
+
+    The slot bitmap is requested first, then the details of every slot in
+    it are requested back to back. The device answers in request order, so
+    client names, or failures for slots it has no details for, are assigned
+    to slots in the order they arrive.
+
+    Attributes:
+        slots: Slots in use, None until the bitmap is received
+        names: Client names received so far, None for failed slots
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty collector."""
+        self.slots: Optional[List[int]] = None
+        self.names: List[Optional[str]] = []
+        self._slots_received = asyncio.Event()
+        self._complete = asyncio.Event()
+
+    def add_slots(self, slots: List[int]) -> None:
+        """Record the slot bitmap."""
+        self.slots = list(slots)
+        self._slots_received.set()
+        if not self.slots:
+            self._complete.set()
+
+    def add_name(self, name: Optional[str]) -> None:
+        """Record the next client name, None if the device failed the request."""
+        if self.slots is None or self._complete.is_set():
+            return
+        self.names.append(name.rstrip("\0") if name is not None else None)
+        if len(self.names) == len(self.slots):
+            self._complete.set()
+
+    async def wait_slots(self) -> List[int]:
+        """Wait for the slot bitmap."""
+        await self._slots_received.wait()
+        return self.slots
+
+    async def wait_complete(self) -> None:
+        """Wait for the names of all slots."""
+        await self._complete.wait()
+
+    def names_by_slot(self) -> Dict[int, Optional[str]]:
+        """Get the client name of each slot, None where none was received."""
+        names = self.names + [None] * (len(self.slots or []) - len(self.names))
+        return dict(zip(self.slots or [], names))
+
+
+def build_inventory(names_by_slot: Dict[int, Optional[str]], own_slot: Optional[int],
+                    client_name: str = DEFAULT_CLIENT_NAME) -> List[ClientSlot]:
+    """Describe the paired clients and which of them are stale.
+
+    Args:
+        names_by_slot: Client name of each slot in use
+        own_slot: Slot of the entry taking the inventory
+        client_name: Name Home Assistant clients pair under
+
+    Returns:
+        list: Paired clients by slot number
+    """
+    return [
+        ClientSlot(slot=slot, name=name, own=slot == own_slot,
+                   stale=slot != own_slot and name == client_name)
+        for slot, name in sorted(names_by_slot.items())
+    ]
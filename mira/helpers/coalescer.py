@@ -0,0 +1,105 @@
+"""Coalescing of bursts of state reports into single model updates.
+
+Turning the physical dial makes the device send a burst of controls-operated
+reports, each of which would otherwise update the model and write the state
+of every entity. The coalescer holds back reports that only change values
+such as temperatures or the remaining time, and applies the latest one at
+the end of the current event loop iteration or after a short window.
+
+Each report carries the complete state, so the latest pending report
+supersedes earlier ones. Reports that switch an outlet or change the timer
+state are never held back: the pending report is applied first and then the
+transition itself, so no transition is lost.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Union
+
+from .data_model import SoakStationData
+from .metrics import ProtocolMetrics, STATE_UPDATES
+from .protocol import StateReport
+
+logger = logging.getLogger(__name__)
+
+
+class StateCoalescer:
+    """Applies state reports to the model at most once per loop iteration or window.
+
+    Attributes:
+        window: Seconds to hold back reports for, 0 to flush at the end of the
+            current event loop iteration
+    """
+
+    def __init__(self, model: SoakStationData, window: float = 0.0,
+                 metrics: Optional[ProtocolMetrics] = None) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            model: Data model to apply reports to
+            window: Seconds to hold back reports for, 0 to flush at the end of
+                the current event loop iteration
+            metrics: Optional protocol metrics to count applied updates in
+        """
+        self.window: float = window
+        self._model = model
+        self._metrics = metrics
+        self._pending: Optional[StateReport] = None
+        self._last: Optional[StateReport] = None
+        self._flush_handle: Optional[Union[asyncio.Handle, asyncio.TimerHandle]] = None
+
+    def submit(self, report: StateReport) -> None:
+        """Apply a report now if it is a transition, otherwise hold it back.
+
+        Args:
+            report: Decoded state report
+        """
+        latest = self._pending or self._last
+        if latest is None or _is_transition(latest, report):
+            self.flush()
+            self._apply(report)
+            return
+
+        self._pending = report
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            if self.window > 0:
+                self._flush_handle = loop.call_later(self.window, self.flush)
+            else:
+                self._flush_handle = loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Apply the pending report, if any."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending is not None:
+            report = self._pending
+            self._pending = None
+            self._apply(report)
+
+    def cancel(self) -> None:
+        """Drop the pending report and any scheduled flush."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = None
+
+    def _apply(self, report: StateReport) -> None:
+        """Update the model with a report."""
+        self._last = report
+        if self._metrics:
+            self._metrics.increment(STATE_UPDATES)
+        self._model.update_state(outlet_1_on=report.outlet_1_on, outlet_2_on=report.outlet_2_on,
+                                 target_temp=report.target_temp, actual_temp=report.actual_temp,
+                                 remaining_seconds=report.remaining_seconds, timer_state=report.timer_state)
+
+
+def _is_transition(previous: StateReport, report: StateReport) -> bool:
+    """Whether a report switches an outlet or changes the timer state.
+
+    Polled reports carry no timer state, so they never change it.
+    """
+    return (report.outlet_1_on != previous.outlet_1_on
+            or report.outlet_2_on != previous.outlet_2_on
+            or (report.timer_state is not None and report.timer_state is not previous.timer_state))
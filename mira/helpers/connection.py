@@ -6,71 +6,134 @@ BLE connections, sending commands, and receiving notifications from Mira devices
 
 import asyncio
 import logging
-import struct
-from typing import Optional, Tuple, Dict, Any, Union
-from bleak import BLEDevice, BleakClient
-
-from homeassistant.components.bluetooth import (
-    async_ble_device_from_address
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple, Dict, Any, Union
+from bleak import BLEDevice, BleakClient, BleakScanner
+
+from .client_slots import ClientInventoryCollector, PairingRejectedError
+from .const import UUID_DEVICE_NAME, UUID_MANUFACTURER, UUID_MODEL_NUMBER, UUID_READ, UUID_WRITE
+from .data_model import StateSnapshot
+from .flight_recorder import FlightRecorder, INBOUND, OUTBOUND, INVALID, PARTIAL, SENT, UNKNOWN_TYPE
+from .generic import _format_bytearray, _split_chunks
+from .metrics import (
+    ProtocolMetrics,
+    FRAMES_SENT,
+    REASSEMBLY_FAILURES,
+    RECONNECTS,
+    TIMEOUTS,
+    VALIDATION_ERRORS,
 )
-
-from .const import MAGIC_ID, TIMER_RUNNING, OUTLET_RUNNING, OUTLET_STOPPED, TIMER_PAUSED, \
-    UUID_DEVICE_NAME, UUID_MANUFACTURER, UUID_MODEL_NUMBER, UUID_READ, UUID_WRITE
-from .generic import _get_payload_with_crc, _convert_temperature, _format_bytearray, _split_chunks
 from .notifications import Notifications
+from .profiling import StageProfiler
+from .protocol import RESPONSE_LENGTHS, STATUS_LENGTH, FramingError, MiraProtocol, Packet, ReassemblyError
+from .streams import DEFAULT_BUFFER, Stream, StreamHub
 
 logger = logging.getLogger(__name__)
 
+# Seconds after which a command without a response counts as timed out
+RESPONSE_TIMEOUT = 5.0
+
+# Seconds to wait for each phase of a client slot inventory
+INVENTORY_TIMEOUT = 5.0
+
+# Connection attempts and seconds between them
+CONNECT_RETRIES = 10
+CONNECT_RETRY_DELAY = 1.0
+
+# Seconds to scan for the device when not running in Home Assistant
+SCAN_TIMEOUT = 10.0
+
+# Decoded frames buffered per frame stream consumer before the oldest is dropped
+FRAME_BUFFER = 64
+
 
 class Connection:
     """Manages BLE connections and communication with Mira devices.
     
-    This class handles:
+    This class is a thin async adapter between a BleakClient and the
+    transport-independent protocol engine. It handles:
     - Establishing and maintaining BLE connections
-    - Sending commands to control device functions
-    - Processing notifications and responses from the device
-    - Packet validation and reassembly
+    - Writing the command frames built by the protocol engine
+    - Feeding received chunks to the protocol engine and passing complete
+      packets to the notification handler
     - Client pairing and device information retrieval
     
     Attributes:
-        _hass: Home Assistant instance for device discovery
+        _hass: Home Assistant instance for device discovery, or None to scan with bleak
         _address: Bluetooth MAC address of target device
         _peripheral: BLE device instance once connected
         _client_id: Unique identifier for this client
         _client_slot: Slot number assigned by device
+        _protocol: Framing, signing and reassembly state
         _client: BleakClient instance for BLE communication
+        _client_factory: Creates the client for a discovered device
         _notifications: Handler for device notifications
-        _response_event: Event for synchronizing responses
-        _response_data: Storage for response data
-        _partial_payload: Buffer for reassembling split packets
-        _reassembly_client_slot: Client slot for packet being reassembled
-        _reassembly_payload_length: Expected length of reassembled packet
+        _notify_handler: Callback registered with start_notify, reused on reconnect
+        _notifying: Whether notifications are currently started on the client
+        _closed: Whether the connection has been permanently closed
+        _released: Whether the link was released while idle, to be re-established on demand
+        _connect_lock: Serializes establishing and releasing the link
+        _route: Scanner Home Assistant last found the device through, with its RSSI
+        _pending_commands: Commands awaiting the packet answering them, oldest first
+        _states: Hub of state snapshots, fed from the subscribed data model
+        _frames: Hub of decoded report events
+        _model_unsubscribers: Callbacks detaching from the subscribed data model
+        metrics: Latency histograms and protocol counters
+        recorder: Flight recorder of the last raw frames sent and received
+        profiler: Optional per-stage timing of notification callbacks
+        connect_seconds: Duration of the last successful connect
+        last_frame_at: Monotonic time the last chunk was received
+        connected_at: Monotonic time the link was last established
+        on_disconnect: Optional callback for links lost without being disconnected
+        on_control_command: Optional callback run before a command operating the outlets is sent
     """
 
-    def __init__(self, hass: Any, address: str, client_id: Optional[int] = None, client_slot: Optional[int] = None) -> None:
+    def __init__(self, hass: Any, address: str, client_id: Optional[int] = None, client_slot: Optional[int] = None,
+                 client_factory: Optional[Callable[[BLEDevice], Any]] = None) -> None:
         """Initialize the connection.
 
         Args:
-            hass: Home Assistant instance
+            hass: Home Assistant instance, or None to discover the device with bleak directly
             address: Device Bluetooth MAC address
             client_id: Optional client ID to use
             client_slot: Optional client slot to use
+            client_factory: Optional factory for a BleakClient-compatible transport,
+                called with the device and a disconnected_callback keyword,
+                defaults to BleakClient
         """
         self._hass: Any = hass
         self._address: str = address
         self._peripheral: Optional[BLEDevice] = None
         self._client_id: Optional[int] = client_id
         self._client_slot: Optional[int] = client_slot
+        self._protocol: MiraProtocol = MiraProtocol(client_id, client_slot)
         self._client: Optional[BleakClient] = None
+        self._client_factory: Callable[[BLEDevice], Any] = client_factory or BleakClient
         self._notifications: Optional[Notifications] = None
-
-        self._response_event: asyncio.Event = asyncio.Event()
-        self._response_data: Any = None
-
-        # For packet reassembly
-        self._partial_payload: bytearray = bytearray()
-        self._reassembly_client_slot: Optional[int] = None 
-        self._reassembly_payload_length: Optional[int] = None
+        self._notify_handler: Optional[Callable[[Any, bytearray], Awaitable[None]]] = None
+        self._notifying: bool = False
+        self._closed: bool = False
+        self._released: bool = False
+        self._connect_lock: asyncio.Lock = asyncio.Lock()
+        self.connect_seconds: Optional[float] = None
+        self._disconnecting: bool = False
+        self.last_frame_at: Optional[float] = None
+        self.connected_at: Optional[float] = None
+        self.on_disconnect: Optional[Callable[[], None]] = None
+        self.on_control_command: Optional[Callable[[], None]] = None
+
+        # Command latency tracking
+        self._route: Optional[Dict[str, Any]] = None
+        self._pending_commands: List[_PendingCommand] = []
+        self.metrics: ProtocolMetrics = ProtocolMetrics()
+        self.recorder: FlightRecorder = FlightRecorder()
+        self.profiler: Optional[StageProfiler] = None
+
+        # Async consumers of state and frames, fed without waiting for them
+        self._states: StreamHub[StateSnapshot] = StreamHub()
+        self._frames: StreamHub[Any] = StreamHub()
+        self._model_unsubscribers: List[Callable[[], None]] = []
 
     def set_client_data(self, client_id: int, client_slot: int) -> None:
         """Set the client ID and slot after pairing.
@@ -81,8 +144,30 @@ class Connection:
         """
         self._client_id = client_id
         self._client_slot = client_slot
-
-    async def connect(self, retries: int = 10, delay: float = 1.0) -> None:
+        self._protocol.client_id = client_id
+        self._protocol.client_slot = client_slot
+
+    @property
+    def client_slot(self) -> Optional[int]:
+        """Slot of this client on the device, None before pairing."""
+        return self._client_slot
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the link to the device is currently up."""
+        return self._client is not None and self._client.is_connected
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether the connection has been closed and can no longer be used."""
+        return self._closed
+
+    @property
+    def is_released(self) -> bool:
+        """Whether the link was released while idle and is currently down."""
+        return self._released
+
+    async def connect(self, retries: int = CONNECT_RETRIES, delay: float = CONNECT_RETRY_DELAY) -> None:
         """Establish BLE connection to device.
 
         Args:
@@ -90,26 +175,78 @@ class Connection:
             delay: Delay between retries in seconds
 
         Raises:
+            ConnectionError: If the connection has already been closed
             Exception: If connection fails after all retries
         """
+        async with self._connect_lock:
+            await self._connect(retries, delay)
+
+    async def _connect(self, retries: int, delay: float) -> None:
+        """Establish the link, with the connect lock held.
+
+        Args:
+            retries: Number of connection attempts
+            delay: Delay between retries in seconds
+        """
+        if self._client is not None and self._client.is_connected:
+            # Replacing the client must not leave the previous link up
+            logger.debug("Disconnecting previous client before connecting")
+            await self.disconnect()
+        start = time.monotonic()
         for attempt in range(retries):
+            if self._closed:
+                raise ConnectionError("Connection has been closed")
+            client = None
             try:
                 logger.debug(f"Attempting to connect to device at {self._address} (attempt {attempt + 1}/{retries})")
                 self._peripheral = await self._get_ble_device()
-                self._client = BleakClient(self._peripheral)
-                await self._client.connect()
+                client = self._client = self._client_factory(
+                    self._peripheral, disconnected_callback=self._handle_disconnected
+                )
+                await client.connect()
                 logger.debug(f"Successfully connected to device at {self._address}")
+                if self._notify_handler is not None:
+                    # A fresh client has no subscriptions, restore the existing one
+                    await self._start_notify()
+                self._released = False
+                self.connected_at = time.monotonic()
+                self.connect_seconds = self.connected_at - start
                 return
             except Exception as e:
+                if client is not None:
+                    await self._discard_client(client)
                 if attempt == retries - 1:
                     logger.debug(f"Failed to connect after {retries} attempts: {e}")
                     raise
                 logger.debug(f"Connection attempt {attempt + 1} failed: {e}")
                 await asyncio.sleep(delay)
 
+    async def _discard_client(self, client: Any) -> None:
+        """Disconnect a client whose connect attempt failed part way.
+
+        Args:
+            client: Client of the failed attempt
+        """
+        self._disconnecting = True
+        try:
+            if client.is_connected:
+                await client.disconnect()
+        except Exception as e:
+            logger.debug(f"Failed to disconnect client of failed attempt: {e}")
+        finally:
+            self._disconnecting = False
+        if self._client is client:
+            self._client = None
+        self._notifying = False
+
     async def _get_ble_device(self) -> BLEDevice:
         """Get BLE device from address.
 
+        In Home Assistant the device comes from the Bluetooth integration,
+        whose client wrapper chooses the scanner to connect through, so the
+        scanner that last saw the device is only recorded for diagnostics.
+        Outside Home Assistant the device is found with a bleak scan instead.
+
         Returns:
             BLEDevice: The discovered device
 
@@ -117,162 +254,257 @@ class Connection:
             ConnectionError: If device not found
         """
         logger.debug(f"Discovering device at address {self._address}")
-        device = async_ble_device_from_address(
-            self._hass, self._address, connectable=True
-        )
-        if not device:
+        if self._hass is None:
+            device = await BleakScanner.find_device_by_address(self._address, timeout=SCAN_TIMEOUT)
+            if not device:
+                logger.debug(f"Device not found at address {self._address}")
+                raise ConnectionError("Device not found")
+            return device
+
+        # Imported here so the connection can be used without Home Assistant
+        from homeassistant.components.bluetooth import async_last_service_info
+
+        service_info = async_last_service_info(self._hass, self._address, connectable=True)
+        if service_info is None:
             logger.debug(f"Device not found at address {self._address}")
             raise ConnectionError("Device not found")
+        self._route = {"source": service_info.source, "rssi": service_info.rssi}
+        device = service_info.device
         logger.debug(f"Found device: {device.name} ({device.address})")
         return device
 
     async def reconnect(self) -> None:
         """Disconnect and reconnect to device."""
         logger.debug("Initiating reconnection")
+        self.metrics.increment(RECONNECTS)
         await self.disconnect()
         await asyncio.sleep(1)  # small delay to allow clean BLE state
         await self.connect()
         logger.debug("Reconnection completed")
 
     async def disconnect(self) -> None:
-        """Disconnect from device."""
+        """Disconnect from device.
+
+        Notifications are stopped first so that the client does not keep a
+        reference to the handler once the link is gone.
+        """
         logger.debug("Disconnecting from device")
         self._peripheral = None
-        if self._client and self._client.is_connected:
-            await self._client.disconnect()
-            logger.debug("Device disconnected")
+        self._protocol.reset()
+        self._disconnecting = True
+        try:
+            if self._client and self._client.is_connected:
+                if self._notifying:
+                    try:
+                        await self._client.stop_notify(UUID_READ)
+                    except Exception as e:
+                        logger.debug(f"Failed to stop notifications: {e}")
+                await self._client.disconnect()
+                logger.debug("Device disconnected")
+        finally:
+            self._disconnecting = False
+        self._notifying = False
 
-    async def __aenter__(self) -> "Connection":
-        """Connect when entering context."""
-        await self.connect()
-        return self
+    async def release(self) -> None:
+        """Drop the link while the device is idle.
 
-    async def __aexit__(self, type: Any, value: Any, traceback: Any) -> None:
-        """Disconnect when exiting context."""
+        The subscription is kept, and the next command or ensure_connected
+        call establishes the link again.
+        """
+        async with self._connect_lock:
+            if self._closed or self._released:
+                return
+            logger.debug("Releasing idle link")
+            await self.disconnect()
+            self._released = True
+
+    async def ensure_connected(self) -> bool:
+        """Re-establish a released link.
+
+        Returns:
+            bool: True if the link had to be established
+        """
+        if not self._released:
+            return False
+        async with self._connect_lock:
+            # Another caller may have re-established it while this one waited
+            if not self._released:
+                return False
+            logger.debug("Re-establishing released link")
+            await self._connect(CONNECT_RETRIES, CONNECT_RETRY_DELAY)
+        return True
+
+    async def close(self) -> None:
+        """Permanently close the connection and release all resources.
+
+        After closing, the notification subscription is dropped and any further
+        attempt to connect raises, so late callers such as an in-flight poll
+        cannot resurrect the link.
+        """
+        logger.debug("Closing connection")
+        self._closed = True
+        for pending in self._pending_commands:
+            pending.timeout.cancel()
+        self._pending_commands = []
         await self.disconnect()
+        self._notify_handler = None
+        self._notifications = None
+        self._client = None
+        self._detach_model()
+        self._states.close()
+        self._frames.close()
+        logger.debug("Connection closed")
 
-    def _validate_packet(self, data: bytearray) -> Tuple[int, int, bytearray]:
-        """Validate and parse a received packet.
+    def _handle_disconnected(self, client: Any) -> None:
+        """Report a link that was lost rather than disconnected on purpose.
 
         Args:
-            data: Raw packet data
+            client: Client whose link was lost
+        """
+        if self._disconnecting or self._closed or client is not self._client:
+            return
+        logger.debug(f"Link to {self._address} lost")
+        self._notifying = False
+        if self.on_disconnect is not None:
+            self.on_disconnect()
 
-        Returns:
-            tuple: (client_slot, payload_length, payload)
+    def diagnostics(self) -> Dict[str, Any]:
+        """Get the connection state for diagnostics.
 
-        Raises:
-            ValueError: If packet is invalid
+        Returns:
+            dict: Link state, the scanner the device was last seen through and the protocol metrics
         """
-        if len(data) < 3:
-            raise ValueError(f"Invalid packet length: {len(data)}")
+        return {
+            "address": self._address,
+            "connected": bool(self._client and self._client.is_connected),
+            "closed": self._closed,
+            "released": self._released,
+            "connect_seconds": self.connect_seconds,
+            "route": self._route,
+            "metrics": self.metrics.as_dict(),
+            "streams": {"states": self._states.as_dict(), "frames": self._frames.as_dict()},
+        }
 
-        client_slot = data[0] - 0x40
-        payload_length = data[2]
-        payload = data[3:]
-
-        if len(payload) != payload_length:
-            raise ValueError(f"Expected {payload_length} bytes, got {len(payload)}")
+    async def __aenter__(self) -> "Connection":
+        """Connect when entering context."""
+        await self.connect()
+        return self
 
-        logger.debug(f"Validated packet - client_slot: {client_slot}, length: {payload_length}")
-        return client_slot, payload_length, payload
+    async def __aexit__(self, type: Any, value: Any, traceback: Any) -> None:
+        """Disconnect when exiting context."""
+        await self.disconnect()
 
-    def _handle_notification(self, data: bytearray, notifications: Notifications) -> None:
-        """Process a notification from the device.
+    def _receive(self, data: bytearray, notifications: Notifications) -> None:
+        """Feed a received chunk to the protocol engine and handle the packet it completes.
 
         Args:
-            data: Raw notification data
-            notifications: Handler for parsed notifications
+            data: Chunk received on the notify characteristic
+            notifications: Handler for complete packets
         """
+        frame_type = UNKNOWN_TYPE if self._protocol.reassembling or len(data) < 3 else data[2]
+        slot = self.recorder.record(INBOUND, data, frame_type)
+        logger.debug(f"Received notification: {_format_bytearray(data)}")
         try:
-            logger.debug(f"Received notification: {_format_bytearray(data)}")
-            client_slot, payload_length, payload = self._validate_packet(data)
-            notifications.handle_packet(client_slot, payload_length, payload)
-        except ValueError as e:
+            packet = self._protocol.feed(data)
+        except FramingError as e:
+            self.metrics.increment(VALIDATION_ERRORS)
+            self.recorder.set_outcome(slot, INVALID)
             logger.debug(f"Invalid packet: {e}")
+            return
+        except ReassemblyError as e:
+            self.metrics.increment(REASSEMBLY_FAILURES)
+            self.recorder.set_outcome(slot, INVALID)
+            logger.debug(f"Payload length mismatch: {e}")
+            return
+        if packet is None:
+            logger.debug("Waiting for further chunks")
+            self.recorder.set_outcome(slot, PARTIAL)
+            return
+        self._observe_response(packet)
+        self.recorder.set_outcome(slot, notifications.handle_packet(packet))
 
-    def subscribe(self, notifications: Notifications) -> None:
+    async def subscribe(self, notifications: Notifications) -> None:
         """Subscribe to device notifications.
 
+        The subscription is kept for the lifetime of the connection and is
+        re-established automatically after a reconnect. Subscribing again
+        hands received packets to the new handler without restarting
+        notifications on the device.
+
         Args:
             notifications: Handler for received notifications
         """
         logger.debug("Setting up notification handler")
         self._notifications = notifications
+        notifications.frames = self._frames
+        self._detach_model()
+        model = notifications.model
+        if model is not None:
+            def publish_state() -> None:
+                if self._states:
+                    self._states.publish(model.snapshot())
 
-        async def handle(sender: Any, data: bytearray) -> None:
-            if len(self._partial_payload) > 0:
-                self._handle_partial_packet(data, notifications)
-            else:
-                self._handle_new_packet(data, notifications)
+            self._model_unsubscribers = [model.subscribe(publish_state),
+                                         model.subscribe_availability(publish_state)]
 
-        # Start notification listener
-        asyncio.create_task(self._client.start_notify(UUID_READ, handle))
+        async def handle(sender: Any, data: bytearray) -> None:
+            current = self._notifications
+            if current is None:
+                return
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            self.last_frame_at = time.monotonic()
+            self._receive(data, current)
+            if profiler is not None:
+                profiler.end_frame()
+
+        self._notify_handler = handle
+        if not self._notifying:
+            await self._start_notify()
         logger.debug("Notification handler setup complete")
 
-    def _handle_partial_packet(self, data: bytearray, notifications: Notifications) -> None:
-        """Handle continuation of a split packet.
-
-        Args:
-            data: Next chunk of packet data
-            notifications: Handler for complete packets
-        """
-        logger.debug(f"Handling partial packet continuation: {_format_bytearray(data)}")
-        self._partial_payload.extend(data)
-        payload = self._partial_payload
-        client_slot = self._reassembly_client_slot
-        payload_length = self._reassembly_payload_length
-
-        self._reset_packet_reassembly()
+    def _detach_model(self) -> None:
+        """Stop publishing the state of the previously subscribed data model."""
+        for unsubscribe in self._model_unsubscribers:
+            unsubscribe()
+        self._model_unsubscribers = []
 
-        if len(payload) >= payload_length:
-            if len(payload) == payload_length:
-                logger.debug(f"Completed packet reassembly - length: {payload_length}")
-                notifications.handle_packet(client_slot, payload_length, payload)
-            else:
-                logger.debug(f"Payload length mismatch: expected {payload_length}, got {len(payload)}")
+    def stream_states(self, maxsize: int = DEFAULT_BUFFER) -> Stream[StateSnapshot]:
+        """Stream snapshots of the device state as the data model is updated.
 
-    def _handle_new_packet(self, data: bytearray, notifications: Notifications) -> None:
-        """Handle a new packet from the device.
+        Snapshots are published after every model update and availability
+        change. A consumer that falls behind skips to the newest snapshots,
+        and the stream ends when the connection is closed.
 
         Args:
-            data: Raw packet data
-            notifications: Handler for complete packets
-        """
-        if len(data) < 3:
-            logger.debug(f"Ignoring too-short packet: {_format_bytearray(data)}")
-            return
-
-        client_slot = data[0] - 0x40
-        payload_length = data[2]
-        payload = data[3:]
+            maxsize: Snapshots buffered before the oldest is dropped
 
-        logger.debug(f"New packet - client_slot: {client_slot}, length: {payload_length}, data: {_format_bytearray(payload)}")
-
-        if len(payload) < payload_length:
-            logger.debug(f"Starting packet reassembly - expected length: {payload_length}")
-            self._start_packet_reassembly(client_slot, payload_length, payload)
-        elif len(payload) == payload_length:
-            notifications.handle_packet(client_slot, payload_length, payload)
-        else:
-            logger.debug(f"Payload length mismatch: expected {payload_length}, got {len(payload)}")
+        Returns:
+            Stream: Async iterator over the snapshots
+        """
+        return self._states.stream(maxsize)
 
-    def _reset_packet_reassembly(self) -> None:
-        """Reset packet reassembly state."""
-        self._partial_payload = bytearray()
-        self._reassembly_client_slot = None
-        self._reassembly_payload_length = None
+    def stream_frames(self, maxsize: int = FRAME_BUFFER) -> Stream[Any]:
+        """Stream report events decoded from received packets.
 
-    def _start_packet_reassembly(self, client_slot: int, payload_length: int, initial_payload: bytearray) -> None:
-        """Start reassembling a split packet.
+        Every decoded event is published before it is applied, including
+        events of other clients and failures. A consumer that falls behind
+        loses the oldest events, and the stream ends when the connection is
+        closed.
 
         Args:
-            client_slot: Client slot from packet header
-            payload_length: Expected total payload length
-            initial_payload: First chunk of payload data
+            maxsize: Events buffered before the oldest is dropped
+
+        Returns:
+            Stream: Async iterator over the report events
         """
-        self._reassembly_client_slot = client_slot
-        self._reassembly_payload_length = payload_length
-        self._partial_payload.extend(initial_payload)
+        return self._frames.stream(maxsize)
+
+    async def _start_notify(self) -> None:
+        """Start the notification listener with the registered handler."""
+        await self._client.start_notify(UUID_READ, self._notify_handler)
+        self._notifying = True
 
     async def pair_client(self, new_client_id: int, client_name: str, notifications: Notifications) -> Tuple[int, int]:
         """Pair a new client with the device.
@@ -289,35 +521,10 @@ class Connection:
             Exception: If pairing times out
         """
         logger.debug(f"Pairing client {new_client_id} with {client_name}")
-        
-        payload = self._build_pairing_payload(new_client_id, client_name)
-        full_payload = _get_payload_with_crc(payload, MAGIC_ID)
-
+        full_payload = self._protocol.pairing_request(new_client_id, client_name)
         return await self._execute_pairing(full_payload, new_client_id, notifications)
 
-    def _build_pairing_payload(self, new_client_id: int, client_name: str) -> bytearray:
-        """Build payload for pairing request.
-
-        Args:
-            new_client_id: Client ID to register
-            client_name: Name to register client under
-
-        Returns:
-            bytearray: Formatted pairing payload
-
-        Raises:
-            ValueError: If client name too long
-        """
-        new_client_id_bytes = struct.pack(">I", new_client_id)
-        client_name_bytes = client_name.encode("UTF-8")
-
-        if len(client_name_bytes) > 20:
-            raise ValueError("The client name is too long")
-
-        client_name_bytes += bytearray([0] * (20 - len(client_name_bytes)))
-        return bytearray([0, 0xEB, 24]) + new_client_id_bytes + client_name_bytes
-
-    async def _execute_pairing(self, full_payload: bytearray, new_client_id: int, 
+    async def _execute_pairing(self, full_payload: bytes, new_client_id: int,
                              notifications: Notifications) -> Tuple[int, int]:
         """Execute pairing process with device.
 
@@ -332,11 +539,8 @@ class Connection:
         Raises:
             Exception: If no response received
         """
-        self._response_event.clear()
-        self._response_data = None
-
         await self._client.start_notify(UUID_READ, 
-            lambda _, data: self._handle_notification(data, notifications))
+            lambda _, data: self._receive(data, notifications))
 
         try:
             notifications.reset()
@@ -345,8 +549,11 @@ class Connection:
             try:
                 await asyncio.wait_for(notifications.wait(), timeout=5.0)
             except asyncio.TimeoutError:
+                self.metrics.increment(TIMEOUTS)
                 raise Exception("No response received from device after pairing")
 
+            if notifications.pairing_rejected:
+                raise PairingRejectedError("Device rejected pairing, all client slots may be in use")
             return new_client_id, notifications.client_slot
         finally:
             await self._client.stop_notify(UUID_READ)
@@ -369,17 +576,69 @@ class Connection:
             data: Data to write
             chunk_size: Maximum size of each chunk
         """
-        for chunk in _split_chunks(data, chunk_size):
-            await self._write(chunk)
+        for index, chunk in enumerate(_split_chunks(data, chunk_size)):
+            await self._write(chunk, data[1] if index == 0 else UNKNOWN_TYPE)
+
+    async def _send_command(self, frame: bytes) -> None:
+        """Write a signed command frame, tracking it until the device responds.
+
+        Args:
+            frame: Command frame built by the protocol engine
+        """
+        await self.ensure_connected()
+        self._expect_response(frame[1])
+        await self._write(frame, frame[1])
+
+    def _expect_response(self, opcode: int) -> None:
+        """Start timing a command until the packet answering it arrives or RESPONSE_TIMEOUT expires.
+
+        Args:
+            opcode: Opcode of the command being sent
+        """
+        pending = _PendingCommand(opcode, time.monotonic())
+        pending.timeout = asyncio.get_running_loop().call_later(RESPONSE_TIMEOUT, self._expire_command, pending)
+        self._pending_commands.append(pending)
+
+    def _expire_command(self, pending: "_PendingCommand") -> None:
+        """Count a command that got no response within RESPONSE_TIMEOUT."""
+        if pending in self._pending_commands:
+            self._pending_commands.remove(pending)
+            logger.debug(f"No response to command 0x{pending.opcode:02x}")
+            self.metrics.increment(TIMEOUTS)
+
+    def _observe_response(self, packet: Packet) -> None:
+        """Record the latency of the oldest pending command the packet answers.
+
+        A status packet that answers none of them by type is taken as the
+        failure of the oldest one.
 
-    async def _write(self, data: Union[bytes, bytearray]) -> None:
+        Args:
+            packet: Complete packet received from the device
+        """
+        pending_commands = self._pending_commands
+        pending = next((pending for pending in pending_commands
+                        if packet.payload_length in RESPONSE_LENGTHS.get(pending.opcode, ())), None)
+        if pending is None:
+            if packet.payload_length != STATUS_LENGTH or not pending_commands:
+                return
+            pending = pending_commands[0]
+        pending_commands.remove(pending)
+        pending.timeout.cancel()
+        latency = time.monotonic() - pending.sent_at
+        logger.debug(f"Response to command 0x{pending.opcode:02x} after {latency:.3f}s")
+        self.metrics.record_latency(pending.opcode, latency)
+
+    async def _write(self, data: Union[bytes, bytearray], opcode: int = UNKNOWN_TYPE) -> None:
         """Write data to device.
 
         Args:
             data: Data to write
+            opcode: Opcode of the command, recorded in the flight recorder
         """
         logger.debug(f"Writing data to device: {_format_bytearray(data)}")
         await self._client.write_gatt_char(UUID_WRITE, bytes(data), response=False)
+        self.metrics.increment(FRAMES_SENT)
+        self.recorder.record(OUTBOUND, data, opcode, SENT)
         logger.debug("Write completed")
 
     async def get_device_info(self) -> Dict[str, str]:
@@ -402,33 +661,93 @@ class Connection:
         Args:
             client_slot: Slot number to query
         """
-        payload = bytearray([self._client_slot, 0x6b, 1, 0x10 + client_slot])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.client_details_request(client_slot))
 
     async def request_client_slots(self) -> None:
         """Request list of active client slots."""
-        payload = bytearray([self._client_slot, 0x6b, 1, 0])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.client_slots_request())
+
+    async def fetch_client_inventory(self, timeout: float = INVENTORY_TIMEOUT) -> Dict[int, Optional[str]]:
+        """Fetch the slots in use and the names of their clients.
+
+        After the slot bitmap arrives, the details of all slots are requested
+        back to back without waiting for each answer, so the inventory takes
+        two round trips regardless of the number of clients.
+
+        Args:
+            timeout: Seconds to wait for the bitmap, and then for all names
+
+        Returns:
+            dict: Client name of each slot in use, None for names not received
+
+        Raises:
+            asyncio.TimeoutError: If the slot bitmap is not received
+            RuntimeError: If the connection is not subscribed to notifications
+        """
+        if self._notifications is None:
+            raise RuntimeError("Cannot take a client inventory without a notification handler")
+        collector = ClientInventoryCollector()
+        self._notifications.inventory = collector
+        try:
+            await self.request_client_slots()
+            slots = await asyncio.wait_for(collector.wait_slots(), timeout)
+            for slot in slots:
+                await self.request_client_details(slot)
+            try:
+                await asyncio.wait_for(collector.wait_complete(), timeout)
+            except asyncio.TimeoutError:
+                # The requests that went unanswered are counted as timeouts
+                logger.debug(f"Received {len(collector.names)} of {len(slots)} client names")
+        finally:
+            self._notifications.inventory = None
+        return collector.names_by_slot()
+
+    async def fetch_client_name(self, slot: int, timeout: float = INVENTORY_TIMEOUT) -> Optional[str]:
+        """Fetch the name of the client in a single slot.
+
+        With only one request outstanding, a failure status of another
+        command arriving meanwhile can only make the name unknown, never
+        attribute the name of another slot to this one.
+
+        Args:
+            slot: Slot to query
+            timeout: Seconds to wait for the name
+
+        Returns:
+            str: Client name, or None if the device failed or did not answer
+
+        Raises:
+            RuntimeError: If the connection is not subscribed to notifications
+        """
+        if self._notifications is None:
+            raise RuntimeError("Cannot fetch a client name without a notification handler")
+        collector = ClientInventoryCollector()
+        collector.add_slots([slot])
+        self._notifications.inventory = collector
+        try:
+            await self.request_client_details(slot)
+            await asyncio.wait_for(collector.wait_complete(), timeout)
+        except asyncio.TimeoutError:
+            logger.debug(f"No name received for client slot {slot}")
+        finally:
+            self._notifications.inventory = None
+        return collector.names_by_slot()[slot]
 
     async def request_device_settings(self) -> None:
         """Request device settings."""
-        payload = bytearray([self._client_slot, 0x3e, 0])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.device_settings_request())
 
     async def request_device_state(self) -> None:
         """Request current device state."""
-        payload = bytearray([self._client_slot, 0x7, 0])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.device_state_request())
 
     async def request_nickname(self) -> None:
         """Request device nickname."""
-        payload = bytearray([self._client_slot, 0x44, 0])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.nickname_request())
 
     async def request_outlet_settings(self) -> None:
         """Request outlet configuration settings."""
-        payload = bytearray([self._client_slot, 0x10, 0])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.outlet_settings_request())
 
     async def request_preset_details(self, preset_slot: int) -> None:
         """Request details about a specific preset.
@@ -436,18 +755,15 @@ class Connection:
         Args:
             preset_slot: Preset slot number to query
         """
-        payload = bytearray([self._client_slot, 0x30, 1, 0x40 + preset_slot])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.preset_details_request(preset_slot))
 
     async def request_preset_slots(self) -> None:
         """Request list of preset slots."""
-        payload = bytearray([self._client_slot, 0x30, 1, 0x80])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.preset_slots_request())
 
     async def request_technical_info(self) -> None:
         """Request technical device information."""
-        payload = bytearray([self._client_slot, 0x32, 1, 1])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.technical_info_request())
 
     async def unpair_client(self, client_slot_to_unpair: int) -> None:
         """Unpair a client from the device.
@@ -455,9 +771,7 @@ class Connection:
         Args:
             client_slot_to_unpair: Slot number to unpair
         """
-        payload = bytearray(
-            [self._client_slot, 0xeb, 1, client_slot_to_unpair])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        await self._send_command(self._protocol.unpair_client_request(client_slot_to_unpair))
 
     async def control_outlets(self, outlet1: bool, outlet2: bool, temperature: float) -> None:
         """Control outlet states and temperature.
@@ -467,15 +781,8 @@ class Connection:
             outlet2: True to enable outlet 2
             temperature: Temperature setpoint
         """
-        temperature_bytes = _convert_temperature(temperature)
-        payload = bytearray([
-            self._client_slot,
-            0x87, 0x05,
-            TIMER_RUNNING if outlet1 or outlet2 else TIMER_PAUSED,
-            temperature_bytes[0], temperature_bytes[1],
-            OUTLET_RUNNING if outlet1 else OUTLET_STOPPED,
-            OUTLET_RUNNING if outlet2 else OUTLET_STOPPED])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        self._announce_control_command()
+        await self._send_command(self._protocol.control_outlets_request(outlet1, outlet2, temperature))
 
     async def start_preset(self, preset_slot: int) -> None:
         """Start a preset program.
@@ -483,5 +790,24 @@ class Connection:
         Args:
             preset_slot: Preset slot number to start
         """
-        payload = bytearray([self._client_slot, 0xb1, 1, preset_slot])
-        await self._write(_get_payload_with_crc(payload, self._client_id))
+        self._announce_control_command()
+        await self._send_command(self._protocol.start_preset_request(preset_slot))
+
+    def _announce_control_command(self) -> None:
+        """Tell the subscriber that the next pushed state report echoes a command."""
+        if self.on_control_command is not None:
+            self.on_control_command()
+
+
+@dataclass(eq=False)
+class _PendingCommand:
+    """A command awaiting the packet answering it.
+
+    Attributes:
+        opcode: Opcode of the command
+        sent_at: Monotonic time the command was sent
+        timeout: Timer counting the command as timed out
+    """
+    opcode: int
+    sent_at: float
+    timeout: Optional[asyncio.TimerHandle] = None
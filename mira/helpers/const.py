@@ -6,6 +6,7 @@ UUID_DEVICE_NAME = "00002a00-0000-1000-8000-00805f9b34fb"
 UUID_MODEL_NUMBER = "00002a24-0000-1000-8000-00805f9b34fb" 
 UUID_MANUFACTURER = "00002a29-0000-1000-8000-00805f9b34fb"
 
+UUID_SERVICE = "bccb0001-ca66-11e5-88a4-0002a5d5c51b"
 UUID_READ = "bccb0003-ca66-11e5-88a4-0002a5d5c51b"
 UUID_WRITE = "bccb0002-ca66-11e5-88a4-0002a5d5c51b"
 
@@ -0,0 +1,82 @@
+"""Local countdown of the device timer between frames.
+
+The device only reports the remaining timer duration when it sends a state
+frame. This module extrapolates the remaining time locally from the last
+reported value using the monotonic clock, so it can be shown per second
+without extra radio traffic.
+"""
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the smoothed drift
+DRIFT_SMOOTHING = 0.2
+
+
+class TimerCountdown:
+    """Monotonic countdown anchored on the last reported remaining seconds.
+
+    While the timer is running the remaining time decreases with the local
+    clock; while paused or stopped it is frozen at the reported value. Every
+    device frame re-anchors the countdown, and the difference between the
+    local prediction and the reported value is tracked as drift.
+
+    Attributes:
+        last_drift: Predicted minus reported seconds at the latest re-anchor
+        average_drift: Exponentially smoothed drift in seconds
+        max_drift: Largest absolute drift observed in seconds
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unanchored countdown."""
+        self._anchor_remaining: Optional[int] = None
+        self._anchor_time: Optional[float] = None
+        self._running: bool = False
+
+        self.last_drift: Optional[float] = None
+        self.average_drift: Optional[float] = None
+        self.max_drift: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the countdown is currently advancing."""
+        return self._running
+
+    def anchor(self, remaining_seconds: int, running: bool, now: float) -> None:
+        """Re-anchor the countdown on a value reported by the device.
+
+        Args:
+            remaining_seconds: Remaining timer duration reported by the device
+            running: Whether the device timer is running
+            now: Current monotonic time in seconds
+        """
+        if self._running and running and self._anchor_time is not None:
+            drift = self.remaining(now) - remaining_seconds
+            self.last_drift = drift
+            if self.average_drift is None:
+                self.average_drift = drift
+            else:
+                self.average_drift += DRIFT_SMOOTHING * (drift - self.average_drift)
+            self.max_drift = max(self.max_drift, abs(drift))
+            logger.debug(f"Timer re-anchored at {remaining_seconds}s, drift: {drift:.2f}s")
+
+        self._anchor_remaining = remaining_seconds
+        self._anchor_time = now
+        self._running = running
+
+    def remaining(self, now: float) -> Optional[float]:
+        """Get the extrapolated remaining time.
+
+        Args:
+            now: Current monotonic time in seconds
+
+        Returns:
+            float: Remaining seconds, never below zero, or None if never anchored
+        """
+        if self._anchor_remaining is None:
+            return None
+        if not self._running:
+            return float(self._anchor_remaining)
+        return max(0.0, self._anchor_remaining - (now - self._anchor_time))
@@ -1,19 +1,38 @@
 import logging
 import asyncio
+import time
 from typing import Callable
-from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from .countdown import TimerCountdown
+from .profiling import StageProfiler, STAGE_FAN_OUT, STAGE_MODEL_UPDATE
+from .protocol import OUTLET_FLAG_BITS, TimerState
+from .telemetry import TemperatureTelemetry
 
-from ... import DOMAIN
 
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Immutable copy of the device state at one point in time.
 
-class TimerState(Enum):
-    STOPPED = "stopped"
-    PAUSED = "paused"
-    RUNNING = "running"
+    Attributes:
+        time: UNIX timestamp the snapshot was taken at
+        available: Whether the link delivered live state
+        outlet_1_on: Whether outlet 1 is running
+        outlet_2_on: Whether outlet 2 is running
+        target_temp: Target temperature in Celsius
+        actual_temp: Actual temperature in Celsius
+        timer_state: State of the timer
+        remaining_seconds: Remaining timer seconds reported by the device
+    """
+    time: float
+    available: bool
+    outlet_1_on: Optional[bool]
+    outlet_2_on: Optional[bool]
+    target_temp: Optional[float]
+    actual_temp: Optional[float]
+    timer_state: Optional[TimerState]
+    remaining_seconds: Optional[int]
 
 
 class SoakStationData:
@@ -28,8 +47,24 @@ class SoakStationData:
 
         self.timer_state = None
         self.remaining_seconds = None
+
+        # Local countdown of remaining_seconds between frames
+        self.countdown = TimerCountdown()
+
+        # Rolling history of temperature samples from state frames
+        self.telemetry = TemperatureTelemetry()
+
         self.subscribers: list[Callable[[], None]] = []
 
+        # Whether the link delivers live state, maintained by the link watchdog
+        self.available = True
+        # Whether the link is released while idle, so panel use goes unseen
+        self.released = False
+        self.availability_subscribers: list[Callable[[], None]] = []
+
+        # Optional per-stage timing of notification callbacks
+        self.profiler: Optional[StageProfiler] = None
+
     def update_state(
             self,
             *,
@@ -42,6 +77,15 @@ class SoakStationData:
             timer_state=None,
             remaining_seconds=None
     ):
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        # A newly started outlet changes the flow, so earlier samples no longer
+        # tell how fast the water heats up
+        outlet_started = ((outlet_1_on and not self.outlet_1_on)
+                          or (outlet_2_on and not self.outlet_2_on))
+
         # Update each field only if provided (not None)
         if slots is not None:
             self.slots = slots
@@ -60,13 +104,87 @@ class SoakStationData:
         if remaining_seconds is not None:
             self.remaining_seconds = remaining_seconds
 
-        # Notify subscribers
-        for callback in self.subscribers:
+        # Feed derived state from the frame
+        now = time.monotonic()
+        if remaining_seconds is not None:
+            # Polled reports leave timer_state unset, so this is the last pushed state
+            self.countdown.anchor(remaining_seconds, self.timer_state is TimerState.RUNNING, now)
+        if outlet_started:
+            self.telemetry.clear()
+        if actual_temp is not None:
+            self.telemetry.add_sample(now, actual_temp, self.target_temp)
+
+        if profiler is not None:
+            fan_out_start = time.perf_counter()
+            profiler.add(STAGE_MODEL_UPDATE, fan_out_start - start)
+
+        # Notify subscribers, iterating over a copy so callbacks may unsubscribe
+        for callback in list(self.subscribers):
             callback()
 
-    def subscribe(self, callback: Callable[[], None]):
+        if profiler is not None:
+            profiler.add(STAGE_FAN_OUT, time.perf_counter() - fan_out_start)
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback for state updates.
+
+        Returns:
+            Callable that removes the callback again
+        """
         self.subscribers.append(callback)
 
+        def unsubscribe() -> None:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def snapshot(self) -> StateSnapshot:
+        """Copy the current state, so it can be handed to consumers that run later."""
+        return StateSnapshot(
+            time=time.time(),
+            available=self.available and not self.released,
+            outlet_1_on=self.outlet_1_on,
+            outlet_2_on=self.outlet_2_on,
+            target_temp=self.target_temp,
+            actual_temp=self.actual_temp,
+            timer_state=self.timer_state,
+            remaining_seconds=self.remaining_seconds,
+        )
+
+    def set_available(self, available: bool) -> None:
+        """Mark the state as live or stale and notify availability subscribers on change."""
+        if available == self.available:
+            return
+        self.available = available
+        self._notify_availability()
+
+    def set_released(self, released: bool) -> None:
+        """Mark the link as released while idle or back up and notify availability subscribers on change."""
+        if released == self.released:
+            return
+        self.released = released
+        self._notify_availability()
+
+    def _notify_availability(self) -> None:
+        """Call the availability subscribers, iterating over a copy so callbacks may unsubscribe."""
+        for callback in list(self.availability_subscribers):
+            callback()
+
+    def subscribe_availability(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback for availability changes.
+
+        Returns:
+            Callable that removes the callback again
+        """
+        self.availability_subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.availability_subscribers:
+                self.availability_subscribers.remove(callback)
+
+        return unsubscribe
+
 
 class Preset:
     def __init__(self, slot: int, target_temp: float, duration_seconds: int, outlet_enabled: list[bool], name: str):
@@ -107,8 +225,41 @@ class SoakStationMetadata:
         self.controller_settings: Optional[list[bool]] = None
 
         self._technical_info_event = asyncio.Event()
+        self._device_settings_event = asyncio.Event()
+        self._outlet_settings_event = asyncio.Event()
+
+        # Device info shared by all entities, rebuilt when the identity changes
+        self._device_info = None
+
+    @property
+    def outlets(self) -> Tuple[int, ...]:
+        """Outlet numbers the device reports as enabled, both until its settings are known.
+
+        Device settings list the enabled outlets, and a non-zero outlet
+        settings flag further narrows them to the outlets it marks.
+        """
+        outlets = (1, 2)
+        if self.outlet_enabled is not None:
+            # Device settings list the bit positions of the enabled outlets
+            outlets = tuple(position + 1 for position in self.outlet_enabled if position < 2)
+        if self.outlet_flag:
+            # A flag conflicting with the enabled outlets is ignored
+            flagged = tuple(outlet for outlet in outlets if self.outlet_flag & OUTLET_FLAG_BITS[outlet])
+            outlets = flagged or outlets
+        # Settings leaving no outlet at all are not trusted to remove every outlet
+        return outlets or (1, 2)
+
+    def get_device_info(self):
+        if self._device_info is None:
+            self._device_info = self._build_device_info()
+        return self._device_info
+
+    def _build_device_info(self):
+        # Imported here so the protocol code does not depend on Home Assistant
+        # or the integration package at import time
+        from homeassistant.helpers.device_registry import DeviceInfo
+        from ...const import DOMAIN
 
-    def get_device_info(self) -> DeviceInfo:
         return DeviceInfo(
             sw_version=f"v{self.valve_sw_version}/b{self.bt_sw_version}/u{self.ui_sw_version}",
             suggested_area="Bathroom",
@@ -123,6 +274,7 @@ class SoakStationMetadata:
         self.valve_sw_version = valve_sw_version
         self.ui_sw_version = ui_sw_version
         self.bt_sw_version = bt_sw_version
+        self._device_info = None
         self._technical_info_event.set()  # signal completion
 
     def update_nickname(self, name: str):
@@ -136,6 +288,7 @@ class SoakStationMetadata:
         self.manufacturer = manufacturer
         self.model = model
         self.device_address = device_address
+        self._device_info = None
 
     def update_preset(self, slot: int, target_temp: float, duration: int, outlets: list[bool], name: str):
         self.presets[slot] = Preset(
@@ -151,11 +304,19 @@ class SoakStationMetadata:
         self.min_duration_seconds = min_duration_seconds
         self.max_temperature = max_temperature
         self.min_temperature = min_temperature
+        self._outlet_settings_event.set()
 
     def update_device_settings(self, outlet_enabled: list[bool], default_preset_slot: int, controller_settings: list[bool]):
         self.outlet_enabled = outlet_enabled
         self.default_preset_slot = default_preset_slot
         self.controller_settings = controller_settings
+        self._device_settings_event.set()
 
     async def wait_for_technical_info(self):
-        await self._technical_info_event.wait()
\ No newline at end of file
+        await self._technical_info_event.wait()
+
+    async def wait_for_device_settings(self):
+        await self._device_settings_event.wait()
+
+    async def wait_for_outlet_settings(self):
+        await self._outlet_settings_event.wait()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Entity description tables for Mira devices.
+
+Each platform lists its entities as Home Assistant entity descriptions, and
+only creates those the device supports, so a single-outlet device does not
+carry entities for an outlet it does not have.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity, EntityDescription
+
+from .data_model import SoakStationMetadata
+
+
+@dataclass(frozen=True, kw_only=True)
+class SoakStationEntityDescription(EntityDescription):
+    """Description of an entity a platform can create for a device.
+
+    Platforms combine it with the entity description of their domain.
+
+    Attributes:
+        create_fn: Creates the entity from the setup arguments and this description
+        outlet: Outlet the entity belongs to, or None for device-wide entities
+    """
+    create_fn: Callable[[HomeAssistant, ConfigEntry, Dict[str, Any], Any], Entity]
+    outlet: Optional[int] = None
+
+    def is_supported(self, metadata: SoakStationMetadata) -> bool:
+        """Whether the device supports the entity."""
+        return self.outlet is None or self.outlet in metadata.outlets
+
+
+def build_entities(descriptions: Iterable[SoakStationEntityDescription], hass: HomeAssistant,
+                   config_entry: ConfigEntry, entry_data: Dict[str, Any]) -> List[Entity]:
+    """Create the entities of the descriptions the device supports.
+
+    Args:
+        descriptions: Entity descriptions of a platform
+        hass: Home Assistant instance
+        config_entry: Configuration entry of the device
+        entry_data: Entry data of the device, holding its metadata
+
+    Returns:
+        list: The entities, in description order
+    """
+    metadata = entry_data["metadata"]
+    return [
+        description.create_fn(hass, config_entry, entry_data, description)
+        for description in descriptions
+        if description.is_supported(metadata)
+    ]
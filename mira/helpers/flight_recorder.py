@@ -0,0 +1,134 @@
+"""Always-on flight recorder of raw frames exchanged with a Mira device.
+
+The recorder keeps the last N inbound and outbound frames in preallocated
+slots, together with their timestamp, decoded type and how they were
+handled, so that a diagnostics download can show the traffic leading up to
+a problem without enabling debug logging.
+"""
+
+import time
+from array import array
+from typing import Any, Dict, List
+
+# Frame directions
+INBOUND = 0
+OUTBOUND = 1
+
+# Frame outcomes
+PENDING = 0
+HANDLED = 1
+FAILED = 2
+NO_HANDLER = 3
+INVALID = 4
+PARTIAL = 5
+SENT = 6
+
+OUTCOME_NAMES = ("pending", "handled", "failed", "no_handler", "invalid", "partial", "sent")
+
+# Frame type recorded when it cannot be decoded from the frame itself
+UNKNOWN_TYPE = -1
+
+# Opcode of the pairing request, whose payload carries the client ID
+PAIRING_OPCODE = 0xEB
+
+DEFAULT_CAPACITY = 128
+DEFAULT_FRAME_SIZE = 32
+
+
+class FlightRecorder:
+    """Fixed-memory ring buffer of raw frames.
+
+    All storage is allocated up front. Recording a frame copies its bytes
+    into the next slot and overwrites the slot's metadata in place; frames
+    longer than the slot size are truncated, keeping their original length.
+
+    Attributes:
+        capacity: Number of frames retained
+        frame_size: Maximum number of bytes kept per frame
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, frame_size: int = DEFAULT_FRAME_SIZE) -> None:
+        """Initialize the recorder.
+
+        Args:
+            capacity: Number of frames retained
+            frame_size: Maximum number of bytes kept per frame
+        """
+        self.capacity: int = capacity
+        self.frame_size: int = frame_size
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._lengths = array("H", bytes(2 * capacity))
+        self._types = array("h", bytes(2 * capacity))
+        self._directions = bytearray(capacity)
+        self._outcomes = bytearray(capacity)
+        self._data = bytearray(capacity * frame_size)
+        self._head: int = 0
+        self._count: int = 0
+
+    def record(self, direction: int, data: bytes, frame_type: int, outcome: int = PENDING) -> int:
+        """Record a frame in the next slot.
+
+        Args:
+            direction: INBOUND or OUTBOUND
+            data: Raw frame bytes
+            frame_type: Decoded type (payload length inbound, opcode outbound)
+            outcome: How the frame was handled, if already known
+
+        Returns:
+            int: Slot index, for updating the outcome later
+        """
+        slot = self._head
+        length = len(data)
+        stored = length if length < self.frame_size else self.frame_size
+        offset = slot * self.frame_size
+        self._data[offset:offset + stored] = data[:stored] if stored < length else data
+        self._timestamps[slot] = time.time()
+        self._lengths[slot] = length
+        self._types[slot] = frame_type
+        self._directions[slot] = direction
+        self._outcomes[slot] = outcome
+
+        self._head = (slot + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        return slot
+
+    def set_outcome(self, slot: int, outcome: int) -> None:
+        """Update the outcome of a recorded frame.
+
+        Args:
+            slot: Slot index returned by record
+            outcome: How the frame was handled
+        """
+        self._outcomes[slot] = outcome
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Decode the retained frames, oldest first.
+
+        The client ID carried by pairing requests is masked.
+
+        Returns:
+            list: One dictionary per frame
+        """
+        frames = []
+        for i in range(self._count):
+            slot = (self._head - self._count + i) % self.capacity
+            length = self._lengths[slot]
+            offset = slot * self.frame_size
+            data = bytearray(self._data[offset:offset + min(length, self.frame_size)])
+            direction = self._directions[slot]
+            frame_type = self._types[slot]
+
+            hex_bytes = [format(b, "02x") for b in data]
+            if direction == OUTBOUND and frame_type == PAIRING_OPCODE:
+                hex_bytes[3:7] = ["**"] * len(hex_bytes[3:7])
+
+            frames.append({
+                "timestamp": self._timestamps[slot],
+                "direction": "out" if direction == OUTBOUND else "in",
+                "type": frame_type if frame_type != UNKNOWN_TYPE else None,
+                "length": length,
+                "data": ",".join(hex_bytes),
+                "outcome": OUTCOME_NAMES[self._outcomes[slot]],
+            })
+        return frames
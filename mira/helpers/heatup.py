@@ -0,0 +1,153 @@
+"""Learned heat-up model for Mira devices.
+
+This module predicts how long a device takes to bring the water from its
+initial temperature to a target, from observations of past sessions. The
+time to target is modelled as a fixed delay plus a time per degree of rise,
+fitted with recursive least squares. A forgetting factor discounts older
+sessions, so the prediction follows seasonal changes in the cold water
+supply.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prior before any session has been observed: a fixed delay in seconds and
+# seconds per degree of temperature rise
+DEFAULT_DELAY = 20.0
+DEFAULT_SECONDS_PER_DEGREE = 2.0
+
+# Prior variances of the delay and per-degree parameters; large values let
+# the first observations dominate
+PRIOR_VARIANCE_DELAY = 1000.0
+PRIOR_VARIANCE_PER_DEGREE = 100.0
+
+# Weight kept by past observations with each new one; 0.95 halves the
+# influence of a session after about 14 further sessions
+DEFAULT_FORGETTING = 0.95
+
+# Temperature rise assumed when the initial temperature is unknown
+TYPICAL_RISE = 20.0
+
+# Observed times to target outside this range are treated as outliers
+MAX_OBSERVED_SECONDS = 900.0
+
+
+class HeatUpModel:
+    """Recursive least squares fit of time to target against temperature rise.
+
+    The model is time_to_target = delay + seconds_per_degree * rise. Each
+    observation updates the two parameters and their 2x2 covariance in O(1).
+
+    Attributes:
+        delay: Fixed delay in seconds before the temperature starts rising
+        seconds_per_degree: Seconds per degree of rise
+        forgetting: Weight kept by past observations with each new one
+        observations: Number of sessions folded into the model
+    """
+
+    def __init__(self, forgetting: float = DEFAULT_FORGETTING) -> None:
+        """Initialize the model with its prior.
+
+        Args:
+            forgetting: Weight kept by past observations with each new one, in (0, 1]
+        """
+        if not 0 < forgetting <= 1:
+            raise ValueError("Forgetting factor must be in (0, 1]")
+        self.forgetting: float = forgetting
+        self.delay: float = DEFAULT_DELAY
+        self.seconds_per_degree: float = DEFAULT_SECONDS_PER_DEGREE
+        self.observations: int = 0
+        # Covariance matrix [[p00, p01], [p01, p11]]
+        self._p00: float = PRIOR_VARIANCE_DELAY
+        self._p01: float = 0.0
+        self._p11: float = PRIOR_VARIANCE_PER_DEGREE
+
+    def predict(self, initial_temp: Optional[float], target_temp: float) -> float:
+        """Predict the seconds needed to reach a target temperature.
+
+        Args:
+            initial_temp: Water temperature before the outlet starts, or None if unknown
+            target_temp: Target temperature in Celsius
+
+        Returns:
+            float: Predicted time to target in seconds, never negative
+        """
+        rise = max(0.0, target_temp - initial_temp) if initial_temp is not None else TYPICAL_RISE
+        return max(0.0, self.delay + self.seconds_per_degree * rise)
+
+    def update(self, initial_temp: float, target_temp: float, time_to_target: float) -> bool:
+        """Fold an observed session into the model.
+
+        Args:
+            initial_temp: Actual temperature when the session started
+            target_temp: Target temperature of the session
+            time_to_target: Seconds the session took to reach the target
+
+        Returns:
+            bool: False if the observation was rejected as an outlier
+        """
+        if not 0 <= time_to_target <= MAX_OBSERVED_SECONDS:
+            logger.debug(f"Ignoring heat-up observation of {time_to_target}s")
+            return False
+        rise = max(0.0, target_temp - initial_temp)
+        lam = self.forgetting
+
+        # Gain k = P x / (lambda + x' P x) for x = [1, rise]
+        px0 = self._p00 + self._p01 * rise
+        px1 = self._p01 + self._p11 * rise
+        denominator = lam + px0 + px1 * rise
+        k0 = px0 / denominator
+        k1 = px1 / denominator
+
+        error = time_to_target - (self.delay + self.seconds_per_degree * rise)
+        self.delay += k0 * error
+        self.seconds_per_degree += k1 * error
+
+        # P = (P - k x' P) / lambda
+        self._p00 = (self._p00 - k0 * px0) / lam
+        self._p01 = (self._p01 - k0 * px1) / lam
+        self._p11 = (self._p11 - k1 * px1) / lam
+
+        # Sessions with similar rises leave part of the covariance unexcited,
+        # where forgetting would otherwise grow it without bound
+        trace = self._p00 + self._p11
+        if trace > PRIOR_VARIANCE_DELAY + PRIOR_VARIANCE_PER_DEGREE:
+            scale = (PRIOR_VARIANCE_DELAY + PRIOR_VARIANCE_PER_DEGREE) / trace
+            self._p00 *= scale
+            self._p01 *= scale
+            self._p11 *= scale
+        self.observations += 1
+        logger.debug(
+            f"Heat-up model updated: delay {self.delay:.1f}s, {self.seconds_per_degree:.2f}s/°C "
+            f"after {self.observations} sessions"
+        )
+        return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the model state for persistence and diagnostics."""
+        return {
+            "delay": self.delay,
+            "seconds_per_degree": self.seconds_per_degree,
+            "forgetting": self.forgetting,
+            "observations": self.observations,
+            "covariance": [self._p00, self._p01, self._p11],
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Dict[str, Any]) -> "HeatUpModel":
+        """Restore a model saved with as_dict.
+
+        Args:
+            stored: Saved model state
+
+        Returns:
+            HeatUpModel: The restored model
+        """
+        model = cls(stored.get("forgetting", DEFAULT_FORGETTING))
+        model.delay = stored["delay"]
+        model.seconds_per_degree = stored["seconds_per_degree"]
+        model.observations = stored["observations"]
+        model._p00, model._p01, model._p11 = stored["covariance"]
+        return model
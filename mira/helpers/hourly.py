@@ -0,0 +1,146 @@
+"""Hourly aggregation of Mira device state.
+
+This module folds the stream of data model updates into one compact
+aggregate per clock hour: runtime of each outlet, time-weighted mean,
+minimum and maximum water temperature while an outlet runs, and the number
+of sessions started. Only the running totals of the current hour are kept,
+so aggregation costs the same regardless of how often the device reports.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600.0
+
+# Longest gap between two updates still counted as runtime; longer gaps
+# mean the link was down and the state in between is unknown
+MAX_GAP = 120.0
+
+
+@dataclass
+class HourAggregate:
+    """Aggregate of one clock hour.
+
+    Attributes:
+        start: UNIX timestamp of the start of the hour
+        outlet_1_seconds: Time outlet 1 was running in seconds
+        outlet_2_seconds: Time outlet 2 was running in seconds
+        sessions: Number of times an outlet started with both off before
+        mean_temp: Time-weighted mean actual temperature while running
+        min_temp: Lowest actual temperature seen while running
+        max_temp: Highest actual temperature seen while running
+    """
+    start: float
+    outlet_1_seconds: float = 0.0
+    outlet_2_seconds: float = 0.0
+    sessions: int = 0
+    mean_temp: Optional[float] = None
+    min_temp: Optional[float] = None
+    max_temp: Optional[float] = None
+
+
+class HourlyAggregator:
+    """Incremental per-hour aggregation of outlet and temperature updates.
+
+    Each update first accounts the time since the previous update to the
+    previous state, splitting it at hour boundaries and closing the hours
+    it passes, then takes over the new state.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregator without a state."""
+        self._current: Optional[HourAggregate] = None
+        self._last_time: Optional[float] = None
+        self._outlet_1_on: bool = False
+        self._outlet_2_on: bool = False
+        self._actual_temp: Optional[float] = None
+        # Temperature integrated over running time in the current hour
+        self._temp_seconds: float = 0.0
+        self._temp_weighted: float = 0.0
+
+    def update(self, timestamp: float, outlet_1_on: Optional[bool], outlet_2_on: Optional[bool],
+               actual_temp: Optional[float]) -> List[HourAggregate]:
+        """Apply a data model update.
+
+        Args:
+            timestamp: UNIX timestamp of the update
+            outlet_1_on: Whether outlet 1 is running, None if unknown
+            outlet_2_on: Whether outlet 2 is running, None if unknown
+            actual_temp: Actual water temperature, None if unknown
+
+        Returns:
+            list: Hours closed by this update, oldest first
+        """
+        closed = self.advance(timestamp)
+        was_running = self._outlet_1_on or self._outlet_2_on
+        self._outlet_1_on = bool(outlet_1_on)
+        self._outlet_2_on = bool(outlet_2_on)
+        self._actual_temp = actual_temp
+        running = self._outlet_1_on or self._outlet_2_on
+        if running and not was_running:
+            self._current.sessions += 1
+        if running and actual_temp is not None:
+            self._observe(actual_temp)
+        return closed
+
+    def advance(self, timestamp: float) -> List[HourAggregate]:
+        """Account time up to a timestamp and close the hours it passes.
+
+        Args:
+            timestamp: UNIX timestamp to advance to
+
+        Returns:
+            list: Hours closed, oldest first
+        """
+        if self._current is None:
+            self._current = HourAggregate(timestamp - timestamp % HOUR)
+            self._last_time = timestamp
+            return []
+
+        closed: List[HourAggregate] = []
+        # Time after a long gap is not attributed to the state before it
+        counted_until = min(timestamp, self._last_time + MAX_GAP)
+        while True:
+            hour_end = self._current.start + HOUR
+            self._accumulate(self._last_time, min(counted_until, hour_end))
+            if timestamp < hour_end:
+                break
+            closed.append(self._close())
+            self._current = HourAggregate(hour_end if timestamp < hour_end + HOUR else timestamp - timestamp % HOUR)
+            self._last_time = self._current.start
+            if (self._outlet_1_on or self._outlet_2_on) and self._actual_temp is not None:
+                self._observe(self._actual_temp)
+        self._last_time = max(self._last_time, timestamp)
+        return closed
+
+    def _accumulate(self, start: float, end: float) -> None:
+        """Account the current state over a span within the current hour."""
+        seconds = end - start
+        if seconds <= 0:
+            return
+        if self._outlet_1_on:
+            self._current.outlet_1_seconds += seconds
+        if self._outlet_2_on:
+            self._current.outlet_2_seconds += seconds
+        if (self._outlet_1_on or self._outlet_2_on) and self._actual_temp is not None:
+            self._temp_seconds += seconds
+            self._temp_weighted += self._actual_temp * seconds
+
+    def _observe(self, actual_temp: float) -> None:
+        """Track the temperature range of the current hour."""
+        current = self._current
+        current.min_temp = actual_temp if current.min_temp is None else min(current.min_temp, actual_temp)
+        current.max_temp = actual_temp if current.max_temp is None else max(current.max_temp, actual_temp)
+
+    def _close(self) -> HourAggregate:
+        """Finish the current hour and reset the running totals."""
+        current = self._current
+        if self._temp_seconds > 0:
+            current.mean_temp = self._temp_weighted / self._temp_seconds
+        self._temp_seconds = 0.0
+        self._temp_weighted = 0.0
+        logger.debug(f"Closed hour {current}")
+        return current
@@ -0,0 +1,137 @@
+"""Lightweight protocol instrumentation for Mira devices.
+
+This module keeps fixed-bucket latency histograms per command opcode and
+counters for protocol events. All storage is preallocated when the
+connection is created, so recording an observation is a couple of array
+index updates.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets; a final bucket
+# collects everything slower
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+# Indexes of the protocol counters
+FRAMES_SENT = 0
+FRAMES_RECEIVED = 1
+UNKNOWN_PAYLOAD_LENGTH = 2
+REASSEMBLY_FAILURES = 3
+VALIDATION_ERRORS = 4
+COMMAND_FAILURES = 5
+RECONNECTS = 6
+TIMEOUTS = 7
+STATE_REPORTS = 8
+STATE_UPDATES = 9
+
+COUNTER_NAMES: Tuple[str, ...] = (
+    "frames_sent",
+    "frames_received",
+    "unknown_payload_length",
+    "reassembly_failures",
+    "validation_errors",
+    "command_failures",
+    "reconnects",
+    "timeouts",
+    "state_reports",
+    "state_updates",
+)
+
+# Counters that indicate something went wrong on the link or in decoding
+ERROR_COUNTERS: Tuple[int, ...] = (
+    UNKNOWN_PAYLOAD_LENGTH,
+    REASSEMBLY_FAILURES,
+    VALIDATION_ERRORS,
+    COMMAND_FAILURES,
+)
+
+
+class ProtocolMetrics:
+    """Latency histograms and protocol counters for one connection.
+
+    Opcodes and payload lengths are single bytes, so histograms and per-type
+    frame counts are indexed directly by their value.
+
+    Attributes:
+        counters: Protocol event counters, indexed by the module constants
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            buckets: Upper bounds in seconds of the latency histogram buckets
+        """
+        self._buckets = buckets
+        self._width = len(buckets) + 1
+        self._latency_counts = array("I", bytes(4 * 256 * self._width))
+        self._latency_sums = array("d", bytes(8 * 256))
+        self._frames_by_length = array("I", bytes(4 * 256))
+        self.counters = array("I", bytes(4 * len(COUNTER_NAMES)))
+
+    def record_latency(self, opcode: int, seconds: float) -> None:
+        """Record the write-to-response latency of a command.
+
+        Args:
+            opcode: Opcode of the command
+            seconds: Latency in seconds
+        """
+        self._latency_counts[opcode * self._width + bisect_left(self._buckets, seconds)] += 1
+        self._latency_sums[opcode] += seconds
+
+    def record_frame(self, payload_length: int) -> None:
+        """Count a received frame by its payload length, which identifies its type.
+
+        Args:
+            payload_length: Payload length from the frame header
+        """
+        self._frames_by_length[payload_length] += 1
+        self.counters[FRAMES_RECEIVED] += 1
+
+    def increment(self, counter: int) -> None:
+        """Increment a protocol counter.
+
+        Args:
+            counter: Index of the counter
+        """
+        self.counters[counter] += 1
+
+    @property
+    def errors(self) -> int:
+        """Total of all error counters."""
+        return sum(self.counters[counter] for counter in ERROR_COUNTERS)
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """Mean latency in seconds across all commands, or None if none were timed."""
+        total = sum(self._latency_sums)
+        count = sum(self._latency_counts)
+        return total / count if count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get all metrics for diagnostics.
+
+        Returns:
+            dict: Counters, received frames per payload length and latency
+            histograms per opcode
+        """
+        labels = [f"<={bound}" for bound in self._buckets] + [f">{self._buckets[-1]}"]
+        latency = {}
+        for opcode in range(256):
+            row = self._latency_counts[opcode * self._width:(opcode + 1) * self._width]
+            count = sum(row)
+            if count:
+                latency[f"0x{opcode:02x}"] = {
+                    "count": count,
+                    "mean": round(self._latency_sums[opcode] / count, 4),
+                    "buckets": dict(zip(labels, row)),
+                }
+        return {
+            "counters": dict(zip(COUNTER_NAMES, self.counters)),
+            "frames_by_payload_length": {
+                length: count for length, count in enumerate(self._frames_by_length) if count
+            },
+            "latency": latency,
+        }
@@ -1,77 +1,126 @@
 # Standard library imports
 import asyncio
 import logging
-import struct
-from typing import Callable, Dict, Optional, List, Union
+import time
+from typing import Any, Callable, Dict, Optional, Type
 
 # Local imports
-from .const import SUCCESS, FAILURE, OUTLET_RUNNING, TIMER_STOPPED, TIMER_PAUSED, TIMER_RUNNING
-from .generic import _bits_to_list, _convert_temperature_reverse
-from .data_model import SoakStationData, TimerState, SoakStationMetadata
-
-# Mapping of timer state codes to TimerState enum values
-TIMER_STATE_MAP: Dict[int, TimerState] = {
-    TIMER_STOPPED: TimerState.STOPPED,
-    TIMER_PAUSED: TimerState.PAUSED,
-    TIMER_RUNNING: TimerState.RUNNING,
-}
+from .const import SUCCESS, FAILURE
+from .data_model import SoakStationData, SoakStationMetadata
+from .flight_recorder import FAILED, HANDLED, INVALID, NO_HANDLER
+from .client_slots import ClientInventoryCollector
+from .coalescer import StateCoalescer
+from .metrics import (
+    ProtocolMetrics,
+    COMMAND_FAILURES,
+    STATE_REPORTS,
+    STATE_UPDATES,
+    UNKNOWN_PAYLOAD_LENGTH,
+    VALIDATION_ERRORS,
+)
+from .panel_events import PanelEventDetector
+from .profiling import StageProfiler
+from .protocol import (
+    ClientDetailsReport,
+    DecodeError,
+    DeviceSettingsReport,
+    NicknameReport,
+    OutletSettingsReport,
+    Packet,
+    PresetReport,
+    SlotsReport,
+    StateReport,
+    StatusReport,
+    TechnicalInfoReport,
+    decode_packet,
+)
+from .streams import StreamHub
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
 class Notifications:
-    """Handles processing of notification packets from Mira devices.
+    """Applies report events from Mira devices to the device model.
     
-    This class processes different types of notification packets from the device,
-    updating the device model and metadata accordingly. It supports both pairing
+    Packets are decoded by the protocol engine into report events, which this
+    class applies to the device model and metadata. It supports both pairing
     and normal operation modes.
     
     Attributes:
         _model: Optional data model to update with device state
         _metadata: Optional metadata object to update with device info
         _is_pairing: Whether this instance is being used for pairing
+        _metrics: Optional protocol metrics to count frames in
+        _coalescer: Optional stage merging bursts of state reports
+        _panel_events: Optional detector of changes made at the device's controls
+        _telemetry: Optional callback handing every state report to the long-term store
+        profiler: Optional per-stage timing of notification callbacks
+        inventory: Collector of a client slot inventory in progress, if any
+        frames: Hub decoded report events are published to, set by the connection
         _wait_event: Event for synchronizing notification processing
-        partial_payload: Buffer for reassembling split packets
-        client_slot: Current client slot being processed
-        expected_payload_length: Expected length of reassembled packet
+        client_slot: Client slot assigned by the device when pairing
+        pairing_rejected: Whether the device answered pairing with a failure
     """
 
-    def __init__(self, *, model: Optional[SoakStationData] = None, metadata: Optional[SoakStationMetadata] = None, is_pairing: bool = False) -> None:
+    def __init__(self, *, model: Optional[SoakStationData] = None, metadata: Optional[SoakStationMetadata] = None,
+                 is_pairing: bool = False, metrics: Optional[ProtocolMetrics] = None,
+                 coalescer: Optional[StateCoalescer] = None,
+                 panel_events: Optional[PanelEventDetector] = None,
+                 telemetry: Optional[Callable[[StateReport, float], None]] = None) -> None:
         """Initialize notification handler.
         
         Args:
             model: Optional data model to update with device state
             metadata: Optional metadata object to update with device info
             is_pairing: Whether this instance is being used for pairing
+            metrics: Optional protocol metrics to count frames in
+            coalescer: Optional stage merging bursts of state reports before
+                they are applied to the model
+            panel_events: Optional detector of changes made at the device's
+                controls, fed before any coalescing
+            telemetry: Optional callback handing every state report and its
+                time to the long-term store, before any coalescing
         """
         logger.debug(f"Initializing notification handler - pairing mode: {is_pairing}")
         # Store model and metadata references
         self._model: Optional[SoakStationData] = model
         self._metadata: Optional[SoakStationMetadata] = metadata
         self._is_pairing: bool = is_pairing
+        self._metrics: Optional[ProtocolMetrics] = metrics
+        self._coalescer: Optional[StateCoalescer] = coalescer
+        self._panel_events: Optional[PanelEventDetector] = panel_events
+        self._telemetry: Optional[Callable[[StateReport, float], None]] = telemetry
+        self.profiler: Optional[StageProfiler] = None
+        self.inventory: Optional[ClientInventoryCollector] = None
+        self.frames: Optional[StreamHub[Any]] = None
+        self.pairing_rejected: bool = False
         
         # Create event for synchronizing notification processing
         self._wait_event: asyncio.Event = asyncio.Event()
 
-        # Initialize buffers for partial message reconstruction
-        self.partial_payload: bytearray = bytearray()
+        # Slot assigned to the new client when pairing
         self.client_slot: Optional[int] = None
-        self.expected_payload_length: Optional[int] = None
-
-        # Map payload lengths to their corresponding handler methods
-        self._handlers: Dict[int, Callable[[int, bytearray], None]] = {
-            1: self._handle_success_or_failure,    # Status updates
-            2: self._handle_slots,                 # Slot list
-            4: self._handle_device_settings,       # Device configuration
-            10: self._handle_device_state,         # Current device state
-            11: self._handle_controls_operated_or_outlet_settings,  # Control/outlet updates
-            16: self._handle_technical_info_or_nickname,  # Device info/nickname
-            20: self._handle_client_details,       # Client information
-            24: self._handle_preset_details,       # Preset configuration
+
+        # Map report events to their corresponding handler methods
+        self._handlers: Dict[Type[Any], Callable[[Any], bool]] = {
+            StatusReport: self._handle_status,
+            SlotsReport: self._handle_slots,
+            DeviceSettingsReport: self._handle_device_settings,
+            StateReport: self._handle_state,
+            OutletSettingsReport: self._handle_outlet_settings,
+            TechnicalInfoReport: self._handle_technical_info,
+            NicknameReport: self._handle_nickname,
+            ClientDetailsReport: self._handle_client_details,
+            PresetReport: self._handle_preset_details,
         }
         logger.debug("Notification handler initialized")
 
+    @property
+    def model(self) -> Optional[SoakStationData]:
+        """Data model updated with device state, if any."""
+        return self._model
+
     async def wait(self) -> None:
         """Wait for notification processing to complete."""
         logger.debug("Waiting for notification processing")
@@ -86,42 +135,78 @@ class Notifications:
     def reset(self) -> None:
         """Reset the wait event."""
         logger.debug("Resetting notification event")
+        self.pairing_rejected = False
         self._wait_event.clear()
 
-    def handle_packet(self, client_slot: int, payload_length: int, payload: bytearray) -> None:
-        """Handle a packet from the device.
+    def handle_packet(self, packet: Packet) -> int:
+        """Decode a packet from the device and apply it.
 
         Args:
-            client_slot: Client slot from packet header
-            payload_length: Expected payload length
-            payload: Packet payload data
-        """
-        logger.debug(f"Handling packet - client_slot: {client_slot}, length: {payload_length}")
-        
-        if payload_length not in self._handlers:
-            logger.debug(f"No handler for payload length {payload_length}")
-            return
+            packet: Complete packet from the protocol engine
 
-        handler = self._handlers[payload_length]
-        if not handler(client_slot, payload):
+        Returns:
+            int: Flight recorder outcome of the packet
+        """
+        logger.debug(f"Handling packet - client_slot: {packet.client_slot}, length: {packet.payload_length}")
+        if self._metrics:
+            self._metrics.record_frame(packet.payload_length)
+
+        profiler = self.profiler
+        start = time.perf_counter() if profiler is not None else 0.0
+        try:
+            event = decode_packet(packet)
+        except DecodeError as e:
+            if self._metrics:
+                self._metrics.increment(VALIDATION_ERRORS)
+            logger.debug(f"Failed to decode packet: {e}")
+            return INVALID
+        else:
+            if event is None:
+                if self._metrics:
+                    self._metrics.increment(UNKNOWN_PAYLOAD_LENGTH)
+                logger.debug(f"No handler for payload length {packet.payload_length}")
+                return NO_HANDLER
+            frames = self.frames
+            if frames:
+                frames.publish(event)
+            handled = self.handle_event(event)
+        if profiler is not None:
+            profiler.add_packet(time.perf_counter() - start)
+        if not handled:
+            if self._metrics:
+                self._metrics.increment(COMMAND_FAILURES)
             logger.debug("Command failed")
-            return
+            return FAILED
 
         logger.debug("Packet handled successfully")
         self._set()
+        return HANDLED
+
+    def handle_event(self, event: Any) -> bool:
+        """Apply a report event to the model and metadata.
 
-    def _handle_success_or_failure(self, slot: int, payload: bytearray) -> bool:
-        """Handle success/failure status packet.
-        
         Args:
-            slot: Client slot number
-            payload: Packet payload containing status code
+            event: Report event from the protocol engine
+
+        Returns:
+            bool: False if the event reports a failure or cannot be applied
         """
-        status: int = payload[0]
+        return self._handlers[type(event)](event)
+
+    def _handle_status(self, event: StatusReport) -> bool:
+        """Handle a command status; while pairing it carries the assigned slot."""
+        status: int = event.status
         logger.debug(f"Processing status packet - status: {status}")
 
         if status == FAILURE:
             logger.debug("The command failed")
+            if self.inventory is not None:
+                # A slot the device has no details for
+                self.inventory.add_name(None)
+            if self._is_pairing:
+                # Wake the pairing flow so it fails now instead of timing out
+                self.pairing_rejected = True
+                self._set()
             return False
         elif self._is_pairing:
             self.client_slot = status
@@ -133,182 +218,102 @@ class Notifications:
             raise Exception(f"Unrecognized status: {status}")
         return True
 
-    def _handle_slots(self, slot: int, payload: bytearray) -> bool:
-        """Handle slot list packet.
-        
-        Lists the slots currently in use on the device (e.g. client x in slot 1 on Shower Y)
-        
-        Args:
-            slot: Client slot number
-            payload: Packet payload containing slot bitmap
-        """
-        logger.debug("Processing slot list packet")
-        # Convert 16-bit bitmap to list of active slots
-        slots: List[int] = _bits_to_list(struct.unpack(">H", payload)[0], 16)
+    def _handle_slots(self, event: SlotsReport) -> bool:
+        """Handle the list of slots currently in use on the device."""
         if self._model:
-            self._model.slots = slots
-            logger.debug(f"Updated slots: {slots}")
+            self._model.slots = event.slots
+            logger.debug(f"Updated slots: {event.slots}")
+        if self.inventory is not None:
+            self.inventory.add_slots(event.slots)
         return True
 
-    def _handle_device_settings(self, slot: int, payload: bytearray) -> bool:
-        """Handle device settings packet.
-        
-        Args:
-            slot: Client slot number
-            payload: Packet payload containing device settings
-        """
-        logger.debug("Processing device settings packet")
-        # Extract device configuration from payload
-        outlet_enabled: List[int] = _bits_to_list(payload[1], 8)
-        default_preset_slot: int = payload[2]
-        controller_settings: List[int] = _bits_to_list(payload[3], 8)
-
+    def _handle_device_settings(self, event: DeviceSettingsReport) -> bool:
+        """Handle the device settings."""
         if self._metadata:
-            self._metadata.update_device_settings(outlet_enabled, default_preset_slot, controller_settings)
-            logger.debug(f"Updated device settings - outlets: {outlet_enabled}, default preset: {default_preset_slot}")
+            self._metadata.update_device_settings(event.outlet_enabled, event.default_preset_slot,
+                                                  event.controller_settings)
+            logger.debug(f"Updated device settings - outlets: {event.outlet_enabled}, "
+                         f"default preset: {event.default_preset_slot}")
         return True
 
-    def _handle_device_state(self, slot: int, payload: bytearray) -> bool:
-        """Handle device state packet.
-        
-        Get details about the outlets and other status of the device.
-        
-        Args:
-            slot: Client slot number
-            payload: Packet payload containing device state
-        """
-        logger.debug("Processing device state packet")
-        # Validate payload length
-        if len(payload) < 8:
-            logger.debug(f"Unexpected payload length for device state: {len(payload)}")
-            return False
-
-        # Extract timer state
-        timer_state: Optional[TimerState] = TIMER_STATE_MAP.get(payload[1])
-        if timer_state is None:
-            logger.debug(f"Unknown timer state value: {payload[1]}")
-            return False
-
-        # Extract temperature and state information
-        target_temperature: float = _convert_temperature_reverse(payload[1:3])
-        actual_temperature: float = _convert_temperature_reverse(payload[3:5])
-        remaining_seconds: int = struct.unpack(">H", payload[7:9])[0]
-        outlet_state_1: bool = payload[5] == OUTLET_RUNNING
-        outlet_state_2: bool = payload[6] == OUTLET_RUNNING
-
-        logger.debug(f"Device state - timer: {timer_state}, target temp: {target_temperature}, "
-                    f"actual temp: {actual_temperature}, remaining: {remaining_seconds}s, "
-                    f"outlets: [{outlet_state_1}, {outlet_state_2}]")
-
-        # Update model if available
-        if self._model:
-            self._model.update_state(outlet_1_on=outlet_state_1, outlet_2_on=outlet_state_2,
-                                     target_temp=target_temperature, actual_temp=actual_temperature,
-                                     remaining_seconds=remaining_seconds, timer_state=timer_state)
+    def _handle_state(self, event: StateReport) -> bool:
+        """Handle the outlet, temperature and timer state, polled or after the controls were operated."""
+        logger.debug(f"{'Control update' if event.controls_operated else 'Device state'} - "
+                     f"timer: {event.timer_state}, target temp: {event.target_temp}, "
+                     f"actual temp: {event.actual_temp}, remaining: {event.remaining_seconds}s, "
+                     f"outlets: [{event.outlet_1_on}, {event.outlet_2_on}]")
+
+        if self._metrics:
+            self._metrics.increment(STATE_REPORTS)
+
+        # Panel events fire straight from the frame, not from model updates
+        if self._panel_events:
+            self._panel_events.feed(event)
+
+        # Every decoded frame is kept, including those a coalescer would merge
+        if self._telemetry:
+            self._telemetry(event, time.time())
+
+        # Update model if available, merging bursts if coalescing is enabled
+        if self._coalescer:
+            self._coalescer.submit(event)
+        elif self._model:
+            if self._metrics:
+                self._metrics.increment(STATE_UPDATES)
+            self._model.update_state(outlet_1_on=event.outlet_1_on, outlet_2_on=event.outlet_2_on,
+                                     target_temp=event.target_temp, actual_temp=event.actual_temp,
+                                     remaining_seconds=event.remaining_seconds, timer_state=event.timer_state)
         return True
 
-    def _handle_controls_operated_or_outlet_settings(self, slot: int, payload: bytearray) -> bool:
-        """Handle controls operated or outlet settings packet.
-        
-        Args:
-            slot: Client slot number
-            payload: Packet payload containing control or outlet settings
-        """
-        logger.debug(f"Processing control/outlet packet - type: {payload[0]}")
-        
-        if payload[0] in [1, 0x80]:  # Handle control operation updates
-            # Extract timer state
-            timer_state: Optional[TimerState] = TIMER_STATE_MAP.get(payload[1])
-            if timer_state is None:
-                logger.debug(f"Unknown timer state value: {payload[1]}")
-                return False
-
-            # Extract temperature and state information
-            target_temperature: float = _convert_temperature_reverse(payload[2:4])
-            actual_temperature: float = _convert_temperature_reverse(payload[4:6])
-            outlet_state_1: bool = payload[6] == OUTLET_RUNNING
-            outlet_state_2: bool = payload[7] == OUTLET_RUNNING
-            remaining_seconds: int = struct.unpack(">H", payload[8:10])[0]
-
-            logger.debug(f"Control update - timer: {timer_state}, target temp: {target_temperature}, "
-                        f"actual temp: {actual_temperature}, remaining: {remaining_seconds}s, "
-                        f"outlets: [{outlet_state_1}, {outlet_state_2}]")
-
-            # Update model if available
-            if self._model:
-                self._model.update_state(outlet_1_on=outlet_state_1, outlet_2_on=outlet_state_2,
-                                         target_temp=target_temperature, actual_temp=actual_temperature,
-                                         remaining_seconds=remaining_seconds, timer_state=timer_state)
-            return True
-
-        elif payload[0] in [0, 0x4, 0x8]:  # Handle outlet settings updates
-            # Extract outlet configuration
-            outlet_flag: int = payload[0]
-            min_duration_seconds: int = payload[4]
-            max_temperature: float = _convert_temperature_reverse(payload[5:7])
-            min_temperature: float = _convert_temperature_reverse(payload[7:9])
-
-            logger.debug(f"Outlet settings - flag: {outlet_flag}, min duration: {min_duration_seconds}s, "
-                        f"temp range: {min_temperature}-{max_temperature}°C")
-
-            if self._metadata:
-                self._metadata.update_outlet_settings(outlet_flag, min_duration_seconds, max_temperature,
-                                                      min_temperature)
-            return True
-
-        return False
+    def _handle_outlet_settings(self, event: OutletSettingsReport) -> bool:
+        """Handle the outlet settings."""
+        logger.debug(f"Outlet settings - flag: {event.outlet_flag}, min duration: {event.min_duration_seconds}s, "
+                     f"temp range: {event.min_temperature}-{event.max_temperature}°C")
+        if self._metadata:
+            self._metadata.update_outlet_settings(event.outlet_flag, event.min_duration_seconds,
+                                                  event.max_temperature, event.min_temperature)
+        return True
 
-    def _handle_technical_info_or_nickname(self, slot: int, payload: bytearray) -> bool:
-        """Handle technical info or nickname packet.
-        
-        Args:
-            slot: Client slot number
-            payload: Packet payload containing technical info or nickname
-        """
-        logger.debug("Processing technical info/nickname packet")
-        
+    def _handle_technical_info(self, event: TechnicalInfoReport) -> bool:
+        """Handle the firmware versions."""
         if self._metadata is None:
             logger.debug("No metadata object available")
             return False
+        logger.debug(f"Technical info - valve: {event.valve_sw_version}, bt: {event.bt_sw_version}, "
+                     f"ui: {event.ui_sw_version}")
+        self._metadata.update_from_technical_info(event.valve_sw_version, event.bt_sw_version,
+                                                  event.ui_sw_version)
+        return True
 
-        if payload[0] == 0:
-            values = struct.unpack(">8H", payload)
-            valve_sw_version: str = f"{values[0]}.{values[1]}"
-            bt_sw_version: str = f"{values[2]}.{values[3]}"
-            ui_sw_version: str = f"{values[6]}.{values[7]}"
-
-            logger.debug(f"Technical info - valve: {valve_sw_version}, bt: {bt_sw_version}, ui: {ui_sw_version}")
-            self._metadata.update_from_technical_info(valve_sw_version, bt_sw_version, ui_sw_version)
-            return True
-        else:
-            nickname = payload.decode("UTF-8")
-            logger.debug(f"Updating nickname: {nickname}")
-            self._metadata.update_nickname(nickname)
-            return True
+    def _handle_nickname(self, event: NicknameReport) -> bool:
+        """Handle the device nickname."""
+        if self._metadata is None:
+            logger.debug("No metadata object available")
+            return False
+        logger.debug(f"Updating nickname: {event.nickname}")
+        self._metadata.update_nickname(event.nickname)
+        return True
 
-    def _handle_client_details(self, slot: int, payload: bytearray) -> bool:
+    def _handle_client_details(self, event: ClientDetailsReport) -> bool:
         """Handle client details packet."""
+        if self.inventory is not None:
+            # Names of other clients are not this client's name
+            self.inventory.add_name(event.client_name)
+            return True
         if self._metadata:
-            client_name = payload.decode("UTF-8")
-            logger.debug(f"Updating client name: {client_name}")
-            self._metadata.update_client_name(client_name)
+            logger.debug(f"Updating client name: {event.client_name}")
+            self._metadata.update_client_name(event.client_name)
             return True
         logger.debug("No metadata object available for client details")
         return False
 
-    def _handle_preset_details(self, slot: int, payload: bytearray) -> bool:
+    def _handle_preset_details(self, event: PresetReport) -> bool:
         """Handle preset details packet."""
         if self._metadata:
-            slot: int = payload[0]
-            target_temp: float = _convert_temperature_reverse(payload[1:3])
-            duration: int = payload[4]
-            outlet_flags: List[int] = _bits_to_list(payload[5], 8)
-            name: str = payload[8:].decode('UTF-8').rstrip('\0')
-
-            logger.debug(f"Preset details - slot: {slot}, temp: {target_temp}°C, "
-                        f"duration: {duration}s, outlets: {outlet_flags}, name: {name}")
-            
-            self._metadata.update_preset(slot, target_temp, duration, outlet_flags, name)
+            logger.debug(f"Preset details - slot: {event.slot}, temp: {event.target_temp}°C, "
+                         f"duration: {event.duration}s, outlets: {event.outlet_flags}, name: {event.name}")
+            self._metadata.update_preset(event.slot, event.target_temp, event.duration, event.outlet_flags,
+                                         event.name)
             return True
         logger.debug("No metadata object available for preset details")
         return False
@@ -0,0 +1,135 @@
+"""Detection of changes made at the device's own controls.
+
+The device pushes a state report whenever its physical controls are
+operated. This module compares each such report with the previous state
+report and turns the differences into discrete panel events, straight from
+the frame and independent of polling or coalescing of model updates.
+
+The device also pushes such a report after a command of this integration
+operated the outlets. Those echoes are recognised by the command being
+announced to the detector just before it is sent, and produce no events.
+Polled reports do not carry a usable timer state, so timer events are only
+derived from pushed reports.
+"""
+
+import logging
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .protocol import StateReport, TimerState
+
+logger = logging.getLogger(__name__)
+
+# Panel event types
+OUTLET_STARTED = "outlet_started"
+OUTLET_STOPPED = "outlet_stopped"
+TEMPERATURE_CHANGED = "temperature_changed"
+TIMER_PAUSED = "timer_paused"
+TIMER_RESUMED = "timer_resumed"
+
+PANEL_EVENT_TYPES: Tuple[str, ...] = (
+    OUTLET_STARTED,
+    OUTLET_STOPPED,
+    TEMPERATURE_CHANGED,
+    TIMER_PAUSED,
+    TIMER_RESUMED,
+)
+
+PanelEvent = Tuple[str, Dict[str, Any]]
+
+# Seconds within which a pushed report is taken as the echo of a command
+ECHO_WINDOW = 5.0
+
+
+def diff_reports(previous: StateReport, report: StateReport) -> List[PanelEvent]:
+    """Get the panel events between two state reports.
+
+    Args:
+        previous: Previous state report
+        report: State report sent after the controls were operated
+
+    Returns:
+        list: Event types with their attributes, in a stable order
+    """
+    events: List[PanelEvent] = []
+    for outlet, was_on, is_on in ((1, previous.outlet_1_on, report.outlet_1_on),
+                                  (2, previous.outlet_2_on, report.outlet_2_on)):
+        if is_on != was_on:
+            events.append((OUTLET_STARTED if is_on else OUTLET_STOPPED,
+                           {"outlet": outlet, "target_temp": report.target_temp}))
+    if report.target_temp != previous.target_temp:
+        events.append((TEMPERATURE_CHANGED,
+                       {"target_temp": report.target_temp, "previous_target_temp": previous.target_temp}))
+    if previous.timer_state is not None and report.timer_state is not previous.timer_state:
+        if report.timer_state is TimerState.PAUSED:
+            events.append((TIMER_PAUSED, {"remaining_seconds": report.remaining_seconds}))
+        elif previous.timer_state is TimerState.PAUSED and report.timer_state is TimerState.RUNNING:
+            events.append((TIMER_RESUMED, {"remaining_seconds": report.remaining_seconds}))
+    return events
+
+
+class PanelEventDetector:
+    """Turns controls-operated state reports into panel events.
+
+    Every state report, polled or pushed, updates the reference state, but
+    only reports sent because the controls were operated produce events,
+    and not those echoing a command announced with expect_echo. The timer
+    state of the reference is only taken from pushed reports.
+
+    Attributes:
+        subscribers: Callbacks receiving each event type and its attributes
+    """
+
+    def __init__(self) -> None:
+        """Initialize the detector without a reference state."""
+        self._last: Optional[StateReport] = None
+        self._echo_deadline: Optional[float] = None
+        self.subscribers: List[Callable[[str, Dict[str, Any]], None]] = []
+
+    def feed(self, report: StateReport) -> List[PanelEvent]:
+        """Process a state report and notify subscribers of its panel events.
+
+        Args:
+            report: Decoded state report
+
+        Returns:
+            list: Event types with their attributes
+        """
+        previous = self._last
+        if not report.controls_operated:
+            # Polled reports carry no timer state, keep that of the last pushed report
+            report = replace(report, timer_state=previous.timer_state if previous is not None else None)
+        self._last = report
+        if previous is None or not report.controls_operated:
+            return []
+        if self._echo_deadline is not None:
+            echo = time.monotonic() <= self._echo_deadline
+            self._echo_deadline = None
+            if echo:
+                logger.debug("State report echoes a command, no panel events")
+                return []
+        events = diff_reports(previous, report)
+        for event_type, attributes in events:
+            logger.debug(f"Panel event {event_type}: {attributes}")
+            for callback in list(self.subscribers):
+                callback(event_type, attributes)
+        return events
+
+    def expect_echo(self) -> None:
+        """Announce a command operating the outlets, whose pushed report is not a panel change."""
+        self._echo_deadline = time.monotonic() + ECHO_WINDOW
+
+    def subscribe(self, callback: Callable[[str, Dict[str, Any]], None]) -> Callable[[], None]:
+        """Register a callback for panel events.
+
+        Returns:
+            Callable that removes the callback again
+        """
+        self.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+        return unsubscribe
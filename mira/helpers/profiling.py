@@ -0,0 +1,119 @@
+"""Opt-in timing of the notification path on the event loop.
+
+Notification callbacks run synchronously on the event loop, from reassembly
+through decoding and the model update to the fan-out into entities. This
+module times each of those stages per frame and flags frames whose total
+time exceeds a budget.
+"""
+
+import logging
+import time
+from array import array
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages of the notification path
+STAGE_REASSEMBLY = 0
+STAGE_DECODE = 1
+STAGE_MODEL_UPDATE = 2
+STAGE_FAN_OUT = 3
+
+STAGE_NAMES = ("reassembly", "decode", "model_update", "fan_out")
+
+# Default budget for a single notification callback, in seconds
+DEFAULT_BUDGET = 0.005
+
+# Minimum seconds between warnings about callbacks over budget
+WARNING_INTERVAL = 60.0
+
+
+class StageProfiler:
+    """Per-stage timing of notification callbacks.
+
+    The connection brackets each notification with begin_frame and
+    end_frame; the notification handler reports the time spent handling the
+    complete packet and the data model reports its update and fan-out times.
+    Reassembly and decode times are derived from the difference.
+
+    Attributes:
+        budget: Callback duration in seconds above which a frame is flagged
+        frames: Number of notifications timed
+        over_budget: Number of notifications that exceeded the budget
+    """
+
+    def __init__(self, budget: float = DEFAULT_BUDGET) -> None:
+        """Initialize the profiler.
+
+        Args:
+            budget: Callback duration in seconds above which a frame is flagged
+        """
+        self.budget: float = budget
+        self.frames: int = 0
+        self.over_budget: int = 0
+        self._totals = array("d", bytes(8 * len(STAGE_NAMES)))
+        self._maxima = array("d", bytes(8 * len(STAGE_NAMES)))
+        self._current = array("d", bytes(8 * len(STAGE_NAMES)))
+        self._packet: float = 0.0
+        self._frame_start: float = 0.0
+        self._last_warning: Optional[float] = None
+
+    def begin_frame(self) -> None:
+        """Start timing a notification."""
+        self._packet = 0.0
+        self._current[STAGE_MODEL_UPDATE] = 0.0
+        self._current[STAGE_FAN_OUT] = 0.0
+        self._frame_start = time.perf_counter()
+
+    def add_packet(self, seconds: float) -> None:
+        """Record the time spent handling a complete packet, including the model update."""
+        self._packet += seconds
+
+    def add(self, stage: int, seconds: float) -> None:
+        """Record time spent in the model update or fan-out stage."""
+        self._current[stage] += seconds
+
+    def end_frame(self) -> None:
+        """Finish timing a notification and fold it into the statistics."""
+        total = time.perf_counter() - self._frame_start
+        current = self._current
+        current[STAGE_REASSEMBLY] = total - self._packet
+        current[STAGE_DECODE] = max(0.0, self._packet - current[STAGE_MODEL_UPDATE] - current[STAGE_FAN_OUT])
+        for stage in range(len(STAGE_NAMES)):
+            self._totals[stage] += current[stage]
+            if current[stage] > self._maxima[stage]:
+                self._maxima[stage] = current[stage]
+        self.frames += 1
+
+        if total > self.budget:
+            self.over_budget += 1
+            now = time.monotonic()
+            if self._last_warning is None or now - self._last_warning >= WARNING_INTERVAL:
+                self._last_warning = now
+                breakdown = ", ".join(
+                    f"{name}: {current[stage] * 1000:.2f}ms" for stage, name in enumerate(STAGE_NAMES)
+                )
+                logger.warning(
+                    f"Notification callback took {total * 1000:.2f}ms, over the "
+                    f"{self.budget * 1000:.1f}ms budget ({breakdown}); "
+                    f"{self.over_budget} of {self.frames} callbacks over budget so far"
+                )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the timing statistics for diagnostics.
+
+        Returns:
+            dict: Frames timed, frames over budget and mean and max milliseconds per stage
+        """
+        return {
+            "budget_ms": self.budget * 1000,
+            "frames": self.frames,
+            "over_budget": self.over_budget,
+            "stages": {
+                name: {
+                    "mean_ms": round(self._totals[stage] * 1000 / self.frames, 4) if self.frames else None,
+                    "max_ms": round(self._maxima[stage] * 1000, 4),
+                }
+                for stage, name in enumerate(STAGE_NAMES)
+            },
+        }
@@ -0,0 +1,462 @@
+"""Transport-independent Mira protocol engine.
+
+This module implements the Mira protocol without any I/O: framing and CRC
+signing of commands, reassembly of notifications split across several
+chunks, and decoding of complete packets into report events. It has no
+asyncio, bleak or Home Assistant dependencies, so it can be driven by any
+transport and exercised at full speed without a device.
+
+Inbound, bytes received on the notify characteristic are fed to
+MiraProtocol.feed, which returns a Packet once one is complete, and
+decode_packet turns a packet into one of the report events below.
+MiraProtocol.receive_data combines both. Outbound, the command builders
+return signed frames ready to be written.
+"""
+
+import struct
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .const import MAGIC_ID, OUTLET_RUNNING, OUTLET_STOPPED, TIMER_PAUSED, TIMER_RUNNING, TIMER_STOPPED
+from .generic import _bits_to_list, _convert_temperature, _convert_temperature_reverse, _get_payload_with_crc
+
+# Size of the header (client slot, opcode, payload length) of every frame
+HEADER_SIZE = 3
+
+# Maximum length of the client name registered when pairing
+MAX_CLIENT_NAME_LENGTH = 20
+
+
+class TimerState(Enum):
+    STOPPED = "stopped"
+    PAUSED = "paused"
+    RUNNING = "running"
+
+
+# Mapping of timer state codes to TimerState enum values
+TIMER_STATE_MAP: Dict[int, TimerState] = {
+    TIMER_STOPPED: TimerState.STOPPED,
+    TIMER_PAUSED: TimerState.PAUSED,
+    TIMER_RUNNING: TimerState.RUNNING,
+}
+
+# Bits of the outlet settings flag marking each outlet, a flag of 0 marks none
+OUTLET_FLAG_BITS: Dict[int, int] = {1: 0x4, 2: 0x8}
+
+
+class FramingError(ValueError):
+    """A received chunk cannot start a packet."""
+
+
+class ReassemblyError(ValueError):
+    """The chunks of a packet do not add up to its declared length."""
+
+
+class DecodeError(ValueError):
+    """A packet of a known type has contents that cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class Packet:
+    """A complete packet received from the device.
+
+    Attributes:
+        client_slot: Client slot from the packet header
+        payload_length: Payload length from the packet header, which identifies its type
+        payload: Packet payload
+    """
+    client_slot: int
+    payload_length: int
+    payload: bytes
+
+
+@dataclass(frozen=True)
+class StatusReport:
+    """Result of a command; while pairing, the slot assigned to the new client."""
+    status: int
+
+
+@dataclass(frozen=True)
+class SlotsReport:
+    """Client slots in use on the device."""
+    slots: List[int]
+
+
+@dataclass(frozen=True)
+class DeviceSettingsReport:
+    """Device configuration."""
+    outlet_enabled: List[int]
+    default_preset_slot: int
+    controller_settings: List[int]
+
+
+@dataclass(frozen=True)
+class StateReport:
+    """Outlets, temperatures and timer, polled or after the controls were operated.
+
+    Polled reports carry no timer state, their timer_state is None.
+    """
+    timer_state: Optional[TimerState]
+    target_temp: float
+    actual_temp: float
+    outlet_1_on: bool
+    outlet_2_on: bool
+    remaining_seconds: int
+    controls_operated: bool
+
+
+@dataclass(frozen=True)
+class OutletSettingsReport:
+    """Outlet configuration."""
+    outlet_flag: int
+    min_duration_seconds: int
+    max_temperature: float
+    min_temperature: float
+
+
+@dataclass(frozen=True)
+class TechnicalInfoReport:
+    """Firmware versions of the device components."""
+    valve_sw_version: str
+    bt_sw_version: str
+    ui_sw_version: str
+
+
+@dataclass(frozen=True)
+class NicknameReport:
+    """Nickname of the device."""
+    nickname: str
+
+
+@dataclass(frozen=True)
+class ClientDetailsReport:
+    """Name of a paired client."""
+    client_name: str
+
+
+@dataclass(frozen=True)
+class PresetReport:
+    """Configuration of a preset."""
+    slot: int
+    target_temp: float
+    duration: int
+    outlet_flags: List[int]
+    name: str
+
+
+def _decode_status(payload: bytes) -> StatusReport:
+    return StatusReport(payload[0])
+
+
+def _decode_slots(payload: bytes) -> SlotsReport:
+    return SlotsReport(_bits_to_list(struct.unpack(">H", payload)[0], 16))
+
+
+def _decode_device_settings(payload: bytes) -> DeviceSettingsReport:
+    return DeviceSettingsReport(
+        outlet_enabled=_bits_to_list(payload[1], 8),
+        default_preset_slot=payload[2],
+        controller_settings=_bits_to_list(payload[3], 8),
+    )
+
+
+def _decode_device_state(payload: bytes) -> StateReport:
+    if len(payload) < 8:
+        raise DecodeError(f"Unexpected payload length for device state: {len(payload)}")
+    # payload[1] is the high byte of the target temperature, not a timer state
+    return StateReport(
+        timer_state=None,
+        target_temp=_convert_temperature_reverse(payload[1:3]),
+        actual_temp=_convert_temperature_reverse(payload[3:5]),
+        outlet_1_on=payload[5] == OUTLET_RUNNING,
+        outlet_2_on=payload[6] == OUTLET_RUNNING,
+        remaining_seconds=struct.unpack(">H", payload[7:9])[0],
+        controls_operated=False,
+    )
+
+
+def _decode_controls_operated_or_outlet_settings(payload: bytes) -> Any:
+    if payload[0] in (1, 0x80):
+        timer_state = TIMER_STATE_MAP.get(payload[1])
+        if timer_state is None:
+            raise DecodeError(f"Unknown timer state value: {payload[1]}")
+        return StateReport(
+            timer_state=timer_state,
+            target_temp=_convert_temperature_reverse(payload[2:4]),
+            actual_temp=_convert_temperature_reverse(payload[4:6]),
+            outlet_1_on=payload[6] == OUTLET_RUNNING,
+            outlet_2_on=payload[7] == OUTLET_RUNNING,
+            remaining_seconds=struct.unpack(">H", payload[8:10])[0],
+            controls_operated=True,
+        )
+    if payload[0] in (0, 0x4, 0x8):
+        return OutletSettingsReport(
+            outlet_flag=payload[0],
+            min_duration_seconds=payload[4],
+            max_temperature=_convert_temperature_reverse(payload[5:7]),
+            min_temperature=_convert_temperature_reverse(payload[7:9]),
+        )
+    raise DecodeError(f"Unknown control/outlet packet type: {payload[0]}")
+
+
+def _decode_technical_info_or_nickname(payload: bytes) -> Any:
+    if payload[0] == 0:
+        values = struct.unpack(">8H", payload)
+        return TechnicalInfoReport(
+            valve_sw_version=f"{values[0]}.{values[1]}",
+            bt_sw_version=f"{values[2]}.{values[3]}",
+            ui_sw_version=f"{values[6]}.{values[7]}",
+        )
+    return NicknameReport(bytes(payload).decode("UTF-8"))
+
+
+def _decode_client_details(payload: bytes) -> ClientDetailsReport:
+    return ClientDetailsReport(bytes(payload).decode("UTF-8"))
+
+
+def _decode_preset_details(payload: bytes) -> PresetReport:
+    return PresetReport(
+        slot=payload[0],
+        target_temp=_convert_temperature_reverse(payload[1:3]),
+        duration=payload[4],
+        outlet_flags=_bits_to_list(payload[5], 8),
+        name=bytes(payload[8:]).decode("UTF-8").rstrip("\0"),
+    )
+
+
+# Payload length of status packets, which report the result of a command
+STATUS_LENGTH = 1
+
+# Payload lengths of the packets answering each command opcode. A status
+# packet reporting a failure may answer any command.
+RESPONSE_LENGTHS: Dict[int, Tuple[int, ...]] = {
+    0x07: (10,),
+    0x10: (11,),
+    0x30: (24, 2),
+    0x32: (16,),
+    0x3e: (4,),
+    0x44: (16,),
+    0x6b: (20, 2),
+    0x87: (STATUS_LENGTH,),
+    0xb1: (STATUS_LENGTH,),
+    0xeb: (STATUS_LENGTH,),
+}
+
+# Decoders by payload length, which identifies the packet type
+DECODERS: Dict[int, Callable[[bytes], Any]] = {
+    1: _decode_status,
+    2: _decode_slots,
+    4: _decode_device_settings,
+    10: _decode_device_state,
+    11: _decode_controls_operated_or_outlet_settings,
+    16: _decode_technical_info_or_nickname,
+    20: _decode_client_details,
+    24: _decode_preset_details,
+}
+
+
+def decode_packet(packet: Packet) -> Optional[Any]:
+    """Decode a complete packet into a report event.
+
+    Args:
+        packet: Complete packet
+
+    Returns:
+        Report event, or None if the packet type is unknown
+
+    Raises:
+        DecodeError: If the contents of a known packet type cannot be decoded
+    """
+    decoder = DECODERS.get(packet.payload_length)
+    if decoder is None:
+        return None
+    try:
+        return decoder(packet.payload)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise DecodeError(str(e)) from e
+
+
+class MiraProtocol:
+    """Framing, signing and reassembly state for one client of a device.
+
+    Attributes:
+        client_id: Client ID used to sign commands
+        client_slot: Slot the client is paired in
+    """
+
+    def __init__(self, client_id: Optional[int] = None, client_slot: Optional[int] = None) -> None:
+        """Initialize the protocol.
+
+        Args:
+            client_id: Client ID used to sign commands
+            client_slot: Slot the client is paired in
+        """
+        self.client_id: Optional[int] = client_id
+        self.client_slot: Optional[int] = client_slot
+        self._partial_payload = bytearray()
+        self._reassembly_client_slot: Optional[int] = None
+        self._reassembly_payload_length: Optional[int] = None
+
+    @property
+    def reassembling(self) -> bool:
+        """Whether the next chunk continues a split packet."""
+        return self._reassembly_payload_length is not None
+
+    def reset(self) -> None:
+        """Drop any partially received packet, e.g. after the link was lost."""
+        self._partial_payload = bytearray()
+        self._reassembly_client_slot = None
+        self._reassembly_payload_length = None
+
+    def feed(self, data: bytes) -> Optional[Packet]:
+        """Consume a chunk received from the device.
+
+        Args:
+            data: Chunk received on the notify characteristic
+
+        Returns:
+            Packet: The packet completed by this chunk, or None while waiting for more
+
+        Raises:
+            FramingError: If the chunk is too short to start a packet
+            ReassemblyError: If the packet is longer than its declared length
+        """
+        if self.reassembling:
+            self._partial_payload.extend(data)
+            client_slot = self._reassembly_client_slot
+            payload_length = self._reassembly_payload_length
+            payload = bytes(self._partial_payload)
+        else:
+            if len(data) < HEADER_SIZE:
+                raise FramingError(f"Invalid packet length: {len(data)}")
+            client_slot = data[0] - 0x40
+            payload_length = data[2]
+            payload = bytes(data[HEADER_SIZE:])
+            if len(payload) < payload_length:
+                self._reassembly_client_slot = client_slot
+                self._reassembly_payload_length = payload_length
+                self._partial_payload = bytearray(payload)
+                return None
+
+        if len(payload) < payload_length:
+            # Still waiting for further chunks
+            return None
+        self.reset()
+        if len(payload) != payload_length:
+            raise ReassemblyError(f"Expected {payload_length} bytes, got {len(payload)}")
+        return Packet(client_slot, payload_length, payload)
+
+    def receive_data(self, data: bytes) -> List[Any]:
+        """Consume a chunk and decode the packet it completes.
+
+        Args:
+            data: Chunk received on the notify characteristic
+
+        Returns:
+            list: Report events, empty while waiting for more chunks or for
+            unknown packet types
+
+        Raises:
+            FramingError: If the chunk is too short to start a packet
+            ReassemblyError: If the packet is longer than its declared length
+            DecodeError: If the packet contents cannot be decoded
+        """
+        packet = self.feed(data)
+        if packet is None:
+            return []
+        event = decode_packet(packet)
+        return [event] if event is not None else []
+
+    def command(self, opcode: int, data: bytes = b"") -> bytes:
+        """Build a signed command frame.
+
+        Args:
+            opcode: Command opcode
+            data: Command data
+
+        Returns:
+            bytes: Frame to write
+        """
+        payload = bytearray([self.client_slot, opcode, len(data)]) + data
+        return _get_payload_with_crc(payload, self.client_id)
+
+    def pairing_request(self, new_client_id: int, client_name: str) -> bytes:
+        """Build the frame that registers a new client.
+
+        Args:
+            new_client_id: Client ID to register
+            client_name: Name to register the client under
+
+        Returns:
+            bytes: Frame to write, signed with the pairing key
+
+        Raises:
+            ValueError: If the client name is too long
+        """
+        client_name_bytes = client_name.encode("UTF-8")
+        if len(client_name_bytes) > MAX_CLIENT_NAME_LENGTH:
+            raise ValueError("The client name is too long")
+        client_name_bytes += bytes(MAX_CLIENT_NAME_LENGTH - len(client_name_bytes))
+        payload = bytearray([0, 0xEB, 24]) + struct.pack(">I", new_client_id) + client_name_bytes
+        return _get_payload_with_crc(payload, MAGIC_ID)
+
+    def client_details_request(self, client_slot: int) -> bytes:
+        """Request details about a specific client slot."""
+        return self.command(0x6b, bytes([0x10 + client_slot]))
+
+    def client_slots_request(self) -> bytes:
+        """Request the list of active client slots."""
+        return self.command(0x6b, bytes([0]))
+
+    def device_settings_request(self) -> bytes:
+        """Request the device settings."""
+        return self.command(0x3e)
+
+    def device_state_request(self) -> bytes:
+        """Request the current device state."""
+        return self.command(0x7)
+
+    def nickname_request(self) -> bytes:
+        """Request the device nickname."""
+        return self.command(0x44)
+
+    def outlet_settings_request(self) -> bytes:
+        """Request the outlet configuration."""
+        return self.command(0x10)
+
+    def preset_details_request(self, preset_slot: int) -> bytes:
+        """Request details about a specific preset."""
+        return self.command(0x30, bytes([0x40 + preset_slot]))
+
+    def preset_slots_request(self) -> bytes:
+        """Request the list of preset slots."""
+        return self.command(0x30, bytes([0x80]))
+
+    def technical_info_request(self) -> bytes:
+        """Request the technical device information."""
+        return self.command(0x32, bytes([1]))
+
+    def unpair_client_request(self, client_slot_to_unpair: int) -> bytes:
+        """Unpair a client from the device."""
+        return self.command(0xeb, bytes([client_slot_to_unpair]))
+
+    def control_outlets_request(self, outlet1: bool, outlet2: bool, temperature: float) -> bytes:
+        """Set the outlet states and target temperature.
+
+        Args:
+            outlet1: True to run outlet 1
+            outlet2: True to run outlet 2
+            temperature: Target temperature in Celsius
+
+        Returns:
+            bytes: Frame to write
+        """
+        return self.command(0x87, bytes([TIMER_RUNNING if outlet1 or outlet2 else TIMER_PAUSED])
+                            + _convert_temperature(temperature)
+                            + bytes([OUTLET_RUNNING if outlet1 else OUTLET_STOPPED,
+                                     OUTLET_RUNNING if outlet2 else OUTLET_STOPPED]))
+
+    def start_preset_request(self, preset_slot: int) -> bytes:
+        """Start a preset program."""
+        return self.command(0xb1, bytes([preset_slot]))
@@ -0,0 +1,234 @@
+"""Shower session detection for Mira devices.
+
+This module provides an incremental state machine that follows updates of
+the device data model and turns outlet and timer transitions into discrete
+shower sessions, each summarised as a compact record.
+"""
+
+import logging
+from dataclasses import astuple, dataclass, fields
+from typing import Callable, List, Optional
+
+from .data_model import SoakStationData, SoakStationMetadata, TimerState
+from .telemetry import DEFAULT_READY_BAND
+
+logger = logging.getLogger(__name__)
+
+# Seconds with all outlets off and the timer paused before a session ends
+DEFAULT_END_GRACE = 300.0
+
+
+@dataclass
+class SessionRecord:
+    """Summary of a single shower session.
+
+    Attributes:
+        start: Wall-clock start time as a UNIX timestamp
+        duration: Session length in seconds
+        outlet_1_seconds: Time outlet 1 was running in seconds
+        outlet_2_seconds: Time outlet 2 was running in seconds
+        time_to_target: Seconds from start until the target temperature was reached
+        initial_temp: Actual temperature at the start of the session
+        min_temp: Lowest actual temperature seen
+        avg_temp: Mean actual temperature over the session's samples
+        max_temp: Highest actual temperature seen
+        target_temp: Target temperature at the end of the session
+        preset: Name of the matching preset, if known
+    """
+    start: float
+    duration: float
+    outlet_1_seconds: float
+    outlet_2_seconds: float
+    time_to_target: Optional[float]
+    initial_temp: Optional[float]
+    min_temp: Optional[float]
+    avg_temp: Optional[float]
+    max_temp: Optional[float]
+    target_temp: Optional[float]
+    preset: Optional[str]
+
+    @classmethod
+    def field_names(cls) -> List[str]:
+        """Get the field order used by compact rows."""
+        return [f.name for f in fields(cls)]
+
+    def to_row(self) -> list:
+        """Convert to a compact row with floats rounded for storage."""
+        return [round(v, 1) if isinstance(v, float) else v for v in astuple(self)]
+
+    @classmethod
+    def from_row(cls, row: list) -> "SessionRecord":
+        """Build a record from a compact row."""
+        return cls(*row)
+
+
+class SessionTracker:
+    """Incremental state machine detecting shower sessions.
+
+    A session starts when either outlet turns on and ends once both outlets
+    are off and the timer is stopped, or has stayed paused for longer than
+    the end grace period. As no update arrives while the link is released,
+    the owner calls expire() once expires_at has passed, which also ends a
+    session that received no update for the end grace period. Statistics
+    are accumulated per update in O(1).
+
+    Attributes:
+        active: Whether a session is currently in progress
+    """
+
+    def __init__(
+        self,
+        on_session_end: Callable[[SessionRecord], None],
+        metadata: Optional[SoakStationMetadata] = None,
+        end_grace: float = DEFAULT_END_GRACE,
+        ready_band: float = DEFAULT_READY_BAND,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            on_session_end: Called with the record of each completed session
+            metadata: Device metadata used to identify the preset in use
+            end_grace: Seconds outlets may be off while paused before ending
+            ready_band: Temperature band around target counted as reached
+        """
+        self._on_session_end = on_session_end
+        self._metadata = metadata
+        self._end_grace = end_grace
+        self._ready_band = ready_band
+        self.active: bool = False
+        self._reset()
+
+    def _reset(self) -> None:
+        """Clear per-session accumulators."""
+        self._start_wall: float = 0.0
+        self._start: float = 0.0
+        self._last_update: float = 0.0
+        self._idle_since: Optional[float] = None
+        self._outlets_on: List[bool] = [False, False]
+        self._outlet_seconds: List[float] = [0.0, 0.0]
+        self._time_to_target: Optional[float] = None
+        self._initial_temp: Optional[float] = None
+        self._min_temp: Optional[float] = None
+        self._max_temp: Optional[float] = None
+        self._temp_sum: float = 0.0
+        self._temp_count: int = 0
+        self._target_temp: Optional[float] = None
+        self._outlets_used: List[bool] = [False, False]
+
+    def update(self, data: SoakStationData, now: float, wall_time: float) -> None:
+        """Feed the latest device state into the state machine.
+
+        Args:
+            data: Device data model after an update
+            now: Current monotonic time in seconds
+            wall_time: Current UNIX timestamp
+        """
+        outlets_on = [bool(data.outlet_1_on), bool(data.outlet_2_on)]
+        any_on = outlets_on[0] or outlets_on[1]
+
+        if not self.active:
+            if any_on:
+                self._start_session(data, now, wall_time)
+            else:
+                return
+
+        # Accumulate time for outlets that were running since the last update
+        elapsed = now - self._last_update
+        for i in range(2):
+            if self._outlets_on[i]:
+                self._outlet_seconds[i] += elapsed
+            self._outlets_used[i] |= outlets_on[i]
+        self._outlets_on = outlets_on
+        self._last_update = now
+
+        self._record_temperature(data, now)
+
+        if any_on:
+            self._idle_since = None
+            return
+
+        if self._idle_since is None:
+            self._idle_since = now
+        if data.timer_state is not TimerState.PAUSED or now - self._idle_since >= self._end_grace:
+            self._end_session(self._idle_since)
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Monotonic time the session ends at unless an update keeps it going, None if inactive."""
+        if not self.active:
+            return None
+        since = self._idle_since if self._idle_since is not None else self._last_update
+        return since + self._end_grace
+
+    def expire(self, now: float) -> None:
+        """End the session if the end grace period passed without outlets running or without updates.
+
+        Args:
+            now: Current monotonic time in seconds
+        """
+        expires_at = self.expires_at
+        if expires_at is not None and now >= expires_at:
+            self._end_session(expires_at - self._end_grace)
+
+    def close(self) -> None:
+        """End the session in progress, if any, at its last update."""
+        if self.active:
+            self._end_session(self._idle_since if self._idle_since is not None else self._last_update)
+
+    def _start_session(self, data: SoakStationData, now: float, wall_time: float) -> None:
+        """Begin a new session."""
+        logger.debug("Shower session started")
+        self._reset()
+        self.active = True
+        self._start_wall = wall_time
+        self._start = now
+        self._last_update = now
+        self._initial_temp = data.actual_temp
+
+    def _record_temperature(self, data: SoakStationData, now: float) -> None:
+        """Fold the latest temperatures into the session statistics."""
+        actual = data.actual_temp
+        if data.target_temp is not None:
+            self._target_temp = data.target_temp
+        if actual is None:
+            return
+        self._min_temp = actual if self._min_temp is None else min(self._min_temp, actual)
+        self._max_temp = actual if self._max_temp is None else max(self._max_temp, actual)
+        self._temp_sum += actual
+        self._temp_count += 1
+        if (
+            self._time_to_target is None
+            and self._target_temp is not None
+            and abs(self._target_temp - actual) <= self._ready_band
+        ):
+            self._time_to_target = now - self._start
+
+    def _end_session(self, end: float) -> None:
+        """Finish the current session and emit its record."""
+        record = SessionRecord(
+            start=self._start_wall,
+            duration=end - self._start,
+            outlet_1_seconds=self._outlet_seconds[0],
+            outlet_2_seconds=self._outlet_seconds[1],
+            time_to_target=self._time_to_target,
+            initial_temp=self._initial_temp,
+            min_temp=self._min_temp,
+            avg_temp=self._temp_sum / self._temp_count if self._temp_count else None,
+            max_temp=self._max_temp,
+            target_temp=self._target_temp,
+            preset=self._match_preset(),
+        )
+        logger.debug(f"Shower session ended: {record}")
+        self.active = False
+        self._reset()
+        self._on_session_end(record)
+
+    def _match_preset(self) -> Optional[str]:
+        """Find the preset matching the session's target and outlets, if any."""
+        if self._metadata is None or self._target_temp is None:
+            return None
+        used = [i for i in range(2) if self._outlets_used[i]]
+        for preset in self._metadata.presets.values():
+            if preset.target_temp == self._target_temp and list(preset.outlet_enabled) == used:
+                return preset.name
+        return None
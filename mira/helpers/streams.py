@@ -0,0 +1,178 @@
+"""Bounded fan-out of device updates to async consumers.
+
+A StreamHub hands every published item to each of its consumers without
+ever waiting for them, so it can be fed straight from the notification
+callback. Each consumer reads through its own Stream, an async iterator
+over a small buffer: when a slow consumer's buffer is full, the oldest
+item is dropped in favour of the newest, so consumers always catch up to
+the latest value instead of falling behind or holding up the link.
+
+A Stream detaches from its hub when it is closed, which happens when the
+consumer leaves an ``async with`` block, calls aclose(), or drops the
+iterator after breaking out of ``async for``. Closing the hub ends the
+iteration of every consumer.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Generic, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Items buffered per consumer unless asked otherwise
+DEFAULT_BUFFER = 1
+
+
+class _Buffer(Generic[T]):
+    """Items waiting for one consumer, held by the hub.
+
+    The hub only references buffers, never the streams reading them, so a
+    stream dropped by its consumer is freed and detaches right away.
+
+    Attributes:
+        items: Buffered items, oldest first
+        ready: Set when items are buffered or the buffer is closed
+        closed: Whether no further items are accepted
+        dropped: Items discarded because the buffer was full
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize an empty buffer holding up to maxsize items."""
+        self.items: Deque[T] = deque(maxlen=maxsize)
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.dropped: int = 0
+
+    def put(self, item: T) -> None:
+        """Buffer an item, dropping the oldest one if the buffer is full."""
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+        self.items.append(item)
+        self.ready.set()
+
+    def close(self) -> None:
+        """Accept no further items and wake the consumer."""
+        self.closed = True
+        self.ready.set()
+
+
+class Stream(Generic[T]):
+    """A consumer's view of a hub, iterated with ``async for``."""
+
+    def __init__(self, hub: "StreamHub[T]", buffer: _Buffer[T]) -> None:
+        """Initialize the stream.
+
+        Args:
+            hub: Hub the stream is attached to
+            buffer: Buffer the hub fills for this stream
+        """
+        self._hub = hub
+        self._buffer = buffer
+
+    @property
+    def dropped(self) -> int:
+        """Items discarded because the consumer fell behind."""
+        return self._buffer.dropped
+
+    def close(self) -> None:
+        """Detach from the hub and end the iteration once the buffer is drained."""
+        self._buffer.close()
+        self._hub.detach(self._buffer)
+
+    async def aclose(self) -> None:
+        """Close the stream, as for async generators."""
+        self.close()
+
+    def __aiter__(self) -> "Stream[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        buffer = self._buffer
+        while not buffer.items:
+            if buffer.closed:
+                raise StopAsyncIteration
+            buffer.ready.clear()
+            await buffer.ready.wait()
+        return buffer.items.popleft()
+
+    async def __aenter__(self) -> "Stream[T]":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # A consumer that breaks out of its loop and drops the stream
+        # must not keep receiving items
+        self.close()
+
+
+class StreamHub(Generic[T]):
+    """Publishes items to any number of streams without blocking the publisher.
+
+    Attributes:
+        published: Items published since creation
+    """
+
+    def __init__(self) -> None:
+        """Initialize a hub without consumers."""
+        self._buffers: List[_Buffer[T]] = []
+        self._closed = False
+        self._dropped_detached: int = 0
+        self.published: int = 0
+
+    def __bool__(self) -> bool:
+        """Whether any consumer is attached, so callers can skip building items."""
+        return bool(self._buffers)
+
+    def stream(self, maxsize: int = DEFAULT_BUFFER) -> Stream[T]:
+        """Attach a new consumer.
+
+        Args:
+            maxsize: Items buffered for the consumer before the oldest is dropped
+
+        Returns:
+            Stream: Async iterator over the items published from now on
+
+        Raises:
+            ValueError: If maxsize is less than 1
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        buffer: _Buffer[T] = _Buffer(maxsize)
+        if self._closed:
+            buffer.close()
+        else:
+            self._buffers.append(buffer)
+        return Stream(self, buffer)
+
+    def publish(self, item: T) -> None:
+        """Hand an item to every consumer."""
+        self.published += 1
+        for buffer in self._buffers:
+            buffer.put(item)
+
+    def detach(self, buffer: _Buffer[T]) -> None:
+        """Stop filling the buffer of a closed stream."""
+        if buffer in self._buffers:
+            self._buffers.remove(buffer)
+            self._dropped_detached += buffer.dropped
+
+    def close(self) -> None:
+        """End the iteration of every consumer and refuse new ones."""
+        self._closed = True
+        for buffer in self._buffers:
+            buffer.close()
+            self._dropped_detached += buffer.dropped
+        self._buffers = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the consumers and how many items they dropped."""
+        return {
+            "consumers": len(self._buffers),
+            "published": self.published,
+            "dropped": self._dropped_detached + sum(buffer.dropped for buffer in self._buffers),
+        }
@@ -0,0 +1,202 @@
+"""Rolling temperature telemetry for Mira devices.
+
+This module provides a fixed-size ring buffer of recent temperature samples
+from which the heat-up rate and an estimated time to reach the target
+temperature are derived incrementally as each sample arrives.
+"""
+
+import logging
+from array import array
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of samples kept per device
+DEFAULT_CAPACITY = 32
+
+# Seconds of samples the heat-up rate is fitted over
+DEFAULT_WINDOW = 90.0
+
+# Actual temperature within this many degrees of target counts as "ready"
+DEFAULT_READY_BAND = 1.0
+
+
+class TemperatureTelemetry:
+    """Ring buffer of (timestamp, actual_temp, target_temp) samples.
+
+    Samples are stored in preallocated arrays, so recording a sample never
+    grows memory. Samples leave the buffer once it is full or once they are
+    older than the window, so the buffer only spans the recent past even
+    when frames are sparse. The heat-up rate is the least-squares slope of
+    actual temperature over time across the buffer, maintained with running
+    sums that are adjusted as samples enter and leave it, so each sample
+    costs O(1) amortised.
+
+    Timestamps are stored relative to an anchor to keep the running sums
+    numerically stable; the sums are rebuilt against a fresh anchor once per
+    full cycle of the buffer, which is still O(1) amortised per sample.
+
+    Attributes:
+        capacity: Maximum number of samples retained
+        window: Maximum age of retained samples in seconds
+        ready_band: Temperature band around the target considered "ready"
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, window: float = DEFAULT_WINDOW,
+                 ready_band: float = DEFAULT_READY_BAND) -> None:
+        """Initialize the telemetry buffer.
+
+        Args:
+            capacity: Maximum number of samples retained
+            window: Maximum age of retained samples in seconds
+            ready_band: Temperature band around the target considered "ready"
+        """
+        if capacity < 2:
+            raise ValueError("Capacity must be at least 2")
+        self.capacity: int = capacity
+        self.window: float = window
+        self.ready_band: float = ready_band
+
+        self._timestamps: array = array("d", bytes(8 * capacity))
+        self._actual: array = array("d", bytes(8 * capacity))
+        self._target: array = array("d", bytes(8 * capacity))
+        self._head: int = 0
+        self._count: int = 0
+        self._since_anchor: int = 0
+
+        # Running sums for the least-squares slope, relative to _anchor
+        self._anchor: float = 0.0
+        self._sum_t: float = 0.0
+        self._sum_y: float = 0.0
+        self._sum_tt: float = 0.0
+        self._sum_ty: float = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._head = 0
+        self._count = 0
+        self._since_anchor = 0
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+
+    def add_sample(self, timestamp: float, actual_temp: float, target_temp: Optional[float]) -> None:
+        """Record a temperature sample.
+
+        Args:
+            timestamp: Monotonic time of the sample in seconds
+            actual_temp: Measured water temperature in Celsius
+            target_temp: Requested water temperature in Celsius, if known
+        """
+        # Evict samples that left the window, and the oldest one if the buffer
+        # is full, as it lives in the slot about to be overwritten
+        while self._count and (self._count == self.capacity
+                               or self._timestamps[(self._head - self._count) % self.capacity]
+                               < timestamp - self.window):
+            self._evict_oldest()
+
+        if self._count == 0:
+            self._anchor = timestamp
+            self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        self._count += 1
+
+        self._timestamps[self._head] = timestamp
+        self._actual[self._head] = actual_temp
+        self._target[self._head] = target_temp if target_temp is not None else float("nan")
+        self._head = (self._head + 1) % self.capacity
+
+        t = timestamp - self._anchor
+        self._sum_t += t
+        self._sum_y += actual_temp
+        self._sum_tt += t * t
+        self._sum_ty += t * actual_temp
+
+        self._since_anchor += 1
+        if self._since_anchor >= self.capacity:
+            self._rebuild_sums()
+
+    def _evict_oldest(self) -> None:
+        """Remove the oldest sample from the running sums."""
+        oldest = (self._head - self._count) % self.capacity
+        t_old = self._timestamps[oldest] - self._anchor
+        y_old = self._actual[oldest]
+        self._sum_t -= t_old
+        self._sum_y -= y_old
+        self._sum_tt -= t_old * t_old
+        self._sum_ty -= t_old * y_old
+        self._count -= 1
+
+    def _rebuild_sums(self) -> None:
+        """Recompute the running sums against the oldest retained sample."""
+        oldest = (self._head - self._count) % self.capacity
+        self._anchor = self._timestamps[oldest]
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        for i in range(self._count):
+            idx = (oldest + i) % self.capacity
+            t = self._timestamps[idx] - self._anchor
+            y = self._actual[idx]
+            self._sum_t += t
+            self._sum_y += y
+            self._sum_tt += t * t
+            self._sum_ty += t * y
+        self._since_anchor = 0
+
+    def latest(self) -> Optional[Tuple[float, float, Optional[float]]]:
+        """Get the most recent sample.
+
+        Returns:
+            tuple: (timestamp, actual_temp, target_temp) or None if empty
+        """
+        if self._count == 0:
+            return None
+        idx = (self._head - 1) % self.capacity
+        target = self._target[idx]
+        return self._timestamps[idx], self._actual[idx], None if target != target else target
+
+    @property
+    def heat_up_rate(self) -> Optional[float]:
+        """Rate of change of actual temperature in °C/s over the buffered window.
+
+        Returns:
+            float: Least-squares slope, or None if fewer than two distinct timestamps
+        """
+        n = self._count
+        if n < 2:
+            return None
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 1e-9:
+            return None
+        return (n * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+    @property
+    def is_ready(self) -> Optional[bool]:
+        """Whether the latest actual temperature is within the band of the target.
+
+        Returns:
+            bool: True if ready, or None if no sample with a target is available
+        """
+        sample = self.latest()
+        if sample is None or sample[2] is None:
+            return None
+        return abs(sample[2] - sample[1]) <= self.ready_band
+
+    @property
+    def seconds_to_target(self) -> Optional[float]:
+        """Estimated seconds until the actual temperature reaches the target.
+
+        Returns:
+            float: 0 if already ready, the extrapolated time if the temperature
+            is moving towards the target, otherwise None
+        """
+        sample = self.latest()
+        if sample is None or sample[2] is None:
+            return None
+        _, actual, target = sample
+        if abs(target - actual) <= self.ready_band:
+            return 0.0
+        rate = self.heat_up_rate
+        if rate is None or rate == 0:
+            return None
+        seconds = (target - actual) / rate
+        return seconds if seconds > 0 else None
@@ -0,0 +1,473 @@
+"""Long-term columnar telemetry store for Mira devices.
+
+Every decoded state report is appended to a per-device file of fixed-width
+columns, memory-mapped so appends are plain memory writes and queries run
+as NumPy operations over contiguous columns without loading the history
+into Python objects. Each tier is a ring buffer of fixed capacity, so the
+files never grow:
+
+- raw: one row per state report
+- 1min: per-minute aggregates, rolled up from raw rows when a minute ends
+- 1h: per-hour aggregates, rolled up from minute rows when an hour ends
+
+Queries over a span the raw tier still covers use raw rows, longer spans
+fall back to the minute tier.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .protocol import StateReport, TimerState
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"MSTC"
+FILE_VERSION = 1
+
+# Header: magic, version, capacity, rows written
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u4"), ("capacity", "<u8"), ("written", "<u8")])
+
+# Columns of the raw tier
+RAW_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("time", "<f8"),
+    ("target", "<f4"),
+    ("actual", "<f4"),
+    ("outlets", "u1"),
+    ("timer", "u1"),
+    ("remaining", "<u2"),
+)
+
+# Columns of the aggregate tiers
+AGGREGATE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("time", "<f8"),
+    ("samples", "<u4"),
+    ("target_mean", "<f4"),
+    ("actual_mean", "<f4"),
+    ("actual_min", "<f4"),
+    ("actual_max", "<f4"),
+    ("outlet_1_seconds", "<f4"),
+    ("outlet_2_seconds", "<f4"),
+)
+
+# Timer states as stored in the timer column, polled reports carry none
+TIMER_CODES = {TimerState.STOPPED: 0, TimerState.PAUSED: 1, TimerState.RUNNING: 2, None: 255}
+
+# Tier names and bin widths in seconds
+TIER_RAW = "raw"
+TIER_MINUTE = "1min"
+TIER_HOUR = "1h"
+MINUTE = 60
+HOUR = 3600
+
+# Default rows per tier: about 4 months of 20 second polls, 6 months of
+# minutes and 10 years of hours, some 30 MB in total
+DEFAULT_CAPACITIES = {TIER_RAW: 500_000, TIER_MINUTE: 262_800, TIER_HOUR: 87_600}
+
+# Longest gap between two reports still counted as outlet runtime
+MAX_GAP = 60.0
+
+# Rows read back from the end of a tier to aggregate the bin that ended
+MAX_ROWS_PER_BIN = 4096
+
+
+class ColumnFile:
+    """Fixed-capacity ring buffer of fixed-width columns in a memory-mapped file.
+
+    The file holds a header followed by one contiguous block per column, so
+    each column can be read without touching the others.
+
+    Attributes:
+        path: Path of the file
+        capacity: Maximum number of rows kept
+        columns: Memory-mapped column arrays in storage order
+    """
+
+    def __init__(self, path: str, columns: Sequence[Tuple[str, str]], capacity: int) -> None:
+        """Open the file, creating or recreating it if its layout differs.
+
+        Args:
+            path: Path of the file
+            columns: Column names and NumPy type strings
+            capacity: Maximum number of rows kept
+        """
+        self.path = path
+        self.capacity = capacity
+        dtypes = [(name, np.dtype(type_string)) for name, type_string in columns]
+        size = HEADER_DTYPE.itemsize + capacity * sum(dtype.itemsize for _, dtype in dtypes)
+
+        if os.path.exists(path) and os.path.getsize(path) != size:
+            logger.warning(f"Discarding {path} with a different layout")
+            os.remove(path)
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.truncate(size)
+
+        self._map = np.memmap(path, dtype=np.uint8, mode="r+", shape=(size,))
+        self._header = self._map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+        if self._header["magic"][0] != FILE_MAGIC:
+            self._header["magic"] = FILE_MAGIC
+            self._header["version"] = FILE_VERSION
+            self._header["capacity"] = capacity
+            self._header["written"] = 0
+
+        self.columns: Dict[str, np.ndarray] = {}
+        offset = HEADER_DTYPE.itemsize
+        for name, dtype in dtypes:
+            end = offset + capacity * dtype.itemsize
+            self.columns[name] = self._map[offset:end].view(dtype)
+            offset = end
+
+    @property
+    def written(self) -> int:
+        """Total number of rows ever appended."""
+        return int(self._header["written"][0])
+
+    def __len__(self) -> int:
+        """Number of rows currently kept."""
+        return min(self.written, self.capacity)
+
+    def append(self, values: Dict[str, Any]) -> None:
+        """Append a row, overwriting the oldest one when full.
+
+        Args:
+            values: Value per column
+        """
+        written = self.written
+        index = written % self.capacity
+        for name, column in self.columns.items():
+            column[index] = values[name]
+        self._header["written"] = written + 1
+
+    def last(self, name: str) -> Optional[Any]:
+        """Get the most recent value of a column, if any."""
+        written = self.written
+        return self.columns[name][(written - 1) % self.capacity] if written else None
+
+    def tail(self, rows: int) -> Dict[str, np.ndarray]:
+        """Get up to the last rows, oldest first, as column copies."""
+        rows = min(rows, len(self))
+        end = self.written % self.capacity
+        start = end - rows
+        if start >= 0:
+            return {name: column[start:end].copy() for name, column in self.columns.items()}
+        return {name: np.concatenate((column[start:], column[:end])) for name, column in self.columns.items()}
+
+    def between(self, start: float, end: float, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Get the rows with a time in [start, end), oldest first.
+
+        Args:
+            start: UNIX timestamp of the first row to include
+            end: UNIX timestamp after the last row to include
+            names: Columns to read, all by default
+
+        Returns:
+            dict: Column arrays of the matching rows
+        """
+        # Once wrapped, the rows after the write position are the older ones
+        split = self.written % self.capacity
+        segments = [slice(split, self.capacity), slice(0, split)] if self.written >= self.capacity \
+            else [slice(0, split)]
+        masks = []
+        for segment in segments:
+            times = self.columns["time"][segment]
+            masks.append((times >= start) & (times < end))
+        return {
+            name: np.concatenate([self.columns[name][segment][mask] for segment, mask in zip(segments, masks)])
+            for name in (names or self.columns)
+        }
+
+    def flush(self) -> None:
+        """Write changed pages to disk."""
+        self._map.flush()
+
+    def close(self) -> None:
+        """Flush and release the memory map."""
+        self.flush()
+        # The mapping is released once no view of it is left
+        self.columns = {}
+        self._header = None
+        self._map = None
+
+
+def aggregate_raw(rows: Dict[str, np.ndarray], bin_start: float, bin_seconds: float) -> Dict[str, Any]:
+    """Aggregate the raw rows of one bin.
+
+    Each row's outlets count as running until the next row, the end of the
+    bin or MAX_GAP, whichever comes first.
+
+    Args:
+        rows: Raw column arrays of the bin, oldest first
+        bin_start: UNIX timestamp the bin starts at
+        bin_seconds: Width of the bin
+
+    Returns:
+        dict: Aggregate row
+    """
+    times = rows["time"]
+    durations = np.minimum(np.diff(times, append=bin_start + bin_seconds), MAX_GAP).clip(min=0)
+    outlets = rows["outlets"]
+    actual = rows["actual"]
+    return {
+        "time": bin_start,
+        "samples": len(times),
+        "target_mean": float(rows["target"].mean()),
+        "actual_mean": float(actual.mean()),
+        "actual_min": float(actual.min()),
+        "actual_max": float(actual.max()),
+        "outlet_1_seconds": float(durations[(outlets & 1) != 0].sum()),
+        "outlet_2_seconds": float(durations[(outlets & 2) != 0].sum()),
+    }
+
+
+def aggregate_bins(rows: Dict[str, np.ndarray], bin_start: float) -> Dict[str, Any]:
+    """Combine aggregate rows into one coarser bin.
+
+    Args:
+        rows: Aggregate column arrays, oldest first
+        bin_start: UNIX timestamp the coarser bin starts at
+
+    Returns:
+        dict: Aggregate row
+    """
+    samples = rows["samples"].astype(np.float64)
+    total = samples.sum()
+    return {
+        "time": bin_start,
+        "samples": int(total),
+        "target_mean": float((rows["target_mean"] * samples).sum() / total),
+        "actual_mean": float((rows["actual_mean"] * samples).sum() / total),
+        "actual_min": float(rows["actual_min"].min()),
+        "actual_max": float(rows["actual_max"].max()),
+        "outlet_1_seconds": float(rows["outlet_1_seconds"].sum()),
+        "outlet_2_seconds": float(rows["outlet_2_seconds"].sum()),
+    }
+
+
+def run_start_times(times: np.ndarray, started: np.ndarray) -> np.ndarray:
+    """Get the start time of the run each row belongs to.
+
+    Args:
+        times: Row timestamps, oldest first
+        started: Whether each row starts a run
+
+    Returns:
+        np.ndarray: Time of the latest start at or before each row, -inf
+        for rows before the first start
+    """
+    return np.maximum.accumulate(np.where(started, times, -np.inf)) if len(times) else times
+
+
+class TelemetryStore:
+    """Tiered columnar history of one device's state reports.
+
+    Attributes:
+        tiers: Column files by tier name
+    """
+
+    def __init__(self, directory: str, name: str, capacities: Optional[Dict[str, int]] = None) -> None:
+        """Open or create the device's tier files.
+
+        This does blocking file I/O and should run in an executor.
+
+        Args:
+            directory: Directory holding the files, created if missing
+            name: File name prefix for the device
+            capacities: Rows per tier, defaults to DEFAULT_CAPACITIES
+        """
+        capacities = {**DEFAULT_CAPACITIES, **(capacities or {})}
+        os.makedirs(directory, exist_ok=True)
+        self.tiers: Dict[str, ColumnFile] = {
+            TIER_RAW: ColumnFile(os.path.join(directory, f"{name}.raw.col"), RAW_COLUMNS, capacities[TIER_RAW]),
+            TIER_MINUTE: ColumnFile(os.path.join(directory, f"{name}.1min.col"), AGGREGATE_COLUMNS,
+                                    capacities[TIER_MINUTE]),
+            TIER_HOUR: ColumnFile(os.path.join(directory, f"{name}.1h.col"), AGGREGATE_COLUMNS,
+                                  capacities[TIER_HOUR]),
+        }
+        # Bins still receiving rows; after a restart they continue from the
+        # newest row of the finer tier
+        last_raw = self.tiers[TIER_RAW].last("time")
+        last_minute = self.tiers[TIER_MINUTE].last("time")
+        self._open_minute: Optional[int] = int(last_raw // MINUTE) if last_raw is not None else None
+        self._open_hour: Optional[int] = int(last_minute // HOUR) if last_minute is not None else None
+
+    def append(self, report: StateReport, timestamp: float) -> None:
+        """Append a state report and roll up any bins it closes.
+
+        Args:
+            report: Decoded state report
+            timestamp: UNIX timestamp the report was received at
+        """
+        minute = int(timestamp // MINUTE)
+        if self._open_minute is not None and minute > self._open_minute:
+            self._close_minute(self._open_minute)
+        self._open_minute = minute
+        self.tiers[TIER_RAW].append({
+            "time": timestamp,
+            "target": report.target_temp,
+            "actual": report.actual_temp,
+            "outlets": int(report.outlet_1_on) | int(report.outlet_2_on) << 1,
+            "timer": TIMER_CODES[report.timer_state],
+            "remaining": report.remaining_seconds,
+        })
+
+    def _close_minute(self, minute: int) -> None:
+        """Roll the raw rows of a minute up into the minute tier."""
+        start = minute * MINUTE
+        rows = self.tiers[TIER_RAW].tail(MAX_ROWS_PER_BIN)
+        mask = (rows["time"] >= start) & (rows["time"] < start + MINUTE)
+        if not mask.any():
+            return
+        row = aggregate_raw({name: column[mask] for name, column in rows.items()}, start, MINUTE)
+
+        hour = int(start // HOUR)
+        if self._open_hour is not None and hour > self._open_hour:
+            self._close_hour(self._open_hour)
+        self._open_hour = hour
+        self.tiers[TIER_MINUTE].append(row)
+
+    def _close_hour(self, hour: int) -> None:
+        """Roll the minute rows of an hour up into the hour tier."""
+        start = hour * HOUR
+        rows = self.tiers[TIER_MINUTE].tail(HOUR // MINUTE)
+        mask = (rows["time"] >= start) & (rows["time"] < start + HOUR)
+        if mask.any():
+            self.tiers[TIER_HOUR].append(aggregate_bins({name: column[mask] for name, column in rows.items()}, start))
+
+    def covers_raw(self, start: float) -> bool:
+        """Whether the raw tier still holds rows from the given time on."""
+        raw = self.tiers[TIER_RAW]
+        if raw.written <= raw.capacity:
+            return True
+        oldest = raw.columns["time"][raw.written % raw.capacity]
+        return oldest <= start
+
+    def flush(self) -> None:
+        """Write changed pages of all tiers to disk."""
+        for tier in self.tiers.values():
+            tier.flush()
+
+    def close(self) -> None:
+        """Flush and release all tiers."""
+        for tier in self.tiers.values():
+            tier.close()
+
+    def sizes(self) -> Dict[str, Dict[str, int]]:
+        """Get the rows kept and capacity of each tier."""
+        return {name: {"rows": len(tier), "capacity": tier.capacity} for name, tier in self.tiers.items()}
+
+    # Queries
+
+    def percentiles(self, start: float, end: float,
+                    quantiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[str, Any]:
+        """Percentiles of the actual temperature while an outlet was running.
+
+        Args:
+            start: UNIX timestamp the span starts at
+            end: UNIX timestamp the span ends at
+            quantiles: Percentiles to compute
+
+        Returns:
+            dict: Tier used, number of samples and temperature per percentile
+        """
+        if self.covers_raw(start):
+            tier = TIER_RAW
+            rows = self.tiers[TIER_RAW].between(start, end, ("actual", "outlets"))
+            values = rows["actual"][rows["outlets"] != 0]
+        else:
+            tier = TIER_MINUTE
+            rows = self.tiers[TIER_MINUTE].between(start, end, ("actual_mean", "outlet_1_seconds",
+                                                                "outlet_2_seconds"))
+            values = rows["actual_mean"][(rows["outlet_1_seconds"] + rows["outlet_2_seconds"]) > 0]
+        result = np.percentile(values, quantiles).round(2).tolist() if len(values) else [None] * len(quantiles)
+        return {"tier": tier, "samples": int(len(values)),
+                "percentiles": {f"p{q:g}": value for q, value in zip(quantiles, result)}}
+
+    def heat_up_curve(self, start: float, end: float, horizon: float = 300.0,
+                      step: float = 10.0) -> Dict[str, Any]:
+        """Mean actual temperature against time since an outlet started.
+
+        Args:
+            start: UNIX timestamp the span starts at
+            end: UNIX timestamp the span ends at
+            horizon: Seconds after each start to include
+            step: Width of the time bins in seconds
+
+        Returns:
+            dict: Number of starts, bin start offsets and mean temperature
+            per bin, None where no sample fell into a bin
+        """
+        rows = self.tiers[TIER_RAW].between(start, end, ("time", "actual", "outlets"))
+        times, running = rows["time"], rows["outlets"] != 0
+        # A run already going at the start of the span has no known start
+        started = np.r_[False, running[1:] & ~running[:-1]] if len(times) else running
+        offsets = times - run_start_times(times, started)
+        keep = running & (offsets < horizon)
+        bins = int(horizon // step)
+        indices = (offsets[keep] // step).astype(np.int64)
+        sums = np.bincount(indices, weights=rows["actual"][keep], minlength=bins)
+        counts = np.bincount(indices, minlength=bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan).round(2)
+        return {
+            "starts": int(started.sum()),
+            "seconds": (np.arange(bins) * step).tolist(),
+            "actual": [None if np.isnan(value) else float(value) for value in means],
+        }
+
+    def runtime_per_day(self, start: float, end: float, utc_offset: float = 0.0) -> Dict[str, Any]:
+        """Outlet runtime in minutes per local day.
+
+        Args:
+            start: UNIX timestamp the span starts at
+            end: UNIX timestamp the span ends at
+            utc_offset: Seconds local time is ahead of UTC
+
+        Returns:
+            dict: Runtime of outlet 1 and 2 in minutes per ISO date
+        """
+        rows = self.tiers[TIER_MINUTE].between(start, end, ("time", "outlet_1_seconds", "outlet_2_seconds"))
+        if not len(rows["time"]):
+            return {"days": {}}
+        days = ((rows["time"] + utc_offset) // 86400).astype(np.int64)
+        first = days.min()
+        outlet_1 = np.bincount(days - first, weights=rows["outlet_1_seconds"]) / 60
+        outlet_2 = np.bincount(days - first, weights=rows["outlet_2_seconds"]) / 60
+        dates = np.datetime64("1970-01-01") + np.arange(first, first + len(outlet_1)).astype("timedelta64[D]")
+        return {"days": {
+            str(date): {"outlet_1_minutes": round(float(o1), 1), "outlet_2_minutes": round(float(o2), 1)}
+            for date, o1, o2 in zip(dates, outlet_1, outlet_2)
+            if o1 or o2
+        }}
+
+    def stability(self, start: float, end: float, settle: float = 60.0, band: float = 1.0) -> Dict[str, Any]:
+        """How closely the actual temperature held the target while running.
+
+        Samples from the first seconds after each outlet start are excluded,
+        as the water is still heating up.
+
+        Args:
+            start: UNIX timestamp the span starts at
+            end: UNIX timestamp the span ends at
+            settle: Seconds after an outlet start to exclude
+            band: Deviation in Celsius counted as on target
+
+        Returns:
+            dict: Number of samples, mean absolute and standard deviation
+            from the target, and fraction of samples within the band
+        """
+        rows = self.tiers[TIER_RAW].between(start, end, ("time", "target", "actual", "outlets"))
+        times, running = rows["time"], rows["outlets"] != 0
+        started = np.r_[running[:1], running[1:] & ~running[:-1]] if len(times) else running
+        settled = running & (times - run_start_times(times, started) >= settle)
+        error = (rows["actual"] - rows["target"])[settled]
+        if not len(error):
+            return {"samples": 0, "mean_abs_error": None, "std": None, "within_band": None}
+        return {
+            "samples": int(len(error)),
+            "mean_abs_error": round(float(np.abs(error).mean()), 3),
+            "std": round(float(error.std()), 3),
+            "within_band": round(float((np.abs(error) <= band).mean()), 3),
+        }
@@ -0,0 +1,70 @@
+"""Filtered entity state writes that never lose the latest value."""
+
+import time
+from typing import Any, Callable, Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .write_filter import StateWriteFilter
+
+
+class TrailingWrite:
+    """Mixin writing an entity's state through its write filter.
+
+    Entities keep the written value in _state and their filter in
+    _write_filter, and pass every new value to _write_filtered. When the
+    filter suppresses a value, a timer writes it once the filter allows,
+    so the state does not stay on an outdated value when no further
+    change arrives. Entities call _track_trailing_write from
+    async_added_to_hass so the timer is cancelled on removal.
+    """
+
+    _state: Any = None
+    _write_filter: StateWriteFilter
+    _cancel_trailing_write: Optional[Callable[[], None]] = None
+
+    def _track_trailing_write(self) -> None:
+        """Cancel a scheduled trailing write when the entity is removed."""
+        self.async_on_remove(self._unschedule_trailing_write)
+
+    def _write_filtered(self, value: Any, force: bool = False) -> None:
+        """Write a value if the filter lets it through, otherwise schedule it.
+
+        Args:
+            value: The new value
+            force: Write the value regardless of the filter, for transitions
+        """
+        if value == self._state:
+            self._write_filter.clear_pending()
+            return
+        now = time.monotonic()
+        if self._write_filter.should_write(value, now, force):
+            self._state = value
+            self.async_write_ha_state()
+        else:
+            self._schedule_trailing_write(now)
+
+    def _schedule_trailing_write(self, now: float) -> None:
+        """Come back when the suppressed value is due, unless already scheduled."""
+        delay = self._write_filter.trailing_delay(now)
+        if delay is None or self._cancel_trailing_write is not None:
+            return
+        self._cancel_trailing_write = async_call_later(self.hass, delay, self._handle_trailing_write)
+
+    def _unschedule_trailing_write(self) -> None:
+        """Cancel the scheduled trailing write, if any."""
+        if self._cancel_trailing_write is not None:
+            self._cancel_trailing_write()
+            self._cancel_trailing_write = None
+
+    @callback
+    def _handle_trailing_write(self, _now) -> None:
+        """Write the suppressed value if it is due, otherwise wait until it is."""
+        self._cancel_trailing_write = None
+        now = time.monotonic()
+        if self._write_filter.write_trailing(now):
+            self._state = self._write_filter.last_value
+            self.async_write_ha_state()
+        else:
+            self._schedule_trailing_write(now)
@@ -0,0 +1,141 @@
+"""Weekly usage pattern of Mira devices.
+
+This module learns when a device is typically used from the times its
+outlets are turned on. Starts are counted in fixed bins over the week, by
+weekday and time of day, with exponential decay so the pattern follows
+changing routines.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Width of a time-of-day bin in minutes
+BIN_MINUTES = 15
+
+BINS_PER_DAY = 24 * 60 // BIN_MINUTES
+BINS_PER_WEEK = 7 * BINS_PER_DAY
+
+SECONDS_PER_WEEK = 7 * 24 * 3600.0
+
+# Seconds after which a start has half its original weight
+DEFAULT_HALF_LIFE = 4 * SECONDS_PER_WEEK
+
+# Fraction of weeks a bin must be used in to count as likely
+DEFAULT_THRESHOLD = 0.4
+
+
+class UsagePattern:
+    """Decaying histogram of outlet starts by weekday and time of day.
+
+    The weights are decayed lazily: all bins share a reference time, and are
+    only rescaled when a start is recorded. A bin used once every week
+    settles at the weight of a weekly start, so weights are reported as the
+    fraction of weeks a bin is used in.
+
+    Attributes:
+        half_life: Seconds after which a start has half its original weight
+        threshold: Fraction of weeks a bin must be used in to count as likely
+        starts: Number of starts recorded
+    """
+
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE, threshold: float = DEFAULT_THRESHOLD) -> None:
+        """Initialize an empty pattern.
+
+        Args:
+            half_life: Seconds after which a start has half its original weight
+            threshold: Fraction of weeks a bin must be used in to count as likely
+        """
+        self.half_life: float = half_life
+        self.threshold: float = threshold
+        self.starts: int = 0
+        self._weights = array("d", bytes(8 * BINS_PER_WEEK))
+        self._decayed_at: Optional[float] = None
+        # Weight a bin settles at when used exactly once a week
+        self._weekly_weight: float = 1 / (1 - 0.5 ** (SECONDS_PER_WEEK / half_life))
+
+    @staticmethod
+    def bin_index(weekday: int, minute_of_day: int) -> int:
+        """Get the bin of a weekday and time of day.
+
+        Args:
+            weekday: Day of the week, Monday is 0
+            minute_of_day: Minutes since midnight
+
+        Returns:
+            int: Index of the bin
+        """
+        return weekday * BINS_PER_DAY + minute_of_day // BIN_MINUTES
+
+    def _decay(self, timestamp: float) -> float:
+        """Get the factor weights decayed by since the reference time."""
+        if self._decayed_at is None:
+            return 1.0
+        return 0.5 ** (max(0.0, timestamp - self._decayed_at) / self.half_life)
+
+    def record(self, weekday: int, minute_of_day: int, timestamp: float) -> None:
+        """Record an outlet start.
+
+        Args:
+            weekday: Local day of the week of the start, Monday is 0
+            minute_of_day: Local minutes since midnight of the start
+            timestamp: UNIX timestamp of the start
+        """
+        factor = self._decay(timestamp)
+        if factor != 1.0:
+            weights = self._weights
+            for index in range(BINS_PER_WEEK):
+                weights[index] *= factor
+        self._decayed_at = timestamp
+        self._weights[self.bin_index(weekday, minute_of_day)] += 1.0
+        self.starts += 1
+
+    def likelihood(self, weekday: int, minute_of_day: int, timestamp: float) -> float:
+        """Get the fraction of weeks a bin is used in.
+
+        Args:
+            weekday: Local day of the week, Monday is 0
+            minute_of_day: Local minutes since midnight
+            timestamp: Current UNIX timestamp
+
+        Returns:
+            float: Decayed weight of the bin relative to a weekly start
+        """
+        weight = self._weights[self.bin_index(weekday, minute_of_day)]
+        return weight * self._decay(timestamp) / self._weekly_weight
+
+    def is_likely(self, weekday: int, minute_of_day: int, timestamp: float) -> bool:
+        """Whether the device is likely to be used in a bin.
+
+        Args:
+            weekday: Local day of the week, Monday is 0
+            minute_of_day: Local minutes since midnight
+            timestamp: Current UNIX timestamp
+
+        Returns:
+            bool: True if the bin's likelihood reaches the threshold
+        """
+        return self.likelihood(weekday, minute_of_day, timestamp) >= self.threshold
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the pattern state for persistence and diagnostics."""
+        return {
+            "starts": self.starts,
+            "decayed_at": self._decayed_at,
+            "weights": [round(weight, 4) for weight in self._weights],
+        }
+
+    def load(self, stored: Dict[str, Any]) -> None:
+        """Restore a pattern saved with as_dict.
+
+        Args:
+            stored: Saved pattern state
+        """
+        if len(stored["weights"]) != BINS_PER_WEEK:
+            logger.debug("Ignoring stored usage pattern with a different bin width")
+            return
+        self.starts = stored["starts"]
+        self._decayed_at = stored["decayed_at"]
+        self._weights = array("d", stored["weights"])
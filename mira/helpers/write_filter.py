@@ -0,0 +1,180 @@
+"""Significant-change filters for entity state writes.
+
+Entities consult a filter before writing a changed value to Home Assistant,
+so that jitter and high-frequency ticks do not each produce a state change
+in the state machine and recorder. Every filter counts the writes it lets
+through and the ones it suppresses.
+
+A suppressed value stays pending, so the latest value is written once the
+filter allows it even if no further change arrives: the entity asks
+trailing_delay when to come back and then calls write_trailing.
+"""
+
+from typing import Any, Optional
+
+# Marker for "nothing written yet" and "nothing pending"
+_UNSET = object()
+
+# Seconds a suppressed temperature must stay unchanged before it is written
+DEFAULT_SETTLE = 10.0
+
+
+class StateWriteFilter:
+    """Pass every changed value straight through.
+
+    This is used for transitions such as outlet on/off and timer state, which
+    must never be delayed, and is the base for the filters below.
+
+    Attributes:
+        emitted: Number of writes allowed through
+        suppressed: Number of changed values that were not written
+    """
+
+    def __init__(self) -> None:
+        """Initialize the filter with empty counters."""
+        self.emitted: int = 0
+        self.suppressed: int = 0
+        self._last_value: Any = _UNSET
+        self._last_time: float = 0.0
+        self._pending: Any = _UNSET
+        self._pending_since: float = 0.0
+
+    @property
+    def last_value(self) -> Any:
+        """The value written last."""
+        return self._last_value
+
+    def should_write(self, value: Any, now: float, force: bool = False) -> bool:
+        """Decide whether a changed value should be written.
+
+        Args:
+            value: The new value
+            now: Current monotonic time in seconds
+            force: Write the value regardless of the filter, for transitions
+
+        Returns:
+            bool: True if the value should be written to Home Assistant
+        """
+        if (
+            force
+            or self._last_value is _UNSET
+            or value is None
+            or self._last_value is None
+            or self._is_significant(value, now)
+        ):
+            self._emit(value, now)
+            return True
+        self.suppressed += 1
+        if value != self._pending:
+            self._pending = value
+            self._pending_since = now
+        return False
+
+    def clear_pending(self) -> None:
+        """Drop the suppressed value, as the value is back at the one written last."""
+        self._pending = _UNSET
+
+    def trailing_delay(self, now: float) -> Optional[float]:
+        """Get the seconds until the suppressed value is due to be written.
+
+        Args:
+            now: Current monotonic time in seconds
+
+        Returns:
+            float: Seconds from now, or None if no value is pending
+        """
+        if self._pending is _UNSET:
+            return None
+        return max(self._trailing_due() - now, 0.0)
+
+    def write_trailing(self, now: float) -> bool:
+        """Take the suppressed value as written if it is due.
+
+        Args:
+            now: Current monotonic time in seconds
+
+        Returns:
+            bool: True if last_value should be written to Home Assistant
+        """
+        if self._pending is _UNSET or now < self._trailing_due():
+            return False
+        self._emit(self._pending, now)
+        return True
+
+    def _emit(self, value: Any, now: float) -> None:
+        """Record a value as written."""
+        self._last_value = value
+        self._last_time = now
+        self._pending = _UNSET
+        self.emitted += 1
+
+    def _is_significant(self, value: Any, now: float) -> bool:
+        """Whether a value differs enough from the last written one."""
+        return True
+
+    def _trailing_due(self) -> float:
+        """Monotonic time the pending value is due to be written at."""
+        return self._pending_since
+
+    def as_dict(self) -> dict:
+        """Get the filter counters.
+
+        Returns:
+            dict: Writes emitted and suppressed
+        """
+        return {"writes_emitted": self.emitted, "writes_suppressed": self.suppressed}
+
+
+class DeadbandFilter(StateWriteFilter):
+    """Write only when a value moves at least a fixed amount from the last write.
+
+    A smaller change is written once it has held for the settle time, so
+    the value settles on the latest reading without following jitter.
+
+    Attributes:
+        deadband: Minimum absolute change that is written
+        settle: Seconds a smaller change must hold before it is written
+    """
+
+    def __init__(self, deadband: float, settle: float = DEFAULT_SETTLE) -> None:
+        """Initialize the deadband filter.
+
+        Args:
+            deadband: Minimum absolute change that is written
+            settle: Seconds a smaller change must hold before it is written
+        """
+        super().__init__()
+        self.deadband: float = deadband
+        self.settle: float = settle
+
+    def _is_significant(self, value: Any, now: float) -> bool:
+        # Small epsilon so that a 0.1 step is not lost to float rounding
+        return abs(value - self._last_value) >= self.deadband - 1e-9
+
+    def _trailing_due(self) -> float:
+        return self._pending_since + self.settle
+
+
+class MinIntervalFilter(StateWriteFilter):
+    """Write at most once per interval, but always write a final zero.
+
+    A suppressed value is written once the interval has passed.
+
+    Attributes:
+        min_interval: Minimum seconds between writes
+    """
+
+    def __init__(self, min_interval: float) -> None:
+        """Initialize the rate limiting filter.
+
+        Args:
+            min_interval: Minimum seconds between writes
+        """
+        super().__init__()
+        self.min_interval: float = min_interval
+
+    def _is_significant(self, value: Any, now: float) -> bool:
+        return value == 0 or now - self._last_time >= self.min_interval
+
+    def _trailing_due(self) -> float:
+        return self._last_time + self.min_interval
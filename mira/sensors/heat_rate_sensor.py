@@ -0,0 +1,85 @@
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+
+from ..helpers.availability import DeviceAvailability
+
+
+class SoakStationHeatRateSensor(DeviceAvailability, SensorEntity):
+    """Sensor for the heat-up rate of a soak station device.
+    
+    This sensor reports how quickly the actual water temperature is changing,
+    derived from the device's rolling temperature telemetry.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _data: Device data model
+        _meta: Device metadata
+        _address: Device MAC address
+        _device_name: User-friendly device name
+    """
+
+    def __init__(self, hass, data, meta, address, device_name):
+        """Initialize the heat-up rate sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            data: Device data model
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._data = data
+        self._meta = meta
+        self._address = address
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        self._attr_name = f"Heat-up Rate ({device_name})"
+        self._attr_unique_id = f"soakstation_heatrate_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = "°C/s"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 3
+        self._attr_icon = "mdi:thermometer-chevron-up"
+        self._state = None
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
+
+    def _update_from_model(self):
+        """Update sensor state from the device telemetry.
+        
+        Reads the current heat-up rate and updates Home Assistant if it changed.
+        """
+        rate = self._data.telemetry.heat_up_rate
+        new_state = round(rate, 4) if rate is not None else None
+
+        # Only update HA state if it changed
+        if self._state != new_state:
+            self._state = new_state
+            self.async_write_ha_state()
+
+    async def async_update(self):
+        """Update sensor state when Home Assistant polls.
+        
+        This method is called when Home Assistant explicitly polls the sensor.
+        It delegates to _update_from_model to maintain consistent state handling.
+        """
+        self._update_from_model()
+
+    @property
+    def native_value(self):
+        """Get the current heat-up rate.
+        
+        Returns:
+            float: Rate of temperature change in °C per second
+        """
+        return self._state
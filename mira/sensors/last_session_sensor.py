@@ -0,0 +1,89 @@
+from homeassistant.const import UnitOfTemperature
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+
+# Unit, device class and icon for each summary value of the last session
+SESSION_SENSOR_KINDS = {
+    "duration": ("s", SensorDeviceClass.DURATION, "mdi:shower"),
+    "time_to_target": ("s", SensorDeviceClass.DURATION, "mdi:timer-play-outline"),
+    "avg_temp": (UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, "mdi:thermometer"),
+}
+
+
+class SoakStationLastSessionSensor(SensorEntity):
+    """Sensor summarising the last completed shower session.
+    
+    This sensor tracks one value of the most recent session record, such as its
+    duration or average temperature. The duration sensor also carries the full
+    session summary as attributes. It updates when a session ends.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _sessions: Device session history
+        _meta: Device metadata
+        _address: Device MAC address
+        _kind: Session record field being tracked
+        _device_name: User-friendly device name
+    """
+
+    def __init__(self, hass, sessions, meta, address, device_name, kind, name):
+        """Initialize the last session sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            sessions: Device session history
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+            kind: Session record field being tracked ("duration", "time_to_target" or "avg_temp")
+            name: Display name for the sensor
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._sessions = sessions
+        self._meta = meta
+        self._address = address
+        self._kind = kind
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        unit, device_class, icon = SESSION_SENSOR_KINDS[kind]
+        self._attr_name = f"{name} ({device_name})"
+        self._attr_unique_id = f"soakstation_lastsession_{kind}_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_icon = icon
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to completed sessions once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._sessions.subscribe(self.async_write_ha_state))
+
+    @property
+    def native_value(self):
+        """Get the tracked value of the last session.
+        
+        Returns:
+            float: The session value, or None if no session has completed
+        """
+        record = self._sessions.last
+        if record is None:
+            return None
+        value = getattr(record, self._kind)
+        return round(value, 1) if value is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Get the full last session summary on the duration sensor.
+        
+        Returns:
+            dict: Session record fields, or None for other sensors
+        """
+        record = self._sessions.last
+        if self._kind != "duration" or record is None:
+            return None
+        return dict(record.__dict__)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import time
+
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 
+from ..helpers.availability import DeviceAvailability
+from ..helpers.write_filter import StateWriteFilter
+
 
-class SoakStationOutletBinarySensor(BinarySensorEntity):
+class SoakStationOutletBinarySensor(DeviceAvailability, BinarySensorEntity):
     """Binary sensor representing a soak station outlet's running state.
     
     This sensor tracks whether a specific outlet on a soak station device is currently
@@ -18,7 +23,7 @@ class SoakStationOutletBinarySensor(BinarySensorEntity):
         _outlet_num: Outlet number (1 or 2)
     """
 
-    def __init__(self, hass, data, meta, device_name, address, outlet_num):
+    def __init__(self, hass, data, meta, device_name, address, outlet_num, write_filter=None):
         """Initialize the outlet binary sensor.
         
         Args:
@@ -28,6 +33,7 @@ class SoakStationOutletBinarySensor(BinarySensorEntity):
             device_name: User-friendly device name
             address: Device MAC address
             outlet_num: Outlet number (1 or 2)
+            write_filter: Significant-change filter for state writes
         """
         # Store instance variables
         self.hass = hass
@@ -36,6 +42,7 @@ class SoakStationOutletBinarySensor(BinarySensorEntity):
         self._address = address
         self._device_name = device_name
         self._outlet_num = outlet_num
+        self._write_filter = write_filter or StateWriteFilter()
 
         # Configure entity attributes
         self._attr_name = f"Outlet {outlet_num} ({device_name})"
@@ -45,8 +52,13 @@ class SoakStationOutletBinarySensor(BinarySensorEntity):
         self._attr_is_on = None
         self._attr_device_info = self._meta.get_device_info()
 
-        # Subscribe to data model updates
-        self._data.subscribe(self._update_from_model)
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
 
     def _update_from_model(self):
         """Update sensor state from the device data model.
@@ -61,7 +73,7 @@ class SoakStationOutletBinarySensor(BinarySensorEntity):
         )
 
         # Update HA state if changed
-        if self._attr_is_on != new_state:
+        if self._attr_is_on != new_state and self._write_filter.should_write(new_state, time.monotonic()):
             self._attr_is_on = new_state
             self.async_write_ha_state()
 
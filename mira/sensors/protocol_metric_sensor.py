@@ -0,0 +1,77 @@
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory
+
+from ..helpers.metrics import FRAMES_RECEIVED, RECONNECTS, TIMEOUTS
+
+# Unit, icon and value getter for each protocol metric
+METRIC_SENSOR_KINDS = {
+    "frames_received": (None, "mdi:message-arrow-left", lambda metrics: metrics.counters[FRAMES_RECEIVED]),
+    "protocol_errors": (None, "mdi:message-alert", lambda metrics: metrics.errors),
+    "reconnects": (None, "mdi:bluetooth-connect", lambda metrics: metrics.counters[RECONNECTS]),
+    "timeouts": (None, "mdi:timer-alert-outline", lambda metrics: metrics.counters[TIMEOUTS]),
+    "command_latency": (
+        "ms", "mdi:timer-outline",
+        lambda metrics: round(metrics.mean_latency * 1000) if metrics.mean_latency is not None else None,
+    ),
+}
+
+
+class SoakStationProtocolMetricSensor(SensorEntity):
+    """Diagnostic sensor exposing a protocol metric of a soak station connection.
+    
+    Metrics change with every frame, so rather than following the data model
+    this sensor is polled, and Home Assistant only records a new state when the
+    value has changed since the last poll. It is disabled by default.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _metrics: Connection protocol metrics
+        _meta: Device metadata
+        _address: Device MAC address
+        _kind: Metric being tracked
+        _device_name: User-friendly device name
+    """
+
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, hass, metrics, meta, address, device_name, kind, name):
+        """Initialize the protocol metric sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            metrics: Connection protocol metrics
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+            kind: Metric being tracked, a key of METRIC_SENSOR_KINDS
+            name: Display name for the sensor
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._metrics = metrics
+        self._meta = meta
+        self._address = address
+        self._kind = kind
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        unit, icon, self._getter = METRIC_SENSOR_KINDS[kind]
+        self._attr_name = f"{name} ({device_name})"
+        self._attr_unique_id = f"soakstation_metric_{kind}_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.MEASUREMENT if unit else SensorStateClass.TOTAL_INCREASING
+        self._attr_icon = icon
+        self._attr_device_info = self._meta.get_device_info()
+
+    @property
+    def native_value(self):
+        """Get the current metric value.
+        
+        Returns:
+            int: The counter value, or mean latency in milliseconds
+        """
+        return self._getter(self._metrics)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+
+from ..helpers.availability import DeviceAvailability
+
+
+class SoakStationReadyBinarySensor(DeviceAvailability, BinarySensorEntity):
+    """Binary sensor indicating a soak station's water is at temperature.
+    
+    This sensor is on when the actual water temperature is within the
+    telemetry ready band of the target temperature.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _data: Device data model
+        _meta: Device metadata
+        _address: Device MAC address
+        _device_name: User-friendly device name
+    """
+
+    def __init__(self, hass, data, meta, device_name, address):
+        """Initialize the ready binary sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            data: Device data model
+            meta: Device metadata
+            device_name: User-friendly device name
+            address: Device MAC address
+        """
+        # Store instance variables
+        self.hass = hass
+        self._data = data
+        self._meta = meta
+        self._address = address
+        self._device_name = device_name
+
+        # Configure entity attributes
+        self._attr_name = f"Ready ({device_name})"
+        self._attr_unique_id = f"soakstation_ready_{address.replace(':', '')}"
+        self._attr_icon = "mdi:thermometer-check"
+        self._attr_is_on = None
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
+
+    def _update_from_model(self):
+        """Update sensor state from the device telemetry.
+        
+        Checks whether the latest sample is within the ready band and updates
+        Home Assistant if the state has changed.
+        """
+        new_state = self._data.telemetry.is_ready
+
+        # Update HA state if changed
+        if self._attr_is_on != new_state:
+            self._attr_is_on = new_state
+            self.async_write_ha_state()
+
+    async def async_update(self):
+        """Update sensor state when Home Assistant polls.
+        
+        This method is called when Home Assistant explicitly polls the sensor.
+        It delegates to _update_from_model to maintain consistent state handling.
+        """
+        self._update_from_model()
@@ -0,0 +1,94 @@
+from homeassistant.const import UnitOfTemperature
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+
+# Unit, device class and icon for the summary value of each telemetry query
+TELEMETRY_SENSOR_KINDS = {
+    "percentiles": (UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, "mdi:chart-bell-curve"),
+    "heat_up_curve": ("s", SensorDeviceClass.DURATION, "mdi:chart-line"),
+    "runtime_per_day": ("min", SensorDeviceClass.DURATION, "mdi:calendar-clock"),
+    "stability": (UnitOfTemperature.CELSIUS, None, "mdi:target"),
+}
+
+
+class SoakStationTelemetrySensor(SensorEntity):
+    """Sensor holding the latest result of a telemetry query.
+
+    The state is the query's summary value, such as the median temperature
+    for percentiles, and the result is carried as attributes, except the
+    per-day runtimes which are only returned by the service. It updates
+    when the query_telemetry service runs the query.
+
+    Attributes:
+        hass: Home Assistant instance
+        _history: Device telemetry history
+        _meta: Device metadata
+        _address: Device MAC address
+        _kind: Query metric being tracked
+        _device_name: User-friendly device name
+    """
+
+    # Query results can be large and are kept in the store, not the recorder
+    _unrecorded_attributes = frozenset({"result"})
+
+    def __init__(self, hass, history, meta, address, device_name, kind, name):
+        """Initialize the telemetry sensor.
+
+        Args:
+            hass: Home Assistant instance
+            history: Device telemetry history
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+            kind: Query metric being tracked, a key of TELEMETRY_SENSOR_KINDS
+            name: Display name for the sensor
+        """
+        super().__init__()
+
+        # Store instance variables
+        self._hass = hass
+        self._history = history
+        self._meta = meta
+        self._address = address
+        self._kind = kind
+        self._device_name = device_name
+
+        # Configure entity attributes
+        unit, device_class, icon = TELEMETRY_SENSOR_KINDS[kind]
+        self._attr_name = f"{name} ({device_name})"
+        self._attr_unique_id = f"soakstation_telemetry_{kind}_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_icon = icon
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to query results once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._history.subscribe(self.async_write_ha_state))
+
+    @property
+    def native_value(self):
+        """Get the summary value of the latest query.
+
+        Returns:
+            float: The summary value, or None if the query has not run
+        """
+        result = self._history.results.get(self._kind)
+        return result["summary"] if result is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Get the span and result of the latest query.
+
+        Returns:
+            dict: Days covered, query time and result, or None if the query has not run
+        """
+        result = self._history.results.get(self._kind)
+        if result is None:
+            return None
+        attributes = {"days": result["days"], "queried_at": result["queried_at"]}
+        if self._kind != "runtime_per_day":
+            attributes["result"] = result["result"]
+        return attributes
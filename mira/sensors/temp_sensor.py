@@ -2,8 +2,12 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.helpers.device_registry import DeviceInfo
 
+from ..helpers.availability import DeviceAvailability
+from ..helpers.trailing_write import TrailingWrite
+from ..helpers.write_filter import StateWriteFilter
 
-class SoakStationTempSensor(SensorEntity):
+
+class SoakStationTempSensor(DeviceAvailability, TrailingWrite, SensorEntity):
     """Temperature sensor for a soak station device.
     
     This sensor tracks either the target or actual temperature of a soak station device.
@@ -18,7 +22,9 @@ class SoakStationTempSensor(SensorEntity):
         _device_name: User-friendly device name
     """
 
-    def __init__(self, hass, data, meta, address, device_name, kind, name):
+    _unrecorded_attributes = frozenset({"writes_emitted", "writes_suppressed"})
+
+    def __init__(self, hass, data, meta, address, device_name, kind, name, write_filter=None):
         """Initialize the temperature sensor.
         
         Args:
@@ -29,6 +35,7 @@ class SoakStationTempSensor(SensorEntity):
             device_name: User-friendly device name
             kind: Type of temperature being tracked ("target_temp" or "actual_temp")
             name: Display name for the sensor
+            write_filter: Significant-change filter for state writes
         """
         super().__init__()
         
@@ -39,6 +46,7 @@ class SoakStationTempSensor(SensorEntity):
         self._address = address
         self._kind = kind
         self._device_name = device_name
+        self._write_filter = write_filter or StateWriteFilter()
         
         # Configure entity attributes
         self._attr_name = f"{name} ({device_name})"
@@ -48,15 +56,23 @@ class SoakStationTempSensor(SensorEntity):
         self._attr_icon = "mdi:thermometer"
         self._state = None
         self._attr_device_info = self._meta.get_device_info()
-        
-        # Subscribe to data model updates
-        self._data.subscribe(self._update_from_model)
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription and any pending write are released automatically
+        when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
+        self._track_trailing_write()
 
     def _update_from_model(self):
         """Update sensor state from the device data model.
         
         Gets the current temperature value based on the sensor kind and updates
-        Home Assistant if the state has changed.
+        Home Assistant if the state has changed, or once the write filter
+        allows it.
         """
         # Get new state based on sensor kind
         new_state = self._state
@@ -65,10 +81,7 @@ class SoakStationTempSensor(SensorEntity):
         elif self._kind == "actual_temp":
             new_state = self._data.actual_temp
 
-        # Update HA state if changed
-        if self._state != new_state:
-            self._state = new_state
-            self.async_write_ha_state()
+        self._write_filtered(new_state)
 
     async def async_update(self):
         """Update sensor state when Home Assistant polls.
@@ -86,3 +99,12 @@ class SoakStationTempSensor(SensorEntity):
             float: Current temperature in Celsius
         """
         return self._state
+
+    @property
+    def extra_state_attributes(self):
+        """Get state write counters.
+        
+        Returns:
+            dict: Number of state writes emitted and suppressed by the write filter
+        """
+        return self._write_filter.as_dict()
@@ -0,0 +1,86 @@
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+
+from ..helpers.availability import DeviceAvailability
+
+
+class SoakStationTimeToTargetSensor(DeviceAvailability, SensorEntity):
+    """Sensor estimating the time until a soak station reaches its target temperature.
+    
+    The estimate is extrapolated from the current heat-up rate in the device's
+    rolling temperature telemetry. It is unknown while the temperature is not
+    moving towards the target.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _data: Device data model
+        _meta: Device metadata
+        _address: Device MAC address
+        _device_name: User-friendly device name
+    """
+
+    def __init__(self, hass, data, meta, address, device_name):
+        """Initialize the time to target sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            data: Device data model
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._data = data
+        self._meta = meta
+        self._address = address
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        self._attr_name = f"Time to Target ({device_name})"
+        self._attr_unique_id = f"soakstation_timetotarget_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = "s"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_icon = "mdi:timer-play-outline"
+        self._state = None
+        self._attr_device_info = self._meta.get_device_info()
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
+
+    def _update_from_model(self):
+        """Update sensor state from the device telemetry.
+        
+        Reads the estimated seconds to target and updates Home Assistant if
+        it changed.
+        """
+        seconds = self._data.telemetry.seconds_to_target
+        new_state = round(seconds) if seconds is not None else None
+
+        # Only update HA state if it changed
+        if self._state != new_state:
+            self._state = new_state
+            self.async_write_ha_state()
+
+    async def async_update(self):
+        """Update sensor state when Home Assistant polls.
+        
+        This method is called when Home Assistant explicitly polls the sensor.
+        It delegates to _update_from_model to maintain consistent state handling.
+        """
+        self._update_from_model()
+
+    @property
+    def native_value(self):
+        """Get the estimated time to target.
+        
+        Returns:
+            int: Estimated seconds until the target temperature is reached
+        """
+        return self._state
@@ -1,39 +1,62 @@
+import time
+from datetime import timedelta
+
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from ..helpers.availability import DeviceAvailability
+from ..helpers.trailing_write import TrailingWrite
+from ..helpers.write_filter import StateWriteFilter
 
+# Interval of the local countdown while the device timer is running
+TICK_INTERVAL = timedelta(seconds=1)
 
-class SoakStationTimerRemainingSensor(SensorEntity):
+
+class SoakStationTimerRemainingSensor(DeviceAvailability, TrailingWrite, SensorEntity):
     """Sensor for tracking remaining timer duration on a soak station device.
-    
+
     This sensor tracks the remaining time on a soak station device's timer.
-    It updates its state based on changes to the device's data model.
-    
+    Between device frames it counts down locally every second while the timer
+    is running, re-anchoring on each frame from the device's data model.
+
     Attributes:
         hass: Home Assistant instance
         _data: Device data model
         _meta: Device metadata
         _address: Device MAC address
         _device_name: User-friendly device name
+        _cancel_tick: Callback cancelling the local countdown, if running
+        _timer_state: Timer state at the last model update
     """
 
-    def __init__(self, hass, data, meta, address, device_name):
+    _unrecorded_attributes = frozenset(
+        {"drift_seconds", "max_drift_seconds", "writes_emitted", "writes_suppressed"}
+    )
+
+    def __init__(self, hass, data, meta, address, device_name, write_filter=None):
         """Initialize the timer remaining sensor.
-        
+
         Args:
             hass: Home Assistant instance
             data: Device data model
             meta: Device metadata
             address: Device MAC address
             device_name: User-friendly device name
+            write_filter: Significant-change filter for state writes
         """
         super().__init__()
-        
+
         # Store instance variables
         self._hass = hass
         self._data = data
         self._meta = meta
         self._address = address
         self._device_name = device_name
-        
+        self._cancel_tick = None
+        self._timer_state = None
+        self._write_filter = write_filter or StateWriteFilter()
+
         # Configure entity attributes
         self._attr_name = f"Timer Remaining ({device_name})"
         self._attr_unique_id = f"soakstation_timerremaining_{address.replace(':', '')}"
@@ -42,26 +65,66 @@ class SoakStationTimerRemainingSensor(SensorEntity):
         self._attr_icon = "mdi:timer-sand"
         self._state = None
         self._attr_device_info = self._meta.get_device_info()
-        
-        # Subscribe to data model updates
-        self._data.subscribe(self._update_from_model)
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription, any running countdown and any pending write are
+        released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
+        self.async_on_remove(self._stop_countdown)
+        self._track_trailing_write()
 
     def _update_from_model(self):
         """Update sensor state from the device data model.
-        
-        Gets the current remaining seconds value and updates Home Assistant
-        if the state has changed.
+
+        Re-reads the countdown anchored on the latest frame, starts or stops
+        the local per-second countdown to match the timer state, and updates
+        Home Assistant if the state has changed. The remaining time is always
+        written when the timer starts, pauses or stops.
         """
-        new_state = self._data.remaining_seconds
-        
-        # Only update HA state if it changed
-        if self._state != new_state:
-            self._state = new_state
-            self.async_write_ha_state()
+        if self._data.countdown.running:
+            self._start_countdown()
+        else:
+            self._stop_countdown()
+        transition = self._data.timer_state is not self._timer_state
+        self._timer_state = self._data.timer_state
+        self._refresh_state(force=transition)
+
+    def _refresh_state(self, force=False):
+        """Write the locally extrapolated remaining time if it changed.
+
+        Args:
+            force: Write the value regardless of the write filter
+        """
+        remaining = self._data.countdown.remaining(time.monotonic())
+        new_state = round(remaining) if remaining is not None else None
+        self._write_filtered(new_state, force)
+
+    def _start_countdown(self):
+        """Start ticking the local countdown if it is not already running."""
+        if self._cancel_tick is None:
+            self._cancel_tick = async_track_time_interval(self.hass, self._tick, TICK_INTERVAL)
+
+    def _stop_countdown(self):
+        """Stop ticking the local countdown."""
+        if self._cancel_tick is not None:
+            self._cancel_tick()
+            self._cancel_tick = None
+
+    @callback
+    def _tick(self, now):
+        """Advance the local countdown by re-reading the extrapolated value."""
+        self._refresh_state()
+        if self._state == 0:
+            # Hold at zero until the device reports the timer has stopped
+            self._stop_countdown()
 
     async def async_update(self):
         """Update sensor state when Home Assistant polls.
-        
+
         This method is called when Home Assistant explicitly polls the sensor.
         It delegates to _update_from_model to maintain consistent state handling.
         """
@@ -70,8 +133,23 @@ class SoakStationTimerRemainingSensor(SensorEntity):
     @property
     def native_value(self):
         """Get the current remaining time value.
-        
+
         Returns:
             int: Current remaining time in seconds
         """
         return self._state
+
+    @property
+    def extra_state_attributes(self):
+        """Get countdown drift and state write counters.
+
+        Returns:
+            dict: Latest and largest drift of the local countdown in seconds,
+            and the number of state writes emitted and suppressed
+        """
+        countdown = self._data.countdown
+        return {
+            "drift_seconds": round(countdown.last_drift, 2) if countdown.last_drift is not None else None,
+            "max_drift_seconds": round(countdown.max_drift, 2),
+            **self._write_filter.as_dict(),
+        }
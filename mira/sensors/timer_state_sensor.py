@@ -1,7 +1,12 @@
+import time
+
 from homeassistant.components.sensor import SensorEntity
 
+from ..helpers.availability import DeviceAvailability
+from ..helpers.write_filter import StateWriteFilter
+
 
-class SoakStationTimerStateSensor(SensorEntity):
+class SoakStationTimerStateSensor(DeviceAvailability, SensorEntity):
     """Sensor for tracking timer state on a soak station device.
     
     This sensor tracks the current state of a soak station device's timer (running,
@@ -15,7 +20,7 @@ class SoakStationTimerStateSensor(SensorEntity):
         _device_name: User-friendly device name
     """
 
-    def __init__(self, hass, data, meta, address, device_name):
+    def __init__(self, hass, data, meta, address, device_name, write_filter=None):
         """Initialize the timer state sensor.
         
         Args:
@@ -24,6 +29,7 @@ class SoakStationTimerStateSensor(SensorEntity):
             meta: Device metadata
             address: Device MAC address
             device_name: User-friendly device name
+            write_filter: Significant-change filter for state writes
         """
         super().__init__()
         
@@ -33,6 +39,7 @@ class SoakStationTimerStateSensor(SensorEntity):
         self._meta = meta
         self._address = address
         self._device_name = device_name
+        self._write_filter = write_filter or StateWriteFilter()
         
         # Configure entity attributes
         self._attr_name = f"Timer State ({device_name})"
@@ -42,9 +49,14 @@ class SoakStationTimerStateSensor(SensorEntity):
         self._attr_device_class = "enum"
         self._attr_options = ["running", "paused", "stopped"]
         self._attr_device_info = self._meta.get_device_info()
-        
-        # Subscribe to data model updates
-        self._data.subscribe(self._update_from_model)
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._data.subscribe(self._update_from_model))
+        self._track_availability(self._data)
 
     def _update_from_model(self):
         """Update sensor state from the device data model.
@@ -55,7 +67,7 @@ class SoakStationTimerStateSensor(SensorEntity):
         new_state = self._data.timer_state
         
         # Only update HA state if it changed
-        if self._state != new_state:
+        if self._state != new_state and self._write_filter.should_write(new_state, time.monotonic()):
             self._state = new_state
             self.async_write_ha_state()
 
@@ -0,0 +1,74 @@
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory
+
+# Unit, icon and value getter for each warm-up statistic
+WARMUP_SENSOR_KINDS = {
+    "hit_rate": (
+        "%", "mdi:bullseye-arrow",
+        lambda warmup: round(warmup.hit_rate * 100) if warmup.hit_rate is not None else None,
+    ),
+    "saved_latency": (
+        "s", "mdi:timer-sand-complete",
+        lambda warmup: round(warmup.stats["saved_seconds"], 1),
+    ),
+}
+
+
+class SoakStationWarmupSensor(SensorEntity):
+    """Diagnostic sensor exposing how well link warm-up predicts use.
+    
+    Like the protocol metric sensors this sensor is polled and disabled by
+    default.
+    
+    Attributes:
+        hass: Home Assistant instance
+        _warmup: Link warm-up of the device
+        _meta: Device metadata
+        _address: Device MAC address
+        _kind: Statistic being tracked
+        _device_name: User-friendly device name
+    """
+
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, hass, warmup, meta, address, device_name, kind, name):
+        """Initialize the warm-up sensor.
+        
+        Args:
+            hass: Home Assistant instance
+            warmup: Link warm-up of the device
+            meta: Device metadata
+            address: Device MAC address
+            device_name: User-friendly device name
+            kind: Statistic being tracked, a key of WARMUP_SENSOR_KINDS
+            name: Display name for the sensor
+        """
+        super().__init__()
+        
+        # Store instance variables
+        self._hass = hass
+        self._warmup = warmup
+        self._meta = meta
+        self._address = address
+        self._kind = kind
+        self._device_name = device_name
+        
+        # Configure entity attributes
+        unit, icon, self._getter = WARMUP_SENSOR_KINDS[kind]
+        self._attr_name = f"{name} ({device_name})"
+        self._attr_unique_id = f"soakstation_warmup_{kind}_{address.replace(':', '')}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_icon = icon
+        self._attr_device_info = self._meta.get_device_info()
+
+    @property
+    def native_value(self):
+        """Get the current statistic.
+        
+        Returns:
+            float: Hit rate in percent, or total connect time saved in seconds
+        """
+        return self._getter(self._warmup)
@@ -1,8 +1,12 @@
+import time
+
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.entity import DeviceInfo
+
+from ..helpers.availability import DeviceAvailability
+from ..helpers.write_filter import StateWriteFilter
 
 
-class SoakStationOutletSwitch(SwitchEntity):
+class SoakStationOutletSwitch(DeviceAvailability, SwitchEntity):
     """Switch entity representing a soak station outlet's power state.
     
     This switch controls whether a specific outlet on a soak station device is powered
@@ -17,7 +21,10 @@ class SoakStationOutletSwitch(SwitchEntity):
         _state: Current power state of the outlet
     """
 
-    def __init__(self, hass, connection, model, metadata, outlet_number):
+    # Turning an outlet on or off establishes a released link again
+    _available_while_released = True
+
+    def __init__(self, hass, connection, model, metadata, outlet_number, write_filter=None):
         """Initialize the outlet switch.
         
         Args:
@@ -26,6 +33,7 @@ class SoakStationOutletSwitch(SwitchEntity):
             model: Device data model
             metadata: Device metadata
             outlet_number: Outlet number (1 or 2)
+            write_filter: Significant-change filter for state writes
         """
         super().__init__()
         
@@ -35,14 +43,21 @@ class SoakStationOutletSwitch(SwitchEntity):
         self._model = model
         self._metadata = metadata
         self._outlet_number = outlet_number
+        self._write_filter = write_filter or StateWriteFilter()
         
         # Configure entity attributes
         self._attr_name = f"Outlet {outlet_number} ({metadata.name})"
         self._attr_unique_id = f"{metadata.device_address.replace(':', '')}_outlet_{outlet_number}"
+        self._attr_device_info = metadata.get_device_info()
         self._state = None
-        
-        # Subscribe to model updates
-        self._model.subscribe(self._handle_model_update)
+
+    async def async_added_to_hass(self):
+        """Subscribe to data model updates and availability once the entity is added.
+
+        The subscription is released automatically when the entity is removed.
+        """
+        self.async_on_remove(self._model.subscribe(self._handle_model_update))
+        self._track_availability(self._model)
 
     def _handle_model_update(self):
         """Update switch state from the device data model.
@@ -51,7 +66,7 @@ class SoakStationOutletSwitch(SwitchEntity):
         Home Assistant if the state has changed.
         """
         new_state = getattr(self._model, f"outlet_{self._outlet_number}_on", None)
-        if new_state is not None and new_state != self._state:
+        if new_state is not None and new_state != self._state and self._write_filter.should_write(new_state, time.monotonic()):
             self._state = new_state
             self.async_write_ha_state()
 
@@ -90,15 +105,6 @@ class SoakStationOutletSwitch(SwitchEntity):
         """
         return self._state
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Get the device info for this entity.
-        
-        Returns:
-            DeviceInfo: Device information for Home Assistant
-        """
-        return self._metadata.get_device_info()
-
     @property
     def icon(self):
         """Get the icon to display for this entity.
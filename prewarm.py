@@ -0,0 +1,327 @@
+"""Scheduled pre-warming for Mira Soak Station devices.
+
+This module starts an outlet ahead of a requested time so the water has
+reached the requested temperature by then. The lead time comes from a
+per-device heat-up model that is updated after every completed session and
+persisted, so it follows the season as the cold supply warms and cools.
+
+A started pre-warm is stopped again if nobody takes it over: unless the
+outlets or target temperature are changed after it started, the outlet is
+turned off once the maximum run time after the ready time has passed.
+
+The pending or running pre-warm is persisted whenever it changes and
+restored when the entry is set up again, so a reload or restart neither
+drops a schedule nor leaves a started outlet running without its overrun
+timer.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .mira.helpers.connection import Connection
+from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
+from .mira.helpers.heatup import HeatUpModel
+from .sessions import SoakStationSessions
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Delay before a changed model is written to disk
+SAVE_DELAY = 10
+
+# Upper bound on the lead time, so a badly fitted model cannot run the
+# outlet for long before the ready time
+MAX_LEAD = timedelta(minutes=15)
+
+# Default time an untouched pre-warm keeps running after the ready time
+DEFAULT_MAX_RUN = timedelta(minutes=10)
+
+# Resolution of temperatures set on and reported by the device, in Celsius
+TEMPERATURE_STEP = 0.1
+
+
+class SoakStationPrewarm:
+    """Heat-up model and pre-warm schedule for a single device.
+
+    At most one pre-warm is pending or running at a time; scheduling a new
+    one replaces it.
+
+    Attributes:
+        hass: Home Assistant instance
+        model: Learned heat-up model
+        ready_at: Requested ready time of the pending or running pre-warm
+        start_at: Time the outlet is or was started
+        running: Whether the outlet has been started and not yet taken over
+    """
+
+    def __init__(self, hass: HomeAssistant, connection: Connection, data: SoakStationData,
+                 metadata: SoakStationMetadata, sessions: SoakStationSessions) -> None:
+        """Initialize pre-warming.
+
+        Args:
+            hass: Home Assistant instance
+            connection: Connection used to start and stop the outlet
+            data: Device data model to follow
+            metadata: Device metadata
+            sessions: Session history the model learns from
+        """
+        self.hass = hass
+        self._connection = connection
+        self._data = data
+        self._sessions = sessions
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.heatup.{metadata.device_address}")
+        self._schedule_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.prewarm.{metadata.device_address}")
+        self._restored: Optional[Dict[str, Any]] = None
+        self.model = HeatUpModel()
+
+        self.ready_at: Optional[datetime] = None
+        self.start_at: Optional[datetime] = None
+        self.running: bool = False
+        self._outlet: int = 1
+        self._temperature: float = 0.0
+        self._max_run: timedelta = DEFAULT_MAX_RUN
+        self._confirmed: bool = False
+        self._cancel_timer: Optional[Callable[[], None]] = None
+        self._unsubscribe_data: Optional[Callable[[], None]] = None
+
+    async def async_load(self) -> None:
+        """Load the persisted heat-up model and pre-warm, if any."""
+        stored = await self._store.async_load()
+        if stored:
+            self.model = HeatUpModel.from_dict(stored)
+            logger.debug(f"Loaded heat-up model from {self.model.observations} sessions")
+        self._restored = await self._schedule_store.async_load()
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start learning from completed sessions and resume a restored pre-warm.
+
+        Returns:
+            Callable that stops learning and drops any pending or running
+            pre-warm without touching the device or its persisted copy
+        """
+        unsubscribe = self._sessions.subscribe(self._handle_session_end)
+        if self._restored:
+            self._restore(self._restored)
+            self._restored = None
+
+        def stop() -> None:
+            unsubscribe()
+            self._reset()
+
+        return stop
+
+    async def async_close(self) -> None:
+        """Persist the pending or running pre-warm right away, so setting the entry up again restores it."""
+        await self._schedule_store.async_save(self._schedule_to_save())
+
+    @callback
+    def _save_schedule(self) -> None:
+        """Persist the pending or running pre-warm after it changed."""
+        self._schedule_store.async_delay_save(self._schedule_to_save, SAVE_DELAY)
+
+    def _schedule_to_save(self) -> Dict[str, Any]:
+        """Build the representation of the pending or running pre-warm, empty if there is none."""
+        if self.ready_at is None:
+            return {}
+        return {
+            "ready_at": self.ready_at.isoformat(),
+            "start_at": self.start_at.isoformat(),
+            "outlet": self._outlet,
+            "temperature": self._temperature,
+            "max_run": self._max_run.total_seconds(),
+            "running": self.running,
+            "confirmed": self._confirmed,
+        }
+
+    @callback
+    def _restore(self, stored: Dict[str, Any]) -> None:
+        """Resume a persisted pre-warm.
+
+        A pending pre-warm whose ready time has passed is dropped. A running
+        one whose overrun time has passed is stopped right away.
+        """
+        self.ready_at = dt_util.parse_datetime(stored["ready_at"])
+        self.start_at = dt_util.parse_datetime(stored["start_at"])
+        self._outlet = stored["outlet"]
+        self._temperature = stored["temperature"]
+        self._max_run = timedelta(seconds=stored["max_run"])
+        if stored["running"]:
+            logger.info(f"Resuming running pre-warm of outlet {self._outlet}")
+            self._arm_overrun(stored["confirmed"])
+        elif self.ready_at > dt_util.utcnow():
+            logger.info(f"Resuming pre-warm of outlet {self._outlet} scheduled at {self.start_at}")
+            self._cancel_timer = async_track_point_in_utc_time(self.hass, self._async_start_outlet, self.start_at)
+        else:
+            logger.info("Persisted pre-warm has expired")
+            self._reset()
+            self._save_schedule()
+
+    @callback
+    def _handle_session_end(self) -> None:
+        """Fold the session that just ended into the heat-up model."""
+        record = self._sessions.last
+        if record is None or None in (record.time_to_target, record.initial_temp, record.target_temp):
+            return
+        if self.model.update(record.initial_temp, record.target_temp, record.time_to_target):
+            self._store.async_delay_save(self.model.as_dict, SAVE_DELAY)
+
+    def predict_lead(self, temperature: float) -> timedelta:
+        """Predict how long before the ready time the outlet must start.
+
+        Args:
+            temperature: Requested temperature in Celsius
+
+        Returns:
+            timedelta: Lead time, capped at MAX_LEAD
+        """
+        # While the outlets are off the reported temperature follows the
+        # water left in the valve, the best available estimate of the supply
+        initial_temp = None if (self._data.outlet_1_on or self._data.outlet_2_on) else self._data.actual_temp
+        lead = timedelta(seconds=self.model.predict(initial_temp, temperature))
+        return min(lead, MAX_LEAD)
+
+    @callback
+    def async_schedule(self, ready_at: datetime, temperature: float, outlet: int = 1,
+                       max_run: timedelta = DEFAULT_MAX_RUN) -> Dict[str, Any]:
+        """Schedule a pre-warm, replacing any pending or running one.
+
+        Args:
+            ready_at: Time the water should be at temperature
+            temperature: Requested temperature in Celsius
+            outlet: Outlet to start, 1 or 2
+            max_run: Time an untouched pre-warm keeps running after the ready time
+
+        Returns:
+            dict: Ready time, start time and lead time in seconds
+        """
+        self._reset()
+        # The device reports tenths, so the report confirming the start can match
+        temperature = round(temperature, 1)
+        lead = self.predict_lead(temperature)
+        self.ready_at = dt_util.as_utc(ready_at)
+        self.start_at = max(self.ready_at - lead, dt_util.utcnow())
+        self._outlet = outlet
+        self._temperature = temperature
+        self._max_run = max_run
+        self._cancel_timer = async_track_point_in_utc_time(self.hass, self._async_start_outlet, self.start_at)
+        self._save_schedule()
+        logger.info(f"Pre-warm of outlet {outlet} to {temperature}°C scheduled at {self.start_at} "
+                    f"for {self.ready_at}")
+        return self.as_dict()
+
+    async def async_cancel(self) -> bool:
+        """Cancel the pending or running pre-warm.
+
+        A running pre-warm that has not been taken over is stopped.
+
+        Returns:
+            bool: Whether there was a pre-warm to cancel
+        """
+        if self.ready_at is None:
+            return False
+        running = self.running
+        self._reset()
+        self._save_schedule()
+        if running:
+            await self._async_stop_outlet()
+        logger.info("Pre-warm cancelled")
+        return True
+
+    async def _async_start_outlet(self, now: datetime) -> None:
+        """Start the outlet and arm the overrun protection."""
+        self._cancel_timer = None
+        outlets = [bool(self._data.outlet_1_on), bool(self._data.outlet_2_on)]
+        outlets[self._outlet - 1] = True
+        logger.info(f"Starting pre-warm of outlet {self._outlet} to {self._temperature}°C")
+        try:
+            await self._connection.control_outlets(outlets[0], outlets[1], self._temperature)
+        except Exception as e:
+            logger.warning(f"Failed to start pre-warm: {e}")
+            self._reset()
+            self._save_schedule()
+            return
+        self._arm_overrun(False)
+        self._save_schedule()
+
+    def _arm_overrun(self, confirmed: bool) -> None:
+        """Follow the started outlet and stop it if nobody takes it over.
+
+        Args:
+            confirmed: Whether a report already showed the outlet started
+        """
+        self.running = True
+        self._confirmed = confirmed
+        self._unsubscribe_data = self._data.subscribe(self._handle_update)
+        self._cancel_timer = async_track_point_in_utc_time(
+            self.hass, self._async_overrun, self.ready_at + self._max_run
+        )
+
+    @callback
+    def _handle_update(self) -> None:
+        """Stand down once somebody changes the outlets or temperature."""
+        target = self._data.target_temp
+        expected = (target is not None and abs(target - self._temperature) < TEMPERATURE_STEP / 2
+                    and self._outlet_on)
+        if not self._confirmed:
+            # Reports sent before the command took effect still show the old state
+            self._confirmed = expected
+            return
+        if not expected:
+            logger.info("Pre-warm taken over, overrun protection disarmed")
+            self._reset()
+            self._save_schedule()
+
+    @property
+    def _outlet_on(self) -> bool:
+        """Whether the pre-warmed outlet is running."""
+        return bool(self._data.outlet_1_on if self._outlet == 1 else self._data.outlet_2_on)
+
+    async def _async_overrun(self, now: datetime) -> None:
+        """Stop a pre-warm that nobody took over."""
+        self._cancel_timer = None
+        logger.info(f"Pre-warm not taken over within {self._max_run} of the ready time, stopping outlet")
+        self._reset()
+        self._save_schedule()
+        await self._async_stop_outlet()
+
+    async def _async_stop_outlet(self) -> None:
+        """Turn off the pre-warmed outlet, leaving the other one as it is."""
+        outlets = [bool(self._data.outlet_1_on), bool(self._data.outlet_2_on)]
+        outlets[self._outlet - 1] = False
+        try:
+            await self._connection.control_outlets(outlets[0], outlets[1], self._temperature)
+        except Exception as e:
+            logger.warning(f"Failed to stop pre-warm: {e}")
+
+    def _reset(self) -> None:
+        """Drop the schedule, timers and data subscription."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        if self._unsubscribe_data is not None:
+            self._unsubscribe_data()
+            self._unsubscribe_data = None
+        self.ready_at = None
+        self.start_at = None
+        self.running = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the model and the current schedule."""
+        return {
+            "ready_at": self.ready_at.isoformat() if self.ready_at else None,
+            "start_at": self.start_at.isoformat() if self.start_at else None,
+            "lead_seconds": (self.ready_at - self.start_at).total_seconds() if self.ready_at else None,
+            "outlet": self._outlet if self.ready_at else None,
+            "temperature": self._temperature if self.ready_at else None,
+            "running": self.running,
+            "model": self.model.as_dict(),
+        }
@@ -0,0 +1,68 @@
+"""Repairs for the Mira Soak Station integration.
+
+This module provides the fix flow of the stale clients issue, which
+unpairs the other Home Assistant clients from the device.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import voluptuous as vol
+
+from homeassistant.components.repairs import RepairsFlow
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResult
+
+from .const import DOMAIN
+
+logger = logging.getLogger(__name__)
+
+
+class StaleClientsRepairFlow(RepairsFlow):
+    """Confirm and unpair stale Home Assistant clients of a device."""
+
+    def __init__(self, entry_id: str) -> None:
+        """Initialize the flow.
+
+        Args:
+            entry_id: Config entry of the device
+        """
+        self._entry_id = entry_id
+
+    async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Start with the confirmation step."""
+        return await self.async_step_confirm()
+
+    async def async_step_confirm(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Unpair the stale clients once confirmed."""
+        if user_input is None:
+            return self.async_show_form(step_id="confirm", data_schema=vol.Schema({}))
+
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self._entry_id)
+        if entry_data is None:
+            return self.async_abort(reason="not_loaded")
+
+        from .client_inventory import async_unpair_clients
+
+        try:
+            result = await async_unpair_clients(self.hass, self._entry_id, entry_data)
+        except Exception as e:
+            logger.warning(f"Failed to unpair stale clients: {e}")
+            return self.async_abort(reason="unpair_failed")
+        logger.debug(f"Unpaired stale clients in slots {result['unpaired']}")
+        return self.async_create_entry(data={})
+
+
+async def async_create_fix_flow(hass: HomeAssistant, issue_id: str,
+                                data: Optional[Dict[str, Any]]) -> RepairsFlow:
+    """Create the fix flow of an issue.
+
+    Args:
+        hass: Home Assistant instance
+        issue_id: ID of the issue being fixed
+        data: Data the issue was created with
+
+    Returns:
+        RepairsFlow: Flow unpairing the stale clients
+    """
+    return StaleClientsRepairFlow(data["entry_id"])
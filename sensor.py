@@ -1,16 +1,131 @@
 """Sensor platform for Mira Soak Station devices.
 
-This module handles the setup of sensors that monitor temperature and timer
-states for the Mira Soak Station device.
+This module handles the setup of sensors that monitor temperature, heat-up, timer
+states, shower sessions and long-term telemetry for the Mira Soak Station device.
 """
 
+from dataclasses import dataclass
+from typing import Optional
+
+from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TIMER_MIN_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TIMER_MIN_INTERVAL,
+)
+from .mira.helpers.descriptions import SoakStationEntityDescription, build_entities
+from .mira.helpers.write_filter import DeadbandFilter, MinIntervalFilter, StateWriteFilter
+from .mira.sensors.heat_rate_sensor import SoakStationHeatRateSensor
+from .mira.sensors.last_session_sensor import SoakStationLastSessionSensor
+from .mira.sensors.protocol_metric_sensor import SoakStationProtocolMetricSensor
+from .mira.sensors.telemetry_sensor import SoakStationTelemetrySensor
 from .mira.sensors.temp_sensor import SoakStationTempSensor
+from .mira.sensors.time_to_target_sensor import SoakStationTimeToTargetSensor
 from .mira.sensors.timer_remaining_sensor import SoakStationTimerRemainingSensor
 from .mira.sensors.timer_state_sensor import SoakStationTimerStateSensor
+from .mira.sensors.warmup_sensor import SoakStationWarmupSensor
+
+
+@dataclass(frozen=True, kw_only=True)
+class SoakStationSensorEntityDescription(SensorEntityDescription, SoakStationEntityDescription):
+    """Description of a Mira Soak Station sensor.
+
+    Attributes:
+        kind: Value tracked, for sensor classes covering several
+        entity_class: Sensor class of sensors derived from the device data model
+    """
+    kind: Optional[str] = None
+    entity_class: Optional[type] = None
+
+
+def _create_temp_sensor(hass, config_entry, entry_data, description):
+    """Create a target or actual temperature sensor."""
+    return SoakStationTempSensor(
+        hass, entry_data["data"], entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], description.key, description.name,
+        write_filter=entry_data["write_filters"][description.key]
+    )
+
+
+def _create_device_sensor(hass, config_entry, entry_data, description):
+    """Create a sensor derived from the device data model, filtered if it has a write filter."""
+    write_filter = entry_data["write_filters"].get(description.key)
+    kwargs = {"write_filter": write_filter} if write_filter is not None else {}
+    return description.entity_class(
+        hass, entry_data["data"], entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], **kwargs
+    )
+
+
+def _create_last_session_sensor(hass, config_entry, entry_data, description):
+    """Create a sensor summarising the last session."""
+    return SoakStationLastSessionSensor(
+        hass, entry_data["sessions"], entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], description.kind, description.name
+    )
+
+
+def _create_metric_sensor(hass, config_entry, entry_data, description):
+    """Create a diagnostic sensor for link and protocol health."""
+    return SoakStationProtocolMetricSensor(
+        hass, entry_data["connection"].metrics, entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], description.kind, description.name
+    )
+
+
+def _create_warmup_sensor(hass, config_entry, entry_data, description):
+    """Create a diagnostic sensor for link warm-up predictions."""
+    return SoakStationWarmupSensor(
+        hass, entry_data["warmup"], entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], description.kind, description.name
+    )
+
+
+def _create_telemetry_sensor(hass, config_entry, entry_data, description):
+    """Create a sensor holding the latest result of a telemetry query."""
+    return SoakStationTelemetrySensor(
+        hass, entry_data["telemetry"], entry_data["metadata"], config_entry.data["device_address"],
+        config_entry.data["device_name"], description.kind, description.name
+    )
+
+
+def _device_sensor(key, entity_class):
+    """Describe a sensor derived from the device data model."""
+    return SoakStationSensorEntityDescription(key=key, entity_class=entity_class, create_fn=_create_device_sensor)
+
+
+def _kind_sensor(prefix, create_fn, kind, name):
+    """Describe one of the values tracked by a sensor class, keyed by prefix and kind."""
+    return SoakStationSensorEntityDescription(key=f"{prefix}_{kind}", kind=kind, name=name, create_fn=create_fn)
+
+
+SENSORS = (
+    SoakStationSensorEntityDescription(key="target_temp", name="Target Temperature", create_fn=_create_temp_sensor),
+    SoakStationSensorEntityDescription(key="actual_temp", name="Actual Temperature", create_fn=_create_temp_sensor),
+    _device_sensor("heat_rate", SoakStationHeatRateSensor),
+    _device_sensor("time_to_target", SoakStationTimeToTargetSensor),
+    _device_sensor("timer_state", SoakStationTimerStateSensor),
+    _device_sensor("timer_remaining", SoakStationTimerRemainingSensor),
+    _kind_sensor("last_session", _create_last_session_sensor, "duration", "Last Session Duration"),
+    _kind_sensor("last_session", _create_last_session_sensor, "time_to_target", "Last Session Time to Target"),
+    _kind_sensor("last_session", _create_last_session_sensor, "avg_temp", "Last Session Average Temperature"),
+    _kind_sensor("metric", _create_metric_sensor, "frames_received", "Frames Received"),
+    _kind_sensor("metric", _create_metric_sensor, "protocol_errors", "Protocol Errors"),
+    _kind_sensor("metric", _create_metric_sensor, "reconnects", "Reconnects"),
+    _kind_sensor("metric", _create_metric_sensor, "timeouts", "Timeouts"),
+    _kind_sensor("metric", _create_metric_sensor, "command_latency", "Command Latency"),
+    _kind_sensor("warmup", _create_warmup_sensor, "hit_rate", "Warm-up Hit Rate"),
+    _kind_sensor("warmup", _create_warmup_sensor, "saved_latency", "Warm-up Saved Connect Time"),
+    _kind_sensor("telemetry", _create_telemetry_sensor, "percentiles", "Median Shower Temperature"),
+    _kind_sensor("telemetry", _create_telemetry_sensor, "heat_up_curve", "Typical Heat-up Time"),
+    _kind_sensor("telemetry", _create_telemetry_sensor, "runtime_per_day", "Average Daily Runtime"),
+    _kind_sensor("telemetry", _create_telemetry_sensor, "stability", "Temperature Deviation"),
+)
 
 
 async def async_setup_entry(
@@ -25,32 +140,18 @@ async def async_setup_entry(
         config_entry: Configuration entry containing device details
         async_add_entities: Callback to add entities to Home Assistant
     """
-    # Extract device configuration
-    data = config_entry.data
-    address = data["device_address"]
-    device_name = data["device_name"]
-
-    # Get device data and metadata from hass storage
-    config_data = hass.data[DOMAIN][config_entry.entry_id]["data"]
-    meta = hass.data[DOMAIN][config_entry.entry_id]["metadata"]
-
-    # Create sensors for temperature and timer states
-    sensors = [
-        SoakStationTempSensor(
-            hass, config_data, meta, address, device_name, 
-            "target_temp", "Target Temperature"
-        ),
-        SoakStationTempSensor(
-            hass, config_data, meta, address, device_name,
-            "actual_temp", "Actual Temperature"
-        ),
-        SoakStationTimerStateSensor(
-            hass, config_data, meta, address, device_name
-        ),
-        SoakStationTimerRemainingSensor(
-            hass, config_data, meta, address, device_name
-        ),
-    ]
-
-    # Register sensors with Home Assistant
-    async_add_entities(sensors)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+
+    # Significant-change filters, kept on the entry so their counters can be inspected
+    options = config_entry.options
+    deadband = options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND)
+    write_filters = entry_data["write_filters"]
+    # The setpoint moves in deliberate 0.1 °C steps, only the measured temperature jitters
+    write_filters["target_temp"] = StateWriteFilter()
+    write_filters["actual_temp"] = DeadbandFilter(deadband)
+    write_filters["timer_state"] = StateWriteFilter()
+    write_filters["timer_remaining"] = MinIntervalFilter(
+        options.get(CONF_TIMER_MIN_INTERVAL, DEFAULT_TIMER_MIN_INTERVAL)
+    )
+
+    async_add_entities(build_entities(SENSORS, hass, config_entry, entry_data))
@@ -0,0 +1,270 @@
+"""Services for the Mira Soak Station integration.
+
+This module registers the integration's services with Home Assistant.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Tuple
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SERVICE_CANCEL_READY_AT,
+    SERVICE_PROFILE,
+    SERVICE_QUERY_TELEMETRY,
+    SERVICE_READY_AT,
+    SERVICE_UNPAIR_CLIENT,
+)
+
+logger = logging.getLogger(__name__)
+
+ATTR_DURATION = "duration"
+ATTR_DEVICE_ID = "device_id"
+ATTR_TIME = "time"
+ATTR_TEMPERATURE = "temperature"
+ATTR_OUTLET = "outlet"
+ATTR_MAX_RUN = "max_run"
+ATTR_METRIC = "metric"
+ATTR_DAYS = "days"
+ATTR_SLOT = "slot"
+
+# Query metrics, as defined in telemetry_history, which is not imported here
+# so registering services does not load NumPy
+TELEMETRY_METRICS = ["percentiles", "heat_up_curve", "runtime_per_day", "stability"]
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DURATION, default=30): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+})
+
+READY_AT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    # A full date and time, or a time of day for its next occurrence
+    vol.Required(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+    vol.Required(ATTR_TEMPERATURE): vol.All(vol.Coerce(float), vol.Range(min=10, max=50)),
+    vol.Optional(ATTR_OUTLET, default=1): vol.All(vol.Coerce(int), vol.In([1, 2])),
+    vol.Optional(ATTR_MAX_RUN, default=10): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+})
+
+CANCEL_READY_AT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+})
+
+QUERY_TELEMETRY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    vol.Required(ATTR_METRIC): vol.In(TELEMETRY_METRICS),
+    vol.Optional(ATTR_DAYS, default=30): vol.All(vol.Coerce(float), vol.Range(min=1, max=3650)),
+})
+
+UNPAIR_CLIENT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    # A single slot, or all stale Home Assistant clients when omitted
+    vol.Optional(ATTR_SLOT): vol.All(vol.Coerce(int), vol.Range(min=0, max=15)),
+})
+
+# Number of frames kept per allocation traceback in tracemalloc snapshots
+TRACEMALLOC_FRAMES = 10
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services.
+
+    Args:
+        hass: Home Assistant instance
+    """
+    profile_lock = asyncio.Lock()
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Capture a cProfile and tracemalloc snapshot of the event loop.
+
+        The profile covers everything running on the event loop for the
+        requested duration, including this integration's notification
+        callbacks, and is written next to the Home Assistant configuration.
+        """
+        if profile_lock.locked():
+            raise HomeAssistantError("A profile is already being captured")
+
+        # Only needed while profiling
+        import cProfile
+        import tracemalloc
+
+        async with profile_lock:
+            duration = call.data[ATTR_DURATION]
+            timestamp = int(time.time())
+            profile_path = hass.config.path(f"{DOMAIN}.profile.{timestamp}.cprof")
+            memory_path = hass.config.path(f"{DOMAIN}.profile.{timestamp}.tracemalloc")
+            logger.info(f"Capturing profile for {duration}s")
+
+            started_tracemalloc = not tracemalloc.is_tracing()
+            if started_tracemalloc:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profiler.disable()
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+
+            def write_files() -> None:
+                profiler.dump_stats(profile_path)
+                snapshot.dump(memory_path)
+
+            await hass.async_add_executor_job(write_files)
+            logger.info(f"Profile written to {profile_path} and {memory_path}")
+
+        return {
+            "profile": profile_path,
+            "memory": memory_path,
+            "callbacks": {
+                entry_id: entry_data["profiler"].as_dict()
+                for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+                if entry_data.get("profiler") is not None
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_ready_at(call: ServiceCall) -> ServiceResponse:
+        """Start an outlet early enough to be at temperature at the given time."""
+        entry_data = _entry_data_for_device(hass, call.data[ATTR_DEVICE_ID])
+        ready_at = _next_occurrence(call.data[ATTR_TIME])
+        if ready_at <= dt_util.utcnow():
+            raise HomeAssistantError(f"Ready time {ready_at} is in the past")
+
+        temperature = call.data[ATTR_TEMPERATURE]
+        metadata = entry_data["metadata"]
+        if metadata.min_temperature is not None and not (
+                metadata.min_temperature <= temperature <= metadata.max_temperature):
+            raise HomeAssistantError(
+                f"Temperature must be between {metadata.min_temperature} and {metadata.max_temperature}°C"
+            )
+
+        if call.data[ATTR_OUTLET] not in metadata.outlets:
+            raise HomeAssistantError(f"Outlet {call.data[ATTR_OUTLET]} is not enabled on this device")
+
+        return entry_data["prewarm"].async_schedule(
+            ready_at, temperature, call.data[ATTR_OUTLET], timedelta(minutes=call.data[ATTR_MAX_RUN])
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READY_AT,
+        async_ready_at,
+        schema=READY_AT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_cancel_ready_at(call: ServiceCall) -> None:
+        """Cancel a scheduled pre-warm, stopping the outlet if it is running."""
+        entry_data = _entry_data_for_device(hass, call.data[ATTR_DEVICE_ID])
+        await entry_data["prewarm"].async_cancel()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_READY_AT,
+        async_cancel_ready_at,
+        schema=CANCEL_READY_AT_SCHEMA,
+    )
+
+    async def async_query_telemetry(call: ServiceCall) -> ServiceResponse:
+        """Query the device's long-term telemetry and update its telemetry sensor."""
+        entry_data = _entry_data_for_device(hass, call.data[ATTR_DEVICE_ID])
+        return await entry_data["telemetry"].async_query(call.data[ATTR_METRIC], call.data[ATTR_DAYS])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_TELEMETRY,
+        async_query_telemetry,
+        schema=QUERY_TELEMETRY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_unpair_client(call: ServiceCall) -> ServiceResponse:
+        """Unpair a client slot, or all stale Home Assistant clients, from the device."""
+        # Only needed once a device is set up
+        from .client_inventory import async_unpair_clients
+
+        entry_id, entry_data = _loaded_entry_for_device(hass, call.data[ATTR_DEVICE_ID])
+        slots = [call.data[ATTR_SLOT]] if ATTR_SLOT in call.data else None
+        return await async_unpair_clients(hass, entry_id, entry_data, slots)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UNPAIR_CLIENT,
+        async_unpair_client,
+        schema=UNPAIR_CLIENT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _entry_data_for_device(hass: HomeAssistant, device_id: str) -> Dict[str, Any]:
+    """Find the loaded entry data of a device.
+
+    Args:
+        hass: Home Assistant instance
+        device_id: Device registry ID
+
+    Returns:
+        dict: Entry data stored in hass.data
+
+    Raises:
+        HomeAssistantError: If the device is unknown or its entry is not loaded
+    """
+    return _loaded_entry_for_device(hass, device_id)[1]
+
+
+def _loaded_entry_for_device(hass: HomeAssistant, device_id: str) -> Tuple[str, Dict[str, Any]]:
+    """Find the loaded config entry of a device.
+
+    Args:
+        hass: Home Assistant instance
+        device_id: Device registry ID
+
+    Returns:
+        tuple: Config entry ID and the entry data stored in hass.data
+
+    Raises:
+        HomeAssistantError: If the device is unknown or its entry is not loaded
+    """
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        loaded = hass.data.get(DOMAIN, {})
+        for entry_id in device.config_entries:
+            if entry_id in loaded:
+                return entry_id, loaded[entry_id]
+    raise HomeAssistantError(f"No loaded Soak Station device with ID {device_id}")
+
+
+def _next_occurrence(value: Any) -> datetime:
+    """Resolve a service time to an aware UTC datetime.
+
+    Args:
+        value: Datetime, taken as local time if naive, or a time of day
+
+    Returns:
+        datetime: The datetime, or the next occurrence of the time of day
+    """
+    if isinstance(value, datetime):
+        return dt_util.as_utc(value)
+    now = dt_util.now()
+    candidate = now.replace(hour=value.hour, minute=value.minute, second=value.second, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return dt_util.as_utc(candidate)
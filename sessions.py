@@ -0,0 +1,151 @@
+"""Shower session history for Mira Soak Station devices.
+
+This module connects the session tracker to Home Assistant: it feeds the
+tracker from data model updates, persists a bounded history of compact
+session records and fires an event when a session ends.
+"""
+
+import logging
+import time
+from typing import Callable, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, EVENT_SESSION_ENDED
+from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
+from .mira.helpers.session import SessionRecord, SessionTracker
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Number of sessions retained per device
+MAX_SESSIONS = 500
+
+# Delay before a changed history is written to disk
+SAVE_DELAY = 10
+
+
+class SoakStationSessions:
+    """Session detection and history for a single device.
+
+    Attributes:
+        hass: Home Assistant instance
+        history: Completed sessions, oldest first
+        subscribers: Callbacks notified when a session ends
+    """
+
+    def __init__(self, hass: HomeAssistant, data: SoakStationData, metadata: SoakStationMetadata) -> None:
+        """Initialize session tracking.
+
+        Args:
+            hass: Home Assistant instance
+            data: Device data model to follow
+            metadata: Device metadata used to identify presets
+        """
+        self.hass = hass
+        self._data = data
+        self._metadata = metadata
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.sessions.{metadata.device_address}")
+        self._tracker = SessionTracker(self._handle_session_end, metadata=metadata)
+        self._cancel_expiry: Optional[CALLBACK_TYPE] = None
+        self.history: List[SessionRecord] = []
+        self.subscribers: List[Callable[[], None]] = []
+
+    @property
+    def last(self) -> Optional[SessionRecord]:
+        """The most recently completed session, if any."""
+        return self.history[-1] if self.history else None
+
+    async def async_load(self) -> None:
+        """Load the persisted session history."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        # Rows are positional; map them through the stored field order so
+        # history survives fields being added later
+        field_names = SessionRecord.field_names()
+        stored_fields = stored["fields"]
+        for row in stored["sessions"]:
+            values = dict(zip(stored_fields, row))
+            self.history.append(SessionRecord(*(values.get(name) for name in field_names)))
+        logger.debug(f"Loaded {len(self.history)} sessions")
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start following the data model.
+
+        Returns:
+            Callable that stops following the data model and records the
+            session in progress, if any, up to its last update
+        """
+        unsubscribe = self._data.subscribe(self._handle_update)
+
+        @callback
+        def stop() -> None:
+            unsubscribe()
+            if self._cancel_expiry is not None:
+                self._cancel_expiry()
+                self._cancel_expiry = None
+            self._tracker.close()
+
+        return stop
+
+    @callback
+    def _handle_update(self) -> None:
+        """Feed a data model update into the session tracker."""
+        self._tracker.update(self._data, time.monotonic(), time.time())
+        self._schedule_expiry()
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        """Make sure the session ends once no update keeps it going, such as while the link is released."""
+        expires_at = self._tracker.expires_at
+        if expires_at is None or self._cancel_expiry is not None:
+            return
+        self._cancel_expiry = async_call_later(self.hass, max(expires_at - time.monotonic(), 0), self._handle_expiry)
+
+    @callback
+    def _handle_expiry(self, _now) -> None:
+        """End the session if its end grace period passed, otherwise wait for the new deadline."""
+        self._cancel_expiry = None
+        self._tracker.expire(time.monotonic())
+        self._schedule_expiry()
+
+    @callback
+    def _handle_session_end(self, record: SessionRecord) -> None:
+        """Persist a completed session and announce it."""
+        self.history.append(record)
+        del self.history[:-MAX_SESSIONS]
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+        self.hass.bus.async_fire(
+            EVENT_SESSION_ENDED,
+            {"device_address": self._metadata.device_address, **record.__dict__},
+        )
+
+        for subscriber in list(self.subscribers):
+            subscriber()
+
+    def _data_to_save(self) -> dict:
+        """Build the compact representation of the history."""
+        return {
+            "fields": SessionRecord.field_names(),
+            "sessions": [record.to_row() for record in self.history],
+        }
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback for completed sessions.
+
+        Returns:
+            Callable that removes the callback again
+        """
+        self.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+        return unsubscribe
@@ -0,0 +1,196 @@
+"""Long-term statistics export for Mira Soak Station devices.
+
+This module aggregates data model updates per clock hour and imports the
+closed hours into the recorder as external statistics: runtime of each
+outlet, water temperature while running and the number of sessions. With
+these, history graphs do not depend on the high-frequency temperature and
+timer sensor states, which can then be excluded from the recorder.
+
+Closed hours are queued and imported in one batch per statistic at the top
+of each hour. The queue and the running sums are persisted, so hours closed
+while the recorder is unavailable are imported once it is back.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.const import UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
+from .mira.helpers.hourly import HourAggregate, HourlyAggregator
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Delay before changed sums and queued hours are written to disk
+SAVE_DELAY = 10
+
+# Upper bound on queued hours, about a month, while the recorder is unavailable
+MAX_PENDING = 24 * 31
+
+# Statistics by key: name suffix, unit and whether they are sums or means
+STATISTICS = {
+    "outlet_1_runtime": ("outlet 1 runtime", UnitOfTime.MINUTES, True),
+    "outlet_2_runtime": ("outlet 2 runtime", UnitOfTime.MINUTES, True),
+    "sessions": ("sessions", None, True),
+    "temperature": ("shower temperature", UnitOfTemperature.CELSIUS, False),
+}
+
+
+class SoakStationStatisticsExport:
+    """Hourly aggregation and statistics import for a single device.
+
+    Attributes:
+        hass: Home Assistant instance
+        sums: Running sum of each sum statistic up to the last imported hour
+        pending: Closed hours not yet imported, oldest first
+        last_hour: Start of the newest hour queued, as a UNIX timestamp
+        imported: Number of hours imported since start
+    """
+
+    def __init__(self, hass: HomeAssistant, data: SoakStationData, metadata: SoakStationMetadata,
+                 device_name: str) -> None:
+        """Initialize the export.
+
+        Args:
+            hass: Home Assistant instance
+            data: Device data model to aggregate
+            metadata: Device metadata
+            device_name: User-friendly device name for the statistic names
+        """
+        self.hass = hass
+        self._data = data
+        self._device_name = device_name
+        address = metadata.device_address
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{address}")
+        self._statistic_prefix = f"{DOMAIN}:{address.replace(':', '').lower()}"
+        self._aggregator = HourlyAggregator()
+
+        self.sums: Dict[str, float] = {key: 0.0 for key, (_, _, has_sum) in STATISTICS.items() if has_sum}
+        self.pending: List[HourAggregate] = []
+        self.last_hour: Optional[float] = None
+        self.imported: int = 0
+
+    def statistic_id(self, key: str) -> str:
+        """Get the statistic ID of a statistic key."""
+        return f"{self._statistic_prefix}_{key}"
+
+    async def async_load(self) -> None:
+        """Load the persisted sums and queued hours."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.sums.update(stored["sums"])
+        self.pending = [HourAggregate(**hour) for hour in stored["pending"]]
+        self.last_hour = stored["last_hour"]
+        logger.debug(f"Loaded statistics sums {self.sums} with {len(self.pending)} hours queued")
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start aggregating updates and importing closed hours hourly.
+
+        Returns:
+            Callable that stops aggregating and importing
+        """
+        unsubscribers = [
+            self._data.subscribe(self._handle_update),
+            async_track_utc_time_change(self.hass, self._async_hour_passed, minute=0, second=5),
+        ]
+        # Hours queued before a restart are imported straight away
+        self._import()
+
+        def stop() -> None:
+            for unsubscribe in unsubscribers:
+                unsubscribe()
+
+        return stop
+
+    @callback
+    def _handle_update(self) -> None:
+        """Aggregate a data model update."""
+        self._queue(self._aggregator.update(time.time(), self._data.outlet_1_on, self._data.outlet_2_on,
+                                            self._data.actual_temp))
+
+    @callback
+    def _async_hour_passed(self, now: datetime) -> None:
+        """Close the hour that ended and import the queued hours."""
+        self._queue(self._aggregator.advance(now.timestamp()))
+        self._import()
+
+    def _queue(self, hours: List[HourAggregate]) -> None:
+        """Queue closed hours that were not queued before a restart."""
+        hours = [hour for hour in hours if self.last_hour is None or hour.start > self.last_hour]
+        if not hours:
+            return
+        self.pending.extend(hours)
+        del self.pending[:-MAX_PENDING]
+        self.last_hour = hours[-1].start
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _import(self) -> None:
+        """Import the queued hours as one batch per statistic."""
+        if not self.pending:
+            return
+        if "recorder" not in self.hass.config.components:
+            logger.debug(f"Recorder not loaded, keeping {len(self.pending)} hours queued")
+            return
+
+        # Only needed once there is something to import
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        rows: Dict[str, List[StatisticData]] = {key: [] for key in STATISTICS}
+        for hour in self.pending:
+            start = datetime.fromtimestamp(hour.start, timezone.utc)
+            for key, value in (("outlet_1_runtime", hour.outlet_1_seconds / 60),
+                               ("outlet_2_runtime", hour.outlet_2_seconds / 60),
+                               ("sessions", hour.sessions)):
+                self.sums[key] += value
+                rows[key].append(StatisticData(start=start, state=value, sum=self.sums[key]))
+            if hour.mean_temp is not None:
+                rows["temperature"].append(
+                    StatisticData(start=start, mean=hour.mean_temp, min=hour.min_temp, max=hour.max_temp)
+                )
+
+        for key, (name, unit, has_sum) in STATISTICS.items():
+            if not rows[key]:
+                continue
+            metadata = StatisticMetaData(
+                source=DOMAIN,
+                statistic_id=self.statistic_id(key),
+                name=f"{self._device_name} {name}",
+                unit_of_measurement=unit,
+                has_mean=not has_sum,
+                has_sum=has_sum,
+            )
+            async_add_external_statistics(self.hass, metadata, rows[key])
+
+        logger.debug(f"Imported {len(self.pending)} hours of statistics")
+        self.imported += len(self.pending)
+        self.pending = []
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Build the persisted sums and queued hours."""
+        return {
+            "sums": self.sums,
+            "pending": [vars(hour) for hour in self.pending],
+            "last_hour": self.last_hour,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the export state."""
+        return {
+            "statistic_ids": [self.statistic_id(key) for key in STATISTICS],
+            "sums": self.sums,
+            "pending": len(self.pending),
+            "imported": self.imported,
+            "last_hour": self.last_hour,
+        }
@@ -4,15 +4,39 @@ This module handles the setup of switches that control individual outlets
 on the Mira Soak Station device.
 """
 
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.entity import DeviceInfo
+from dataclasses import dataclass
+
+from homeassistant.components.switch import SwitchEntityDescription
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN
+from .mira.helpers.descriptions import SoakStationEntityDescription, build_entities
+from .mira.helpers.write_filter import StateWriteFilter
 from .mira.switch.outlet_switch import SoakStationOutletSwitch
 
 
+@dataclass(frozen=True, kw_only=True)
+class SoakStationSwitchEntityDescription(SwitchEntityDescription, SoakStationEntityDescription):
+    """Description of a Mira Soak Station switch."""
+
+
+def _create_outlet_switch(hass, config_entry, entry_data, description):
+    """Create the power switch of an outlet."""
+    # Outlet transitions are always written immediately
+    write_filter = entry_data["write_filters"].setdefault(f"{description.key}_switch", StateWriteFilter())
+    return SoakStationOutletSwitch(
+        hass, entry_data["connection"], entry_data["data"], entry_data["metadata"],
+        outlet_number=description.outlet, write_filter=write_filter
+    )
+
+
+SWITCHES = (
+    SoakStationSwitchEntityDescription(key="outlet_1", outlet=1, create_fn=_create_outlet_switch),
+    SoakStationSwitchEntityDescription(key="outlet_2", outlet=2, create_fn=_create_outlet_switch),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -20,22 +44,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up switches for the Mira Soak Station device.
     
+    Only the outlets the device supports get a switch.
+    
     Args:
         hass: Home Assistant instance
         config_entry: Configuration entry containing device details
         async_add_entities: Callback to add entities to Home Assistant
     """
-    # Get device data from hass storage
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    connection = data["connection"]
-    metadata = data["metadata"]
-    model = data["data"]
-
-    # Create switches for each outlet
-    switches = [
-        SoakStationOutletSwitch(hass, connection, model, metadata, outlet_number=1),
-        SoakStationOutletSwitch(hass, connection, model, metadata, outlet_number=2),
-    ]
-
-    # Register switches with Home Assistant
-    async_add_entities(switches)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(build_entities(SWITCHES, hass, config_entry, entry_data))
@@ -0,0 +1,246 @@
+"""Long-term telemetry history for Mira Soak Station devices.
+
+Every decoded state report is appended to a per-device columnar store under
+the Home Assistant configuration directory, see
+mira.helpers.telemetry_store. This module opens and flushes the store off
+the event loop and runs queries over it in the executor. Reports arriving on
+the event loop are buffered and written to the store in the executor, under
+the same lock as queries, so a query never reads rows being written. The
+latest result of each query is kept for the telemetry sensors and saved, so
+they keep their values across restarts; the history itself is never held in
+Python objects.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .mira.helpers.protocol import StateReport
+from .mira.helpers.telemetry_store import TelemetryStore
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Interval at which buffered reports are written and changed pages flushed to disk
+FLUSH_INTERVAL = timedelta(minutes=5)
+
+# Query metrics
+METRIC_PERCENTILES = "percentiles"
+METRIC_HEAT_UP_CURVE = "heat_up_curve"
+METRIC_RUNTIME_PER_DAY = "runtime_per_day"
+METRIC_STABILITY = "stability"
+
+METRICS = (METRIC_PERCENTILES, METRIC_HEAT_UP_CURVE, METRIC_RUNTIME_PER_DAY, METRIC_STABILITY)
+
+# Deviation in Celsius from the final temperature at which a heat-up counts as done
+HEAT_UP_BAND = 1.0
+
+
+def summarize(metric: str, result: Dict[str, Any], days: float) -> Optional[float]:
+    """Reduce a query result to the single value shown by its sensor.
+
+    Args:
+        metric: Query metric
+        result: Query result
+        days: Days the query covered
+
+    Returns:
+        float: Median temperature, heat-up time in seconds, mean runtime in
+        minutes per day or mean absolute deviation from the target, or None
+        without data
+    """
+    if metric == METRIC_PERCENTILES:
+        return result["percentiles"].get("p50")
+    if metric == METRIC_HEAT_UP_CURVE:
+        points = [(seconds, actual) for seconds, actual in zip(result["seconds"], result["actual"])
+                  if actual is not None]
+        if not points:
+            return None
+        final = points[-1][1]
+        return next(seconds for seconds, actual in points if abs(actual - final) <= HEAT_UP_BAND)
+    if metric == METRIC_RUNTIME_PER_DAY:
+        total = sum(day["outlet_1_minutes"] + day["outlet_2_minutes"] for day in result["days"].values())
+        return round(total / days, 1)
+    return result["mean_abs_error"]
+
+
+class SoakStationTelemetryHistory:
+    """Columnar telemetry store and query results for a single device.
+
+    Attributes:
+        hass: Home Assistant instance
+        store: Open telemetry store, None until opened and after closing
+        results: Latest query result by metric, with its summary value
+    """
+
+    def __init__(self, hass: HomeAssistant, address: str) -> None:
+        """Initialize the history without opening the store.
+
+        Args:
+            hass: Home Assistant instance
+            address: Device MAC address, naming the store files
+        """
+        self.hass = hass
+        self._address = address
+        self.store: Optional[TelemetryStore] = None
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.subscribers: List[Callable[[], None]] = []
+        self._results_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.telemetry.{address}")
+        # Reports waiting to be written, with their time
+        self._pending: List[Tuple[StateReport, float]] = []
+        # Queries read the memory map in the executor, which must not be
+        # written or closed under them
+        self._lock = asyncio.Lock()
+
+    async def async_open(self) -> TelemetryStore:
+        """Open or create the store files in the executor and load the saved results.
+
+        Returns:
+            TelemetryStore: The opened store
+        """
+        directory = self.hass.config.path(DOMAIN, "telemetry")
+        self.store = await self.hass.async_add_executor_job(
+            TelemetryStore, directory, self._address.replace(":", "").lower()
+        )
+        logger.debug(f"Opened telemetry store in {directory}: {self.store.sizes()}")
+        self.results = await self._results_store.async_load() or {}
+        return self.store
+
+    @callback
+    def append(self, report: StateReport, timestamp: float) -> None:
+        """Buffer a state report until it is written to the store.
+
+        Args:
+            report: Decoded state report
+            timestamp: Unix time the report was received
+        """
+        self._pending.append((report, timestamp))
+
+    def _take_pending(self, store: TelemetryStore) -> Callable[[], None]:
+        """Take the buffered reports, returning a job writing them in the executor."""
+        pending, self._pending = self._pending, []
+
+        def write() -> None:
+            for report, timestamp in pending:
+                store.append(report, timestamp)
+
+        return write
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start flushing the store to disk periodically.
+
+        Returns:
+            Callable that stops flushing
+        """
+        return async_track_time_interval(self.hass, self._async_flush, FLUSH_INTERVAL)
+
+    async def _async_flush(self, now=None) -> None:
+        """Write the buffered reports and changed pages to disk in the executor."""
+        async with self._lock:
+            store = self.store
+            if store is None:
+                return
+            write = self._take_pending(store)
+
+            def flush() -> None:
+                write()
+                store.flush()
+
+            await self.hass.async_add_executor_job(flush)
+
+    async def async_close(self) -> None:
+        """Write the buffered reports, then flush and close the store."""
+        async with self._lock:
+            store, self.store = self.store, None
+            if store is None:
+                self._pending = []
+                return
+            write = self._take_pending(store)
+
+            def close() -> None:
+                write()
+                store.close()
+
+            await self.hass.async_add_executor_job(close)
+
+    async def async_query(self, metric: str, days: float) -> Dict[str, Any]:
+        """Run a query over the last days in the executor and keep its result.
+
+        Args:
+            metric: Query metric, one of METRICS
+            days: Days back from now to cover
+
+        Returns:
+            dict: Query result with the covered span and summary value
+
+        Raises:
+            HomeAssistantError: If the store is not open
+        """
+        end = time.time()
+        start = end - days * 86400
+        utc_offset = dt_util.now().utcoffset().total_seconds()
+        async with self._lock:
+            store = self.store
+            if store is None:
+                raise HomeAssistantError("Telemetry store is not open")
+            write = self._take_pending(store)
+
+            def run() -> Dict[str, Any]:
+                # Reports received up to now are part of the query
+                write()
+                begin = time.perf_counter()
+                if metric == METRIC_RUNTIME_PER_DAY:
+                    result = store.runtime_per_day(start, end, utc_offset)
+                else:
+                    result = getattr(store, metric)(start, end)
+                return {**result, "query_ms": round((time.perf_counter() - begin) * 1000, 2)}
+
+            result = await self.hass.async_add_executor_job(run)
+
+        logger.debug(f"Telemetry query {metric} over {days} days took {result['query_ms']}ms")
+        self.results[metric] = {
+            "days": days,
+            "queried_at": dt_util.utcnow().isoformat(),
+            "summary": summarize(metric, result, days),
+            "result": result,
+        }
+        await self._results_store.async_save(self.results)
+        for subscriber in list(self.subscribers):
+            subscriber()
+        return self.results[metric]
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback for new query results.
+
+        Returns:
+            Callable that removes the callback again
+        """
+        self.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the store tiers and the latest query summaries."""
+        return {
+            "tiers": self.store.sizes() if self.store is not None else None,
+            "pending": len(self._pending),
+            "results": {
+                metric: {key: value for key, value in result.items() if key != "result"}
+                for metric, result in self.results.items()
+            },
+        }
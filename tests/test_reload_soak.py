@@ -0,0 +1,106 @@
+"""Reload soak test for config entries.
+
+Sets a config entry up and unloads it many times in a test Home Assistant,
+against the stand-in GATT peer of the benchmarks, and checks that nothing
+set up by an entry outlives its unload: the data model, connection and
+notification handler of each setup must be freed once the next one is up,
+and the number of tasks and the traced memory must stay flat over the
+cycles.
+
+Requires homeassistant and pytest-homeassistant-custom-component:
+
+    python -m pytest tests
+"""
+
+import asyncio
+import gc
+import sys
+import tracemalloc
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from run import DOMAIN, Bench, bench_home_assistant  # noqa: E402
+
+# Reload cycles measured, after warm-up cycles that fill caches and registries
+CYCLES = 50
+WARMUP_CYCLES = 5
+
+# Traced memory growth tolerated per measured cycle, in bytes
+MAX_GROWTH_PER_CYCLE = 8 * 1024
+
+
+async def _reload(bench: Bench, entry: Any) -> Dict[str, Any]:
+    """Unload and set up an entry again, waiting for its first entity state.
+
+    Returns:
+        dict: Entry data of the new setup
+    """
+    hass = bench.hass
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.entry_id not in hass.data.get(DOMAIN, {})
+    await bench.setup_entry(entry)
+    # Includes the client check the entry starts in the background
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return bench.entry_data(entry)
+
+
+def _track(entry_data: Dict[str, Any]) -> Dict[str, "weakref.ref[Any]"]:
+    """Weakly reference the objects of a setup that must not outlive its unload."""
+    connection = entry_data["connection"]
+    return {
+        "data model": weakref.ref(entry_data["data"]),
+        "connection": weakref.ref(connection),
+        "notification handler": weakref.ref(connection._notifications),
+    }
+
+
+async def _soak() -> Dict[str, List[Any]]:
+    """Run the reload cycles and sample tasks, memory and leaked objects after each.
+
+    Returns:
+        dict: Samples of each measure, one per measured cycle
+    """
+    samples: Dict[str, List[Any]] = {"tasks": [], "memory": [], "leaked": []}
+    async with bench_home_assistant(latency=0.0) as bench:
+        entry = bench.add_entry(0)
+        await bench.setup_entry(entry)
+        for _ in range(WARMUP_CYCLES):
+            await _reload(bench, entry)
+
+        tracemalloc.start()
+        try:
+            previous = _track(bench.entry_data(entry))
+            for _ in range(CYCLES):
+                current = _track(await _reload(bench, entry))
+                gc.collect()
+                samples["tasks"].append(len(asyncio.all_tasks()))
+                samples["memory"].append(tracemalloc.get_traced_memory()[0])
+                samples["leaked"].append([name for name, ref in previous.items() if ref() is not None])
+                previous = current
+        finally:
+            tracemalloc.stop()
+
+        assert await bench.hass.config_entries.async_unload(entry.entry_id)
+        await bench.hass.async_block_till_done()
+    return samples
+
+
+def test_reload_soak() -> None:
+    """Repeated reloads free each setup and leave task count and memory flat."""
+    samples = asyncio.run(_soak())
+
+    assert not any(samples["leaked"]), f"Objects of unloaded setups still alive: {samples['leaked']}"
+
+    # Every cycle ends in the same state, so the count must not drift at all
+    assert max(samples["tasks"]) == min(samples["tasks"]), samples["tasks"]
+
+    growth = samples["memory"][-1] - samples["memory"][0]
+    assert growth < MAX_GROWTH_PER_CYCLE * CYCLES, f"Traced memory grew by {growth} bytes over {CYCLES} reloads"
@@ -0,0 +1,238 @@
+"""Predictive link warm-up for Mira Soak Station devices.
+
+Establishing the Bluetooth link is the slowest part of acting on a device
+that is not connected. When idle links are released, this module learns
+when the device is used from its outlet starts, and connects and refreshes
+the device state shortly before likely use, or when a configured trigger
+entity such as an occupancy sensor turns on. The link is released again
+once the prediction window has passed.
+
+Hits, misses and the connect time saved are counted so the predictions can
+be judged. Starts at the panel are only seen while the link is up, so the
+link is only released once the pattern has learned enough starts, and the
+device's entities are marked unavailable while it is released.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_ON
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .mira.helpers.connection import Connection
+from .mira.helpers.data_model import SoakStationData, SoakStationMetadata
+from .mira.helpers.usage import BIN_MINUTES, UsagePattern
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Delay before a changed usage pattern is written to disk
+SAVE_DELAY = 60
+
+# How long before a likely bin the link is established
+LEAD = timedelta(minutes=2)
+
+# How long the link is held after a trigger entity turns on
+TRIGGER_WINDOW = timedelta(minutes=10)
+
+# Interval at which predictions are evaluated
+EVALUATE_INTERVAL = timedelta(minutes=1)
+
+# Outlet starts learned with the link up before idle links are released
+MIN_LEARNED_STARTS = 20
+
+
+class SoakStationWarmup:
+    """Usage learning and link warm-up for a single device.
+
+    Attributes:
+        hass: Home Assistant instance
+        pattern: Learned weekly usage pattern
+        release_idle: Whether the link is released outside prediction windows
+        window_until: End of the current prediction window, if one is open
+        window_reason: What opened the current window, "pattern" or "trigger"
+        stats: Prediction outcome counters
+    """
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, connection: Connection,
+                 data: SoakStationData, metadata: SoakStationMetadata, release_idle: bool = False,
+                 triggers: Optional[List[str]] = None) -> None:
+        """Initialize warm-up.
+
+        Args:
+            hass: Home Assistant instance
+            config_entry: Entry of the device, which owns the evaluations started by triggers
+            connection: Connection to establish and release
+            data: Device data model to learn outlet starts from
+            metadata: Device metadata
+            release_idle: Whether to release the link outside prediction windows
+            triggers: Entity IDs that open a window when they turn on
+        """
+        self.hass = hass
+        self._config_entry = config_entry
+        self._connection = connection
+        self._data = data
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.usage.{metadata.device_address}")
+        self.pattern = UsagePattern()
+        self.release_idle: bool = release_idle
+        self._triggers: List[str] = triggers or []
+
+        self.window_until: Optional[datetime] = None
+        self.window_reason: Optional[str] = None
+        self._window_used: bool = False
+        self._running: bool = False
+        self.stats: Dict[str, float] = {
+            "windows": 0,
+            "hits": 0,
+            "misses": 0,
+            "wasted": 0,
+            "saved_seconds": 0.0,
+        }
+
+    async def async_load(self) -> None:
+        """Load the persisted usage pattern."""
+        stored = await self._store.async_load()
+        if stored:
+            self.pattern.load(stored)
+            logger.debug(f"Loaded usage pattern from {self.pattern.starts} outlet starts")
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start learning and, if idle links are released, warming up.
+
+        Returns:
+            Callable that stops following the device and the trigger entities
+        """
+        self._running = self._outlet_running
+        unsubscribers = [
+            self._data.subscribe(self._handle_update),
+            async_track_time_interval(self.hass, self._async_evaluate, EVALUATE_INTERVAL),
+        ]
+        if self._triggers:
+            unsubscribers.append(
+                async_track_state_change_event(self.hass, self._triggers, self._handle_trigger)
+            )
+
+        def stop() -> None:
+            for unsubscribe in unsubscribers:
+                unsubscribe()
+
+        return stop
+
+    @property
+    def learning(self) -> bool:
+        """Whether too few starts are learned yet to release idle links."""
+        return self.pattern.starts < MIN_LEARNED_STARTS
+
+    @property
+    def _outlet_running(self) -> bool:
+        """Whether either outlet is running."""
+        return bool(self._data.outlet_1_on or self._data.outlet_2_on)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of outlet starts that found a warmed-up link."""
+        starts = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / starts if starts else None
+
+    @callback
+    def _handle_update(self) -> None:
+        """Record outlet starts in the usage pattern and score the prediction."""
+        # A report arrived, so the link is up again
+        self._data.set_released(False)
+
+        running = self._outlet_running
+        started = running and not self._running
+        self._running = running
+        if not started:
+            return
+
+        now = dt_util.now()
+        self.pattern.record(now.weekday(), now.hour * 60 + now.minute, time.time())
+        self._store.async_delay_save(self.pattern.as_dict, SAVE_DELAY)
+
+        if self.window_until is not None:
+            self.stats["hits"] += 1
+            if self.release_idle:
+                self.stats["saved_seconds"] += self._connection.connect_seconds or 0.0
+            self._window_used = True
+        else:
+            self.stats["misses"] += 1
+
+    @callback
+    def _handle_trigger(self, event: Event) -> None:
+        """Open a window when a trigger entity turns on."""
+        new_state = event.data.get("new_state")
+        if new_state is None or new_state.state != STATE_ON:
+            return
+        logger.debug(f"Warm-up triggered by {event.data['entity_id']}")
+        self._open_window(dt_util.utcnow() + TRIGGER_WINDOW, "trigger")
+        self._config_entry.async_create_background_task(
+            self.hass, self._async_evaluate(dt_util.utcnow()), f"{DOMAIN} warm-up evaluation"
+        )
+
+    def _open_window(self, until: datetime, reason: str) -> None:
+        """Open or extend the prediction window."""
+        if self.window_until is None:
+            self.stats["windows"] += 1
+            self._window_used = False
+            logger.debug(f"Opening warm-up window until {until} ({reason})")
+        if self.window_until is None or until > self.window_until:
+            self.window_until = until
+            self.window_reason = reason
+
+    def _likely_window_end(self, now: datetime) -> Optional[datetime]:
+        """Get the end of the likely bin starting within the lead time, if any."""
+        local = dt_util.as_local(now + LEAD)
+        minute = local.hour * 60 + local.minute
+        if not self.pattern.is_likely(local.weekday(), minute, time.time()):
+            return None
+        bin_start = local.replace(minute=local.minute - local.minute % BIN_MINUTES, second=0, microsecond=0)
+        return dt_util.as_utc(bin_start + timedelta(minutes=BIN_MINUTES))
+
+    async def _async_evaluate(self, now: datetime) -> None:
+        """Open, hold and close prediction windows and the link with them."""
+        window_end = self._likely_window_end(now)
+        if window_end is not None:
+            self._open_window(window_end, "pattern")
+
+        if self.window_until is not None and now >= self.window_until:
+            if not self._window_used:
+                self.stats["wasted"] += 1
+            logger.debug("Warm-up window passed")
+            self.window_until = None
+            self.window_reason = None
+
+        if not self.release_idle or self._connection.is_closed:
+            return
+        try:
+            if self.window_until is not None:
+                if await self._connection.ensure_connected():
+                    logger.debug(f"Warmed up link in {self._connection.connect_seconds:.2f}s")
+                    await self._connection.request_device_state()
+            elif not self._outlet_running and not self._connection.is_released and not self.learning:
+                await self._connection.release()
+                self._data.set_released(True)
+        except Exception as e:
+            logger.warning(f"Failed to warm up link: {e}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Describe the prediction state and outcomes."""
+        return {
+            "release_idle": self.release_idle,
+            "triggers": self._triggers,
+            "window_until": self.window_until.isoformat() if self.window_until else None,
+            "window_reason": self.window_reason,
+            "starts": self.pattern.starts,
+            "learning": self.learning,
+            "hit_rate": self.hit_rate,
+            **self.stats,
+        }